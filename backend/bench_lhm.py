@@ -0,0 +1,229 @@
+"""
+Benchmark for LHMReader against a stand-in WMI client.
+
+Counts WMI round-trips per tick for the previous readers (Hardware() +
+Sensor(Parent=...) per GPU + Sensor(SensorType="Temperature")) and the
+batched single query, and checks both return the same CPU temp and GPU
+stats. A fixed delay per call stands in for the WMI round-trip:
+
+    python bench_lhm.py
+
+Exits non-zero when a reader does not match the previous one.
+
+The second table serves the same sensors as LibreHardwareMonitor's
+/data.json from a local stand-in server and reads them with
+LHMHttpReader over one keep-alive connection.
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lhm_http_reader import LHMHttpReader
+from lhm_reader import LHMReader, SENSOR_QUERY
+
+TICKS = 50
+CALL_LATENCY = 0.004
+
+
+class FakeRow:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class FakeWMI:
+    """Serves Hardware(), Sensor(**filters) and query(wql) from fixed rows"""
+
+    def __init__(self, hardware, sensors, latency=CALL_LATENCY):
+        self.hardware = [FakeRow(**h) for h in hardware]
+        self.sensors = [FakeRow(**s) for s in sensors]
+        self.latency = latency
+        self.calls = 0
+
+    def _call(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def Hardware(self):
+        self._call()
+        return list(self.hardware)
+
+    def Sensor(self, **filters):
+        self._call()
+        return [s for s in self.sensors if all(getattr(s, k) == v for k, v in filters.items())]
+
+    def query(self, wql):
+        assert wql == SENSOR_QUERY
+        self._call()
+        return list(self.sensors)
+
+
+def fake_lhm(gpus=2, cores=8):
+    hardware = [dict(Identifier="/amdcpu/0", Name="AMD Ryzen 7 5800X", HardwareType="Cpu")]
+    sensors = []
+    for core in range(1, cores + 1):
+        sensors.append(dict(Identifier=f"/amdcpu/0/load/{core}", Name=f"CPU Core #{core}",
+                            SensorType="Load", Value=10.0 + core, Parent="/amdcpu/0"))
+    sensors.append(dict(Identifier="/amdcpu/0/temperature/2", Name="Core (Tctl/Tdie)",
+                        SensorType="Temperature", Value=68.5, Parent="/amdcpu/0"))
+    for i in range(gpus):
+        parent = f"/gpu-nvidia/{i}"
+        hardware.append(dict(Identifier=parent, Name=f"NVIDIA GeForce RTX 30{6 + i}0", HardwareType="GpuNvidia"))
+        sensors += [
+            dict(Identifier=f"{parent}/temperature/0", Name="GPU Core", SensorType="Temperature", Value=60.0 + i, Parent=parent),
+            dict(Identifier=f"{parent}/load/0", Name="GPU Core", SensorType="Load", Value="87,5", Parent=parent),
+            dict(Identifier=f"{parent}/load/1", Name="GPU Memory Controller", SensorType="Load", Value=30.0, Parent=parent),
+            dict(Identifier=f"{parent}/smalldata/1", Name="GPU Memory Used", SensorType="SmallData", Value=4096.0, Parent=parent),
+            dict(Identifier=f"{parent}/clock/0", Name="GPU Core", SensorType="Clock", Value=1800.0, Parent=parent),
+        ]
+    hardware.append(dict(Identifier="/ram", Name="Generic Memory", HardwareType="Memory"))
+    sensors.append(dict(Identifier="/ram/load/0", Name="Memory", SensorType="Load", Value=45.0, Parent="/ram"))
+    return hardware, sensors
+
+
+UNITS = {"temperature": "°C", "load": "%", "smalldata": "MB", "clock": "MHz"}
+
+
+def fake_data_json(hardware, sensors):
+    """The /data.json tree LibreHardwareMonitor would serve for these rows"""
+    ids = iter(range(1, 100000))
+    computer = {"id": next(ids), "Text": "BENCH-PC", "Children": []}
+    for hw in hardware:
+        groups = {}
+        for sensor in sensors:
+            if sensor["Parent"] != hw["Identifier"]:
+                continue
+            group = groups.setdefault(sensor["SensorType"], {"id": next(ids), "Text": sensor["SensorType"], "Children": []})
+            group["Children"].append({
+                "id": next(ids),
+                "Text": sensor["Name"],
+                "Value": f"{sensor['Value']} {UNITS.get(sensor['SensorType'].lower(), '')}",
+                "SensorId": sensor["Identifier"],
+                "Type": sensor["SensorType"],
+                "Children": [],
+            })
+        computer["Children"].append({"id": next(ids), "Text": hw["Name"], "Children": list(groups.values())})
+    return {"id": 0, "Text": "Sensor", "Children": [computer]}
+
+
+def serve_json(body):
+    """Keep-alive HTTP server on a free port; returns (server, connection counter)"""
+    counter = {"connections": 0, "requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            counter["connections"] += 1
+
+        def do_GET(self):
+            counter["requests"] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counter
+
+
+def legacy_tick(client):
+    """The previous read_cpu_temp() + read_gpu_stats() pair"""
+    cpu_temp = None
+    for sensor in client.Sensor(SensorType="Temperature"):
+        if ("CPU" in sensor.Name or "Core" in sensor.Name or "Package" in sensor.Name) and "GPU" not in sensor.Name:
+            val = LHMReader._parse_value(None, sensor.Value)
+            if val is not None and val > 0:
+                cpu_temp = round(val, 1)
+                break
+
+    gpus = []
+    for hw in client.Hardware():
+        if hw.HardwareType.lower() == "gpu" or "gpu" in hw.Name.lower() or "nvidia" in hw.Name.lower() or "radeon" in hw.Name.lower():
+            gpu_data = {"id": hw.Identifier, "name": hw.Name, "load": 0, "memory_used": 0, "memory_total": 0, "temperature": 0}
+            for sensor in client.Sensor(Parent=hw.Identifier):
+                val = LHMReader._parse_value(None, sensor.Value)
+                if val is None:
+                    continue
+                stype = sensor.SensorType.lower()
+                sname = sensor.Name.lower()
+                if stype == "load" and "core" in sname:
+                    gpu_data["load"] = val
+                elif stype == "temperature" and "core" in sname:
+                    gpu_data["temperature"] = val
+                elif stype in ("smalldata", "data") and "memory" in sname and "used" in sname:
+                    gpu_data["memory_used"] = val
+            gpus.append(gpu_data)
+    return cpu_temp, gpus
+
+
+def matches_legacy(expected, got):
+    """The legacy reader filled 0 for a field without a sensor; the new ones leave it out"""
+    cpu_temp, gpus = expected
+    if got[0] != cpu_temp or len(got[1]) != len(gpus):
+        return False
+    return all(all(b.get(k, 0) == v for k, v in a.items()) for a, b in zip(gpus, got[1]))
+
+
+def main():
+    ok = True
+    print(f"{'gpus':>5} {'legacy calls':>13} {'batched calls':>14} {'legacy ms':>10} {'batched ms':>11}  match")
+    for gpus in (1, 2, 4):
+        hardware, sensors = fake_lhm(gpus)
+
+        client = FakeWMI(hardware, sensors)
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            expected = legacy_tick(client)
+        legacy_ms = (time.perf_counter() - start) / TICKS * 1000
+        legacy_calls = client.calls / TICKS
+
+        client = FakeWMI(hardware, sensors)
+        reader = LHMReader(wmi_client=client)
+        reader.read_sensors()
+        client.calls = 0
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            # New tick: CPU and GPU consumers share one query
+            reader.snapshot = None
+            got = (reader.read_cpu_temp(), reader.read_gpu_stats())
+        batched_ms = (time.perf_counter() - start) / TICKS * 1000
+        batched_calls = client.calls / TICKS
+
+        match = matches_legacy(expected, got)
+        ok = ok and match
+        print(f"{gpus:>5} {legacy_calls:>13.1f} {batched_calls:>14.1f} {legacy_ms:>10.2f} {batched_ms:>11.2f}  {match}")
+
+    print()
+    print(f"{'gpus':>5} {'requests':>9} {'connections':>12} {'http ms':>8}  match")
+    for gpus in (1, 2, 4):
+        hardware, sensors = fake_lhm(gpus)
+        expected = legacy_tick(FakeWMI(hardware, sensors, latency=0))
+        server, counter = serve_json(json.dumps(fake_data_json(hardware, sensors)).encode())
+
+        reader = LHMHttpReader(port=server.server_address[1])
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            reader.snapshot = None
+            got = (reader.read_cpu_temp(), reader.read_gpu_stats())
+        http_ms = (time.perf_counter() - start) / TICKS * 1000
+        reader._close_http()
+        server.shutdown()
+        server.server_close()
+        match = matches_legacy(expected, got)
+        ok = ok and match
+        print(f"{gpus:>5} {counter['requests']:>9} {counter['connections']:>12} {http_ms:>8.2f}  {match}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
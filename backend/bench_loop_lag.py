@@ -0,0 +1,58 @@
+"""
+Benchmark for event-loop lag caused by blocking sensor calls.
+
+Runs a fake sensor job (a blocking call of BLOCK_MS, like a WMI query or a
+process scan) every 0.5 s next to a LoopLagMonitor, first inline on the
+loop and then through SensorPool. The lag is what a Socket.IO ping or an
+HTTP request arriving at that moment waits before it is handled:
+
+    python bench_loop_lag.py
+"""
+
+import asyncio
+import time
+
+from loop_monitor import LoopLagMonitor
+from sensor_pool import SensorPool
+
+BLOCK_MS = 150
+DURATION = 5.0
+
+
+def blocking_sensor():
+    time.sleep(BLOCK_MS / 1000.0)
+    return 42
+
+
+async def run(mode):
+    pool = SensorPool()
+    pool.add("sensor", workers=1)
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.start()
+
+    async def sensor_job():
+        while True:
+            if mode == "inline":
+                blocking_sensor()
+            else:
+                await pool.run("sensor", blocking_sensor)
+            await asyncio.sleep(0.5)
+
+    task = asyncio.ensure_future(sensor_job())
+    await asyncio.sleep(DURATION)
+    task.cancel()
+    monitor.stop()
+    pool.shutdown()
+    return monitor.metrics()
+
+
+def main():
+    print(f"{'mode':>8} {'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11} {'stalls':>7}")
+    for mode in ("inline", "pool"):
+        lag = asyncio.run(run(mode))
+        print(f"{mode:>8} {lag['lag_ms_p50']:>11.2f} {lag['lag_ms_p99']:>11.2f} "
+              f"{lag['lag_ms_max']:>11.2f} {lag['stalls']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark for MAHMReader.read_all_stats().
+
+Compares the previous full scan (seek + read 260 bytes + decode per entry)
+with the name->offset index on synthetic Afterburner layouts, and checks
+that both return the same stats. The cached column is a read while the
+header time is unchanged:
+
+    python bench_mahm.py
+
+Exits non-zero when the index does not match the full scan.
+
+The second table times reading value/min/max/flags of every entry:
+per-entry seek + unpack against MAHMReader.read_sensor_values() with and
+without NumPy.
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+
+from bench_replay import build_synthetic_mahm, synthetic_mahm_sensors
+import mahm_reader
+from mahm_reader import MAHMReader
+
+CORE_COUNTS = (4, 16, 48)
+TICKS = 2000
+
+
+def legacy_read_all_stats(map_file, header_size, entry_count, entry_size):
+    """The previous read_all_stats() loop"""
+    result = {"cpu_temp": None, "cpu_usage": None, "gpus": {}}
+    current_offset = header_size
+    for i in range(entry_count):
+        map_file.seek(current_offset)
+        name = map_file.read(260).decode('latin-1', errors='ignore').strip('\x00')
+        map_file.seek(current_offset + 1300)
+        value = struct.unpack('f', map_file.read(4))[0]
+
+        if "CPU" in name and "temperature" in name.lower() and "GPU" not in name:
+            if name == "CPU temperature":
+                result["cpu_temp"] = round(value, 1)
+            elif result["cpu_temp"] is None and value > 0:
+                result["cpu_temp"] = round(value, 1)
+        elif name == "CPU usage":
+            result["cpu_usage"] = round(value, 1)
+        elif name.startswith("GPU"):
+            parts = name.split(' ')
+            if len(parts) >= 2:
+                gpu_id_str = parts[0].replace("GPU", "")
+                if gpu_id_str.isdigit():
+                    gpu_id = int(gpu_id_str)
+                    if gpu_id not in result["gpus"]:
+                        result["gpus"][gpu_id] = {"id": str(gpu_id), "name": f"GPU {gpu_id}", "load": 0,
+                                                  "memory_used": 0, "memory_total": 0, "temperature": 0}
+                    metric = " ".join(parts[1:]).lower()
+                    if "temperature" in metric:
+                        result["gpus"][gpu_id]["temperature"] = value
+                    elif "usage" in metric and "memory" not in metric and "bus" not in metric and "fb" not in metric and "vid" not in metric:
+                        result["gpus"][gpu_id]["load"] = value
+                    elif "memory usage" in metric:
+                        result["gpus"][gpu_id]["memory_used"] = value
+        current_offset += entry_size
+    result["gpus"] = sorted(result["gpus"].values(), key=lambda x: int(x["id"]))
+    return result
+
+
+def matches_legacy(legacy, indexed):
+    """The indexed reader returns more fields (clocks, power, names); compare the ones both have"""
+    if legacy["cpu_temp"] != indexed["cpu_temp"] or legacy["cpu_usage"] != indexed["cpu_usage"]:
+        return False
+    if len(legacy["gpus"]) != len(indexed["gpus"]):
+        return False
+    keys = ("id", "load", "memory_used", "temperature")
+    # The legacy loop reported 0 for a sensor Afterburner does not have; the indexed one leaves it out
+    return all(all(a[k] == (b.get(k) or 0) for k in keys) for a, b in zip(legacy["gpus"], indexed["gpus"]))
+
+
+def legacy_read_values(map_file, header_size, entry_count, entry_size):
+    """Per-entry seek + struct.unpack, the way the reader used to pick fields"""
+    values = []
+    for i in range(entry_count):
+        map_file.seek(header_size + i * entry_size + 1300)
+        values.append(struct.unpack('fffI', map_file.read(16)))
+    return values
+
+
+def time_per_tick(func, ticks=TICKS):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        func()
+    return (time.perf_counter() - start) / ticks * 1e6
+
+
+def main():
+    ok = True
+    print(f"{'entries':>8} {'scan us/tick':>13} {'index us/tick':>14} {'speedup':>8} {'cached us/tick':>15}  match")
+    with tempfile.TemporaryDirectory() as tmp:
+        for cores in CORE_COUNTS:
+            sensors = synthetic_mahm_sensors(cores)
+            path = os.path.join(tmp, f"mahm_{cores}.bin")
+            with open(path, 'wb') as f:
+                f.write(build_synthetic_mahm(sensors))
+
+            reader = MAHMReader(path=path, cache=False)
+            indexed = reader.read_all_stats()
+            layout = (reader.header_size, reader.entry_count, reader.entry_size)
+            match = matches_legacy(legacy_read_all_stats(reader.map_file, *layout), indexed)
+            ok = ok and match
+
+            scan_us = time_per_tick(lambda: legacy_read_all_stats(reader.map_file, *layout))
+            index_us = time_per_tick(reader.read_all_stats)
+            reader.close()
+
+            reader = MAHMReader(path=path)
+            cached_us = time_per_tick(reader.read_all_stats)
+            reader.close()
+            print(f"{len(sensors):>8} {scan_us:>13.1f} {index_us:>14.1f} {scan_us / index_us:>7.1f}x {cached_us:>15.1f}  {match}")
+
+    columns = ["seek", "struct"] + (["numpy"] if mahm_reader.np is not None else [])
+    print()
+    print(f"{'entries':>8} " + " ".join(f"{c + ' us/tick':>15}" for c in columns))
+    with tempfile.TemporaryDirectory() as tmp:
+        for cores in CORE_COUNTS:
+            sensors = synthetic_mahm_sensors(cores)
+            path = os.path.join(tmp, f"mahm_{cores}.bin")
+            with open(path, 'wb') as f:
+                f.write(build_synthetic_mahm(sensors))
+
+            results = []
+            reader = MAHMReader(path=path, use_numpy=False)
+            reader.read_sensor_values()
+            layout = (reader.header_size, reader.entry_count, reader.entry_size)
+            results.append(time_per_tick(lambda: legacy_read_values(reader.map_file, *layout)))
+            results.append(time_per_tick(reader.read_sensor_values))
+            expected = list(reader.values)
+            reader.close()
+
+            if mahm_reader.np is not None:
+                reader = MAHMReader(path=path, use_numpy=True)
+                results.append(time_per_tick(reader.read_sensor_values))
+                if reader.values.tolist() != expected:
+                    print(f"{len(sensors):>8} numpy values MISMATCH")
+                    ok = False
+                reader.close()
+            print(f"{len(sensors):>8} " + " ".join(f"{r:>15.1f}" for r in results))
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
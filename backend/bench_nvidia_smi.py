@@ -0,0 +1,104 @@
+"""
+Benchmark for NvidiaSmiStream against a fake nvidia-smi.
+
+Compares what a broadcast tick pays for GPU stats: one `subprocess.run`
+per tick (the previous reader) against reading the latest row of the
+long-lived stream. Also kills the child mid-run to check it is restarted,
+and opens its breaker to check the child is stopped and started again
+ahead of the probe:
+
+    python bench_nvidia_smi.py
+
+Exits non-zero when the stream misses a GPU, is not restarted or is not
+suspended while its breaker is open.
+
+`python bench_nvidia_smi.py --fake <nvidia-smi args>` is the fake itself:
+it answers the static query once, or prints CSV rows every -lms ms.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+from nvidia_smi import NvidiaSmiStream
+from provider_health import ProviderHealth
+
+TICKS = 20
+FAKE_GPUS = (("00000000:01:00.0", "NVIDIA GeForce RTX 3070", 8192),
+             ("00000000:02:00.0", "NVIDIA GeForce RTX 3070", 8192))
+
+
+def fake_nvidia_smi(args):
+    query = next(a for a in args if a.startswith("--query-gpu="))
+    if "-lms" not in args:
+        for i, (bus_id, name, memory) in enumerate(FAKE_GPUS):
+            if "pci.bus_id" in query:
+                print(f"{i}, {bus_id}, {name}, {memory}")
+            else:
+                # The previous single-shot query
+                print(f"{i}, {name}, {90 + i}, 4096, {memory}, {60 + i}, 1800, 200.5, 50")
+        return
+    interval = int(args[args.index("-lms") + 1]) / 1000.0
+    tick = 0
+    while True:
+        for i in range(len(FAKE_GPUS)):
+            print(f"{i}, {90 + (tick + i) % 10}, 4096, {60 + i}, 1800, 200.5, [N/A]", flush=True)
+        tick += 1
+        time.sleep(interval)
+
+
+def main():
+    fake = [sys.executable, os.path.abspath(__file__), "--fake"]
+
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        subprocess.run(fake + ['--query-gpu=index,name,utilization.gpu,memory.used,memory.total,temperature.gpu,clocks.gr,power.draw,fan.speed',
+                               '--format=csv,noheader,nounits'], capture_output=True, text=True)
+    spawn_ms = (time.perf_counter() - start) / TICKS * 1000
+
+    health = ProviderHealth("bench", failure_threshold=1, open_for=2.0)
+    stream = NvidiaSmiStream(command=fake, interval_ms=100, min_restart_delay=0.1, health=health, resume_before=0.5)
+    stream.start()
+    deadline = time.monotonic() + 10
+    while len(stream.gpus()) < len(FAKE_GPUS) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        gpus = stream.gpus()
+    stream_ms = (time.perf_counter() - start) / TICKS * 1000
+
+    print(f"{'per-tick subprocess ms':>24} {'stream read ms':>15}")
+    print(f"{spawn_ms:>24.2f} {stream_ms:>15.4f}")
+    print(f"gpus: {[(g['id'], g['name'], g['memory_total'], g['load']) for g in gpus]}")
+    ok = len(gpus) == len(FAKE_GPUS)
+    if not ok:
+        print(f"MISMATCH: {len(gpus)} of {len(FAKE_GPUS)} gpus")
+
+    # Supervision: a dead child is restarted and rows keep flowing
+    lines = stream.lines
+    starts = stream.starts
+    stream._kill()
+    time.sleep(1.5)
+    restarted = stream.starts > starts and stream.lines > lines
+    print(f"after kill: {stream.metrics()} (new lines: {stream.lines - lines}) {'ok' if restarted else 'NOT RESTARTED'}")
+
+    # Breaker open: no child until shortly before the probe is due
+    health.failure(0.0, "bench")
+    time.sleep(0.5)
+    suspended = stream.process is None and stream.suspended
+    time.sleep(1.5)
+    resumed = stream.process is not None and len(stream.gpus()) == len(FAKE_GPUS)
+    print(f"breaker open: suspended {suspended}, running again before the probe {resumed}")
+    stream.stop()
+    return ok and restarted and suspended and resumed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--fake":
+        try:
+            fake_nvidia_smi(sys.argv[2:])
+        except (BrokenPipeError, KeyboardInterrupt):
+            pass
+    else:
+        sys.exit(0 if main() else 1)
@@ -0,0 +1,178 @@
+"""
+Replays a shared memory capture through the sampling path and times it:
+RTSS poll and ProcessTracker update (poll_fps), MAHM read, and the
+hardware_static / hardware_update payloads built by hardware_payload and
+JSON encoded, the same code poll_fps(), poll_temps() and broadcast_stats()
+run in the server.
+
+    python bench_replay.py capture.ffshm            (stepped, as fast as possible)
+    python bench_replay.py capture.ffshm --speed 4  (background playback at 4x)
+    python bench_replay.py --synthetic              (generated capture)
+
+Captures come from `python shm_replay.py record` on a Windows machine.
+"""
+
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+
+from bench_rtss import build_synthetic_rtss
+from hardware_payload import fps_values, hardware_data, hardware_dynamic, hardware_static, mahm_cpu
+from mahm_reader import MAHMReader
+from process_tracker import ProcessTracker
+from rtss_poller import AdaptivePoller
+from rtss_reader import RTSSReader
+from shm_replay import SnapshotRecorder, SnapshotReplay
+from snapshot_store import SnapshotStore
+
+TICK = 0.05
+BROADCAST_INTERVAL = 0.5
+
+# MAHM v2 layout: 8 DWORD header, 5 x 260 byte strings + data/min/max/flags/gpu/srcId
+MAHM_HEADER = struct.Struct('<4sIIIIiII')
+MAHM_ENTRY_SIZE = 1324
+# GPU entry: 5 x 260 byte strings (id, family, device, driver, BIOS) + dwMemAmount (KB)
+MAHM_GPU_ENTRY_SIZE = 1304
+
+
+def synthetic_mahm_sensors(cores=8):
+    """(name, units, value) rows resembling an Afterburner setup"""
+    sensors = [
+        ("GPU1 temperature", "C", 65.0),
+        ("GPU1 usage", "%", 97.0),
+        ("GPU1 memory usage", "MB", 6144.0),
+        ("GPU1 core clock", "MHz", 1860.0),
+        ("GPU1 memory clock", "MHz", 9501.0),
+        ("GPU1 power", "W", 210.0),
+        ("GPU1 fan speed", "%", 55.0),
+        ("CPU temperature", "C", 71.0),
+        ("CPU usage", "%", 43.0),
+        ("CPU clock", "MHz", 4600.0),
+        ("CPU power", "W", 88.0),
+        ("RAM usage", "MB", 14000.0),
+        ("Framerate", "FPS", 144.0),
+        ("Frametime", "ms", 6.9),
+    ]
+    for core in range(1, cores + 1):
+        sensors.append((f"CPU{core} temperature", "C", 60.0 + core % 10))
+        sensors.append((f"CPU{core} usage", "%", float(core * 7 % 100)))
+        sensors.append((f"CPU{core} clock", "MHz", 4400.0 + core))
+    return sensors
+
+
+def build_synthetic_mahm(sensors=None, timestamp=0, jitter=0.0, gpus=(("GeForce RTX 3070", 8192),)):
+    """`gpus` fills the GPU entry array as (device name, memory MB) rows, on PCI bus 1, 2, ..."""
+    if sensors is None:
+        sensors = synthetic_mahm_sensors()
+    header_size = MAHM_HEADER.size
+    gpu_base = header_size + len(sensors) * MAHM_ENTRY_SIZE
+    data = bytearray(gpu_base + len(gpus) * MAHM_GPU_ENTRY_SIZE)
+    MAHM_HEADER.pack_into(data, 0, b'MAHM', 0x00020000, header_size, len(sensors), MAHM_ENTRY_SIZE,
+                          timestamp, len(gpus), MAHM_GPU_ENTRY_SIZE)
+    for i, (device, memory_mb) in enumerate(gpus):
+        offset = gpu_base + i * MAHM_GPU_ENTRY_SIZE
+        gpu_id = f"VEN_10DE&DEV_2484&SUBSYS_00000000&REV_A1&BUS_{i + 1}&DEV_0&FN_0"
+        data[offset:offset + len(gpu_id)] = gpu_id.encode('latin-1')
+        data[offset + 520:offset + 520 + len(device)] = device.encode('latin-1')
+        struct.pack_into('<I', data, offset + 1300, memory_mb * 1024)
+    for i, (name, units, value) in enumerate(sensors):
+        offset = header_size + i * MAHM_ENTRY_SIZE
+        data[offset:offset + len(name)] = name.encode('latin-1')
+        data[offset + 260:offset + 260 + len(units)] = units.encode('latin-1')
+        data[offset + 520:offset + 520 + len(name)] = name.encode('latin-1')
+        data[offset + 780:offset + 780 + len(units)] = units.encode('latin-1')
+        gpu = int(name[3]) - 1 if name.startswith("GPU") and name[3].isdigit() else 0xFFFFFFFF
+        struct.pack_into('<fffIII', data, offset + 1300, value + jitter, 0.0, 100.0, 0, gpu, i)
+    return bytes(data)
+
+
+def write_synthetic_capture(path, seconds=20.0, rate=20.0):
+    recorder = SnapshotRecorder(path)
+    frames = int(seconds * rate)
+    for i in range(frames):
+        timestamp = i / rate
+        recorder.write('rtss', build_synthetic_rtss(256, active_every=32, frame=i), timestamp)
+        # Afterburner refreshes once per second by default
+        if i % int(rate) == 0:
+            recorder.write('mahm', build_synthetic_mahm(timestamp=int(timestamp), jitter=i % 7), timestamp)
+    recorder.close()
+
+
+def sample(rtss, poller, tracker, mahm, store, now, state):
+    # poll_fps(): RTSS poll, per-process FPS / frame-time state, events
+    processes = poller.poll(now)
+    selected_pid = tracker.update(processes, now)
+    rtss.poll_events()
+    store.publish({"fps": fps_values(tracker, selected_pid)})
+    if now - state['last_broadcast'] >= BROADCAST_INTERVAL:
+        state['last_broadcast'] = now
+        # poll_temps() without the WMI fallbacks, then broadcast_stats()
+        store.publish({"cpu": mahm_cpu(mahm.read_all_stats()), "sensors": mahm.read_sensor_snapshot()})
+        data = hardware_data(store.latest(), tracker, now)
+        static = hardware_static(data)
+        if static != state['static']:
+            state['static'] = static
+            json.dumps(static)
+        json.dumps(hardware_dynamic(data))
+        json.dumps(data)
+
+
+def report(label, timings):
+    timings.sort()
+    avg = sum(timings) / len(timings)
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"{label}: {len(timings)} ticks, avg {avg:.1f} us, p99 {p99:.1f} us, max {timings[-1]:.1f} us")
+
+
+def run(capture_path, speed=None):
+    replay = SnapshotReplay(capture_path)
+    rtss = RTSSReader(path=replay.paths.get('rtss'))
+    mahm = MAHMReader(path=replay.paths.get('mahm'))
+    poller = AdaptivePoller(rtss)
+    tracker = ProcessTracker()
+    store = SnapshotStore()
+    state = {'last_broadcast': -BROADCAST_INTERVAL, 'static': None}
+    timings = []
+
+    try:
+        if speed is None:
+            now = 0.0
+            while now <= replay.duration:
+                replay.seek(now)
+                start = time.perf_counter()
+                sample(rtss, poller, tracker, mahm, store, now, state)
+                timings.append((time.perf_counter() - start) * 1e6)
+                now += TICK
+        else:
+            replay.speed = speed
+            replay.start()
+            started = time.monotonic()
+            while (time.monotonic() - started) * speed <= replay.duration:
+                now = (time.monotonic() - started) * speed
+                start = time.perf_counter()
+                sample(rtss, poller, tracker, mahm, store, now, state)
+                timings.append((time.perf_counter() - start) * 1e6)
+                time.sleep(TICK / speed)
+    finally:
+        rtss.close()
+        replay.close()
+
+    report(os.path.basename(capture_path), timings)
+    print(f"poller: {poller.metrics()}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    speed = float(args[args.index("--speed") + 1]) if "--speed" in args else None
+    if "--synthetic" in args:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "synthetic.ffshm")
+            write_synthetic_capture(path)
+            run(path, speed)
+    elif args and not args[0].startswith("--"):
+        run(args[0], speed)
+    else:
+        print(__doc__)
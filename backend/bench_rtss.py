@@ -0,0 +1,232 @@
+"""
+Benchmark for the RTSS app-array readers.
+
+Builds a synthetic RTSSSharedMemoryV2 file and measures the per-tick cost of
+reading it, so it runs on Linux without RTSS installed:
+
+    python bench_rtss.py
+    python bench_rtss.py --check [snapshot.bin | capture.ffshm ...]
+
+--check decodes a set of fixtures (edge-case layouts, every RTSS block of
+the captures in fixtures/, plus any raw snapshot or capture files given)
+with both the pure-Python and the NumPy slot scanner and fails if they
+disagree. Captures are replayed through SnapshotReplay, block by block.
+
+fixtures/rtss_session.ffshm was written with SnapshotRecorder by
+`python bench_rtss.py --record-fixture fixtures/rtss_session.ffshm`; a
+capture of a live session (`python shm_replay.py record`) can be dropped
+next to it.
+"""
+
+import ctypes
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import rtss_reader
+from rtss_reader import (
+    RTSSReader,
+    RTSS_SHARED_MEMORY,
+    RTSS_SHARED_MEMORY_APP_ENTRY,
+    RTSS_SIGNATURE,
+    scan_slots_python,
+    scan_slots_numpy,
+)
+from shm_replay import SnapshotRecorder, SnapshotReplay
+
+SLOT_COUNTS = (8, 64, 256)
+TICKS = 2000
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def build_synthetic_rtss(slots, active_every=4, frame=0, entry_pad=0, entries=None):
+    """
+    Returns the raw bytes of an RTSS block with every Nth slot rendering.
+    `entries` maps slot -> dict of RTSS_SHARED_MEMORY_APP_ENTRY fields and
+    replaces the generated slots; `entry_pad` grows dwAppEntrySize past the
+    struct like newer RTSS versions do.
+    """
+    header_size = ctypes.sizeof(RTSS_SHARED_MEMORY)
+    entry_size = ctypes.sizeof(RTSS_SHARED_MEMORY_APP_ENTRY) + entry_pad
+    header = RTSS_SHARED_MEMORY(
+        dwSignature=RTSS_SIGNATURE,
+        dwVersion=0x00020000,
+        dwAppEntrySize=entry_size,
+        dwAppArrOffset=header_size,
+        dwAppArrSize=slots,
+        dwOSDFrame=frame,
+    )
+    data = bytearray(header_size + slots * entry_size)
+    data[:header_size] = bytes(header)
+
+    if entries is None:
+        entries = {}
+        for i in range(0, slots, active_every):
+            time1 = 100000 + frame * 100 + i
+            entries[i] = dict(
+                dwProcessID=1000 + i,
+                szName=f"C:\\Games\\Game{i}\\game{i}-Win64-Shipping.exe".encode(),
+                dwTime0=time1 - 1000,
+                dwTime1=time1,
+                dwFrames=60 + i,
+                dwFrameTime=1000000 // (60 + i),
+            )
+
+    for i, fields in entries.items():
+        entry = RTSS_SHARED_MEMORY_APP_ENTRY(**fields)
+        offset = header_size + i * entry_size
+        data[offset:offset + ctypes.sizeof(entry)] = bytes(entry)
+    return bytes(data)
+
+
+def write_synthetic_rtss(path, slots, active_every=4, frame=0):
+    with open(path, 'wb') as f:
+        f.write(build_synthetic_rtss(slots, active_every, frame))
+
+
+def fixture_layouts():
+    """Edge-case layouts both slot scanners must agree on"""
+    yield "sparse-8", build_synthetic_rtss(8)
+    yield "dense-256", build_synthetic_rtss(256, active_every=1)
+    yield "padded-entry", build_synthetic_rtss(16, active_every=3, entry_pad=64)
+    yield "empty", build_synthetic_rtss(8, entries={})
+    yield "odd-slots", build_synthetic_rtss(8, entries={
+        # Frame time only (no sampling window yet)
+        0: dict(dwProcessID=1, szName=b"a.exe", dwFrameTime=6944),
+        # GetTickCount wrapped: dwTime1 < dwTime0
+        1: dict(dwProcessID=2, szName=b"b.exe", dwTime0=0xFFFFFF00, dwTime1=0x10, dwFrames=30, dwFrameTime=33333),
+        # Registered but never presented
+        2: dict(dwProcessID=3, szName=b"c.exe"),
+        # Stale name left in a free slot
+        3: dict(dwProcessID=0, szName=b"old.exe", dwTime0=1, dwTime1=2, dwFrames=5),
+        # Extreme values
+        7: dict(dwProcessID=0xFFFFFFFF, szName=b"x" * 260, dwTime0=0, dwTime1=1, dwFrames=0xFFFFFFFF, dwFrameTime=1),
+    })
+
+
+def write_fixture_capture(path, frames=10, interval=0.1):
+    """
+    A short session as RTSS lays it out: 256 slots with padded entries, a
+    game starting and exiting, a launcher and a wrapped tick counter.
+    """
+    recorder = SnapshotRecorder(path)
+    for frame in range(frames):
+        time1 = 5000000 + frame * 100
+        entries = {
+            0: dict(dwProcessID=4120, szName=b"C:\\Windows\\explorer.exe"),
+            3: dict(dwProcessID=9876, szName=b"C:\\Program Files\\Epic Games\\Fortnite\\FortniteGame\\Binaries\\Win64\\FortniteClient-Win64-Shipping.exe",
+                    dwTime0=time1 - 1000, dwTime1=time1, dwFrames=141 + frame % 3, dwFrameTime=7050 + frame * 11),
+            # GetTickCount wrapped inside the sampling window
+            7: dict(dwProcessID=2231, szName=b"D:\\Steam\\steamapps\\common\\The Witcher 3\\bin\\x64_dx12\\witcher3.exe",
+                    dwTime0=0xFFFFFF00, dwTime1=0x2E8 + frame * 100, dwFrames=58 + frame, dwFrameTime=16667),
+        }
+        if 2 <= frame < 7:
+            entries[12] = dict(dwProcessID=15500, szName=b"C:\\Games\\cod\\cod_launcher.exe",
+                               dwTime0=time1 - 1000, dwTime1=time1, dwFrames=30, dwFrameTime=33333)
+        elif frame >= 7:
+            # Exited: RTSS clears the pid and leaves the name behind
+            entries[12] = dict(dwProcessID=0, szName=b"C:\\Games\\cod\\cod_launcher.exe")
+        recorder.write('rtss', build_synthetic_rtss(256, frame=frame, entry_pad=2048, entries=entries), frame * interval)
+    recorder.close()
+
+
+def replayed_blocks(capture_path):
+    """(label, raw block) for every RTSS block of a capture, as the replay file holds it"""
+    replay = SnapshotReplay(capture_path)
+    try:
+        path = replay.paths.get('rtss')
+        if path is None:
+            return
+        for timestamp in sorted(set(t for t, source, _ in replay.frames if source == 'rtss')):
+            replay.seek(timestamp)
+            with open(path, 'rb') as f:
+                yield f"{os.path.basename(capture_path)}@{timestamp:.2f}", f.read()
+    finally:
+        replay.close()
+
+
+def check_paths(snapshot_files=()):
+    if rtss_reader.np is None:
+        print("NumPy is not installed, nothing to compare")
+        return True
+
+    fixtures = list(fixture_layouts())
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.ffshm"))) + list(snapshot_files):
+        if path.endswith(".ffshm"):
+            fixtures.extend(replayed_blocks(path))
+            continue
+        with open(path, 'rb') as f:
+            fixtures.append((os.path.basename(path), f.read()))
+
+    ok = True
+    for name, blob in fixtures:
+        header = RTSS_SHARED_MEMORY.from_buffer_copy(blob)
+        layout = (header.dwAppArrOffset, header.dwAppArrSize, header.dwAppEntrySize)
+        expected = scan_slots_python(blob, *layout)
+        got = scan_slots_numpy(blob, *layout)
+        ok = ok and got == expected
+        print(f"{name:>24}: {len(expected)} live slots {'ok' if got == expected else 'MISMATCH'}")
+    return ok
+
+
+def legacy_scan(map_file):
+    """The previous read_fps() loop: seek/read/from_buffer_copy per slot"""
+    map_file.seek(0)
+    header = RTSS_SHARED_MEMORY.from_buffer_copy(map_file.read(ctypes.sizeof(RTSS_SHARED_MEMORY)))
+    max_fps = 0
+    for i in range(header.dwAppArrSize):
+        map_file.seek(header.dwAppArrOffset + (i * header.dwAppEntrySize))
+        entry_data = map_file.read(ctypes.sizeof(RTSS_SHARED_MEMORY_APP_ENTRY))
+        entry = RTSS_SHARED_MEMORY_APP_ENTRY.from_buffer_copy(entry_data)
+        if entry.dwProcessID != 0 and entry.dwFrameTime > 0:
+            fps = 1000000.0 / entry.dwFrameTime
+            if fps > max_fps:
+                max_fps = int(fps)
+                name = os.path.basename(entry.szName.decode('utf-8', errors='ignore').strip())
+    return max_fps
+
+
+def time_per_tick(func, ticks=TICKS):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        func()
+    return (time.perf_counter() - start) / ticks * 1e6
+
+
+def main():
+    columns = ["legacy", "snapshot"]
+    if rtss_reader.np is not None:
+        columns.append("numpy")
+    print(f"{'slots':>6} " + " ".join(f"{c + ' us/tick':>17}" for c in columns))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for slots in SLOT_COUNTS:
+            path = os.path.join(tmp, f"rtss_{slots}.bin")
+            write_synthetic_rtss(path, slots)
+
+            reader = RTSSReader(path=path, use_numpy=False)
+            reader.read_all_processes()
+            results = [
+                time_per_tick(lambda: legacy_scan(reader.map_file)),
+                time_per_tick(reader.read_all_processes),
+            ]
+            reader.close()
+
+            if rtss_reader.np is not None:
+                reader = RTSSReader(path=path, use_numpy=True)
+                results.append(time_per_tick(reader.read_all_processes))
+                reader.close()
+
+            print(f"{slots:>6} " + " ".join(f"{r:>17.1f}" for r in results))
+
+
+if __name__ == "__main__":
+    if "--record-fixture" in sys.argv:
+        write_fixture_capture(sys.argv[sys.argv.index("--record-fixture") + 1])
+        sys.exit(0)
+    if "--check" in sys.argv:
+        files = [a for a in sys.argv[1:] if a != "--check"]
+        sys.exit(0 if check_paths(files) else 1)
+    main()
@@ -0,0 +1,103 @@
+"""
+GameNameResolver against a temporary custom names file: the executable
+names RTSS reports resolve to the right display names, a burst of renames
+is written once after save_delay, and a failed write is retried.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import rtss_reader
+from checks import report
+from game_names import GameNameResolver
+
+SAVE_DELAY = 0.2
+
+# szName as RTSS reports it -> (display name, game id)
+EXPECTED = [
+    (b"D:\\Steam\\steamapps\\common\\The Witcher 3\\bin\\x64_dx12\\witcher3_dx12.exe", ("The Witcher 3", "witcher3_dx12")),
+    (b"C:\\Games\\Witcher3\\Witcher3.exe", ("The Witcher 3", "witcher3")),
+    (b"C:\\Fortnite\\FortniteClient-Win64-Shipping.exe", ("Fortnite", "fortniteclient")),
+    (b"C:\\Games\\BG3\\bg3_dx11.exe", ("Baldur's Gate 3", "bg3_dx11")),
+    (b"C:\\Games\\cod\\cod.exe", ("Call of Duty", "cod")),
+    # Not the game itself: a leading match is not enough
+    (b"C:\\Games\\cod\\cod_launcher.exe", ("cod_launcher", "cod_launcher")),
+    (b"C:\\Games\\unknown\\MyGame-Win64-Shipping.exe", ("MyGame", "mygame")),
+]
+
+
+def check_names(resolver):
+    ok = True
+    previous = rtss_reader.name_resolver
+    rtss_reader.name_resolver = resolver
+    try:
+        for raw, expected in EXPECTED:
+            got = rtss_reader.resolve_game_name(raw)
+            ok = ok and got == expected
+            print(f"{raw.decode().rsplit(chr(92), 1)[-1]:>34} -> {got[0]!r:<18} {'ok' if got == expected else f'MISMATCH (expected {expected[0]!r})'}")
+    finally:
+        rtss_reader.name_resolver = previous
+    return ok
+
+
+def check_debounce(resolver, path):
+    writes = []
+    replace = os.replace
+
+    def counting_replace(src, dst):
+        writes.append(dst)
+        replace(src, dst)
+
+    os.replace = counting_replace
+    try:
+        for i in range(5):
+            resolver.set_name("mygame", f"My Game {i}")
+        immediate = not os.path.exists(path)
+        time.sleep(SAVE_DELAY * 3)
+    finally:
+        os.replace = replace
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    ok = report("burst of renames saved once", immediate and len(writes) == 1
+                and saved.get("mygame") == "My Game 4" and not resolver.pending,
+                f"({len(writes)} write(s) for 5 renames, saved {saved.get('mygame')!r})")
+
+    # The lookup sees a rename before it is written
+    resolver.set_name("witcher3", "Witcher 3: Wild Hunt")
+    ok = report("rename visible before it is saved", resolver.lookup("witcher3_dx12") == "Witcher 3: Wild Hunt") and ok
+    resolver.flush()
+    return ok
+
+
+def check_retry(directory):
+    # Its directory does not exist yet, so the first write fails
+    path = os.path.join(directory, "later", "custom_game_names.json")
+    resolver = GameNameResolver(path=path, save_delay=SAVE_DELAY)
+    resolver.set_name("mygame", "My Game")
+    failed = resolver.flush() is False and resolver.pending == {"mygame": "My Game"} and resolver.save_timer is not None
+    os.makedirs(os.path.dirname(path))
+    time.sleep(SAVE_DELAY * 3)
+    saved = os.path.exists(path) and not resolver.pending
+    leftovers = [name for name in os.listdir(os.path.dirname(path)) if name != "custom_game_names.json"]
+    ok = report("failed save kept pending and retried", failed and saved and not leftovers,
+                f"(kept pending {failed}, written later {saved})")
+    resolver.stop()
+    return ok
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "custom_game_names.json")
+        resolver = GameNameResolver(path=path, save_delay=SAVE_DELAY)
+        ok = check_names(resolver)
+        ok = check_debounce(resolver, path) and ok
+        resolver.stop()
+        ok = check_retry(tmp) and ok
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,75 @@
+"""
+GPUFusion fed readings shaped like Afterburner, nvidia-smi and LHM ones:
+a reading of 0 is used like any other value, a missing field falls
+through to the next source, and two identical cards listed in a different
+order by each source stay paired with the right device.
+"""
+
+import sys
+
+from checks import report
+from gpu_fusion import GPUFusion
+
+TICK = 0.5
+
+
+def mahm(load, fan=None):
+    gpu = {"id": "GPU1", "name": "NVIDIA GeForce RTX 3070", "vendor": "nvidia", "bus": 1, "load": load, "temperature": 40.0}
+    if fan is not None:
+        gpu["fan_speed"] = fan
+    return [gpu]
+
+
+def lhm(load):
+    return [{"id": "/gpu-nvidia/0", "name": "NVIDIA GeForce RTX 3070", "load": load, "temperature": 41.0, "memory_total": 8192.0}]
+
+
+def check_zero_values():
+    fusion = GPUFusion(warmup=3)
+    now = 0.0
+    gpu = fusion.update({"mahm": mahm(97.0, fan=45.0), "lhm": lhm(50.0)}, now)[0]
+    ok = report("busy GPU from Afterburner", gpu["load"] == 97.0 and gpu["fan_speed"] == 45.0)
+
+    # Idle with the fan stopped: 0 from the preferred source, at once
+    now += TICK
+    gpu = fusion.update({"mahm": mahm(0.0, fan=0.0), "lhm": lhm(50.0)}, now)[0]
+    ok = report("idle load and stopped fan reported as 0", gpu["load"] == 0.0 and gpu["fan_speed"] == 0.0) and ok
+    ok = report("Afterburner keeps winning load", fusion.winners.get((("nvidia", 0), "load")) == "mahm") and ok
+
+    # Zeros for a whole warmup window still count as won fields
+    for _ in range(5):
+        now += TICK
+        gpu = fusion.update({"mahm": mahm(0.0, fan=0.0), "lhm": lhm(50.0)}, now)[0]
+    ok = report("source reporting zeros stays enabled", "mahm" in fusion.wanted(now) and gpu["load"] == 0.0) and ok
+
+    # A field Afterburner does not have comes from LHM
+    ok = report("missing field taken from the next source", gpu["memory_total"] == 8192.0) and ok
+    return ok
+
+
+def check_device_order():
+    fusion = GPUFusion()
+    readings = {
+        "nvidia_smi": [
+            {"id": "0", "name": "NVIDIA GeForce RTX 3070", "vendor": "nvidia", "bus": 1, "load": 10.0, "temperature": 50.0},
+            {"id": "1", "name": "NVIDIA GeForce RTX 3070", "vendor": "nvidia", "bus": 2, "load": 90.0, "temperature": 70.0},
+        ],
+        # WMI lists the second card first
+        "lhm": [
+            {"id": "/gpu-nvidia/1", "name": "NVIDIA GeForce RTX 3070", "load": 90.0, "temperature": 70.0, "memory_total": 8192.0},
+            {"id": "/gpu-nvidia/0", "name": "NVIDIA GeForce RTX 3070", "load": 10.0, "temperature": 50.0, "memory_total": 8192.0},
+        ],
+    }
+    fused = fusion.update(readings, 0.0)
+    got = [(gpu["load"], gpu["temperature"]) for gpu in fused]
+    return report("identical cards paired by device order", got == [(10.0, 50.0), (90.0, 70.0)])
+
+
+def main():
+    ok = check_zero_values()
+    ok = check_device_order() and ok
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
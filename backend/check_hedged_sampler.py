@@ -0,0 +1,92 @@
+"""
+HedgedSampler over stand-in CPU temperature providers that answer fast,
+slow, empty or never. A hung provider must cost no more than the budget,
+after which the last good value comes back with its age until it is
+older than max_age.
+"""
+
+import asyncio
+import sys
+import time
+
+from checks import report
+from hedged_sampler import HedgedSampler
+
+BUDGET = 0.2
+HEDGE_DELAY = 0.05
+MAX_AGE = 0.6
+
+
+class FakeProvider:
+    def __init__(self, value, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+async def timed(sampler):
+    start = time.monotonic()
+    value, age, source = await sampler.sample()
+    return value, age, source, time.monotonic() - start
+
+
+async def run():
+    primary = FakeProvider(65.0)
+    secondary = FakeProvider(60.0)
+    sampler = HedgedSampler([("primary", primary), ("secondary", secondary)],
+                            budget=BUDGET, hedge_delay=HEDGE_DELAY, max_age=MAX_AGE)
+
+    value, age, source, took = await timed(sampler)
+    ok = report("fast primary wins", (value, age, source) == (65.0, 0.0, "primary") and secondary.calls == 0)
+
+    # Slow primary: hedged with the secondary after hedge_delay
+    primary.delay = 1.0
+    value, age, source, took = await timed(sampler)
+    ok = report("slow primary hedged after hedge_delay", (value, source) == (60.0, "secondary") and took < BUDGET,
+                f"({took * 1000:.0f} ms)") and ok
+
+    # Empty answer: the next provider starts at once
+    await asyncio.sleep(1.0)
+    primary.delay = 0.0
+    primary.value = None
+    value, age, source, took = await timed(sampler)
+    ok = report("empty primary falls through at once", (value, source) == (60.0, "secondary") and took < HEDGE_DELAY,
+                f"({took * 1000:.0f} ms)") and ok
+
+    # Everything hangs: the last good value with its age, within the budget
+    primary.value, primary.delay = 65.0, 10.0
+    secondary.delay = 10.0
+    await asyncio.sleep(0.1)
+    value, age, source, took = await timed(sampler)
+    ok = report("hung providers: fallback value and its age",
+                value == 60.0 and source == "secondary" and age >= took > BUDGET - 0.01 and took < BUDGET + 0.05,
+                f"(age {age:.2f} s, {took * 1000:.0f} ms)") and ok
+
+    # Still hung: not started again, so no piling up
+    calls = (primary.calls, secondary.calls)
+    value, age, source, took = await timed(sampler)
+    ok = report("hung providers not called again", (primary.calls, secondary.calls) == calls and sampler.skipped_inflight == 2
+                and value == 60.0 and took < 0.05) and ok
+
+    # Past max_age the fallback is withheld, but its age and source are still known
+    await asyncio.sleep(MAX_AGE)
+    value, age, source, took = await timed(sampler)
+    ok = report("fallback older than max_age withheld", value is None and age > MAX_AGE and source == "secondary"
+                and sampler.expired == 1) and ok
+
+    for task in list(sampler.inflight.values()):
+        task.cancel()
+    return ok
+
+
+def main():
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
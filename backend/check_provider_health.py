@@ -0,0 +1,77 @@
+"""
+One ProviderHealth breaker walked through its states on a fake clock:
+closed until `failure_threshold` failures, open (calls skipped) for
+`open_for`, a single half-open probe, open again for twice as long when
+the probe fails and closed when it succeeds. Then the same through
+call(), where an exception or an empty result counts as a failure.
+"""
+
+import sys
+
+from checks import report
+from provider_health import CLOSED, HALF_OPEN, OPEN, ProviderHealth
+
+
+def check_transitions():
+    health = ProviderHealth("check", failure_threshold=3, open_for=5.0, max_open_for=20.0)
+    now = 100.0
+    ok = report("starts closed", health.state == CLOSED and health.allow(now))
+
+    health.failure(0.01, "x", now)
+    health.failure(0.01, "x", now)
+    ok = report("closed below the failure threshold", health.state == CLOSED and health.allow(now)) and ok
+    health.failure(0.01, "x", now)
+    ok = report("open at the failure threshold", health.state == OPEN) and ok
+    ok = report("calls skipped while open", not health.allow(now + 4.9) and health.skipped == 1) and ok
+
+    probe = health.allow(now + 5.0)
+    ok = report("half-open after open_for, one probe let through", probe and health.state == HALF_OPEN) and ok
+    ok = report("no second call during the probe", not health.allow(now + 5.0)) and ok
+
+    now += 5.0
+    health.failure(0.01, "x", now)
+    ok = report("failed probe reopens for twice as long", health.state == OPEN and health.open_until == now + 10.0) and ok
+    ok = report("still open before the longer wait", not health.allow(now + 9.9)) and ok
+
+    now += 10.0
+    probe = health.allow(now)
+    health.success(0.01)
+    ok = report("successful probe closes the breaker", probe and health.state == CLOSED and health.allow(now)) and ok
+    ok = report("open_for reset after closing", health.open_for == 5.0 and health.failures == 0) and ok
+
+    # The wait doubles up to max_open_for, never past it
+    for _ in range(3):
+        health.failure(0.01, "x", now)
+    for _ in range(5):
+        now = health.open_until
+        health.allow(now)
+        health.failure(0.01, "x", now)
+    ok = report("open_for capped at max_open_for", health.open_for == 20.0) and ok
+    return ok
+
+
+def check_call():
+    health = ProviderHealth("check", failure_threshold=2, open_for=60.0)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise OSError("gone")
+
+    ok = report("exception returns the default", health.call(failing, default="d") == "d" and health.last_error == "OSError: gone")
+    ok = report("empty result counts as a failure", health.call(list) is None and health.state == OPEN) and ok
+    ok = report("skipped call does not run the provider", health.call(failing, default="d") == "d" and len(calls) == 1) and ok
+
+    health = ProviderHealth("check", failure_threshold=1)
+    ok = report("valid=None accepts any result", health.call(bool, valid=None, default=True) is False and health.state == CLOSED) and ok
+    return ok
+
+
+def main():
+    ok = check_transitions()
+    ok = check_call() and ok
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
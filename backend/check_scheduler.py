@@ -0,0 +1,84 @@
+"""
+SensorScheduler with stand-in providers at their own cadences for a
+couple of seconds. Run times are compared with the deadline grid: a fast
+job neither drifts nor runs short, an overrunning job skips the missed
+ticks instead of catching up, a failing job keeps its cadence, and what
+the jobs return ends up in the SnapshotStore.
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import time
+
+from checks import report
+from sensor_scheduler import SensorScheduler
+from snapshot_store import SnapshotStore
+
+DURATION = 2.0
+INTERVAL = 0.05
+SLOW_INTERVAL = 0.1
+SLOW_RUN = 0.25
+# Event loop timer slack allowed around a deadline
+SLACK = 0.03
+
+
+async def run():
+    store = SnapshotStore()
+    scheduler = SensorScheduler(store)
+    starts = {"fast": [], "slow": [], "failing": [], "adaptive": []}
+
+    def job(name, duration=0.0, fail=False):
+        async def func():
+            starts[name].append(time.monotonic())
+            if duration:
+                await asyncio.sleep(duration)
+            if fail:
+                raise OSError("sensor gone")
+            return {name: len(starts[name])}
+        return func
+
+    scheduler.add("fast", INTERVAL, job("fast"))
+    scheduler.add("slow", SLOW_INTERVAL, job("slow", SLOW_RUN))
+    scheduler.add("failing", INTERVAL, job("failing", fail=True))
+    scheduler.add("adaptive", lambda: INTERVAL * 2, job("adaptive"))
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        scheduler.start()
+        await asyncio.sleep(DURATION)
+        scheduler.stop()
+    metrics = scheduler.metrics()
+
+    fast = starts["fast"]
+    expected_runs = int(DURATION / INTERVAL)
+    offsets = [t - (fast[0] + n * INTERVAL) for n, t in enumerate(fast)]
+    ok = report("fast job runs on its grid", abs(len(fast) - expected_runs) <= 1 and max(abs(o) for o in offsets) < SLACK,
+                f"({len(fast)} runs, worst offset {max(abs(o) for o in offsets) * 1000:.1f} ms)")
+
+    slow = starts["slow"]
+    gaps = [b - a for a, b in zip(slow, slow[1:])]
+    on_grid = all(abs(round((t - slow[0]) / SLOW_INTERVAL) * SLOW_INTERVAL - (t - slow[0])) < SLACK for t in slow)
+    ok = report("overrunning job skips missed ticks", min(gaps) >= SLOW_RUN and on_grid and metrics["slow"]["skipped"] > 0,
+                f"({len(slow)} runs, {metrics['slow']['skipped']} skipped)") and ok
+
+    failing = metrics["failing"]
+    ok = report("failing job keeps its cadence", abs(len(starts["failing"]) - expected_runs) <= 1
+                and failing["errors"] == len(starts["failing"]) and failing["last_error"] == "OSError: sensor gone") and ok
+    ok = report("repeated error printed once", output.getvalue().count("sensor gone") == 1) and ok
+
+    ok = report("callable interval followed", abs(len(starts["adaptive"]) - expected_runs // 2) <= 1) and ok
+
+    snapshot = store.latest()
+    published = snapshot.get("fast") == len(fast) and snapshot.get("slow") is not None and snapshot.get("failing") is None
+    ok = report("results published to the store", published and snapshot.version >= len(fast)) and ok
+    return ok
+
+
+def main():
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
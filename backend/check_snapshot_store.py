@@ -0,0 +1,76 @@
+"""
+A burst of concurrent request_data-style readers against a stale
+SnapshotStore shares one refresh and gets the same snapshot, even when
+one reader goes away mid-refresh. Young data is served without
+refreshing, a failed refresh reaches every waiter and the next call
+retries, and a publish() from another thread wakes wait().
+"""
+
+import asyncio
+import sys
+import threading
+
+from checks import report
+from snapshot_store import SnapshotStore
+
+READERS = 50
+REFRESH_TIME = 0.05
+MAX_AGE = 0.5
+
+
+async def run():
+    store = SnapshotStore()
+    refreshes = []
+
+    async def refresh():
+        refreshes.append(1)
+        await asyncio.sleep(REFRESH_TIME)
+        return {"cpu": len(refreshes), "gpu": len(refreshes)}
+
+    snapshots = await asyncio.gather(*(store.fresh(("cpu", "gpu"), MAX_AGE, refresh) for _ in range(READERS)))
+    ok = report("burst of stale readers shares one refresh", len(refreshes) == 1 and store.coalesced == READERS - 1
+                and len(set(id(s) for s in snapshots)) == 1 and snapshots[0].get("cpu") == 1,
+                f"({READERS} readers, {len(refreshes)} refresh)")
+
+    snapshot = await store.fresh(("cpu", "gpu"), MAX_AGE, refresh)
+    ok = report("young snapshot served without refreshing", len(refreshes) == 1 and store.hits == 1 and snapshot is snapshots[0]) and ok
+
+    # One reader disconnecting must not cancel the refresh the others wait for
+    await asyncio.sleep(0.01)
+    stale = await store.fresh(("cpu", "gpu"), 0.0, refresh)
+    first = asyncio.ensure_future(store.fresh(("cpu", "gpu"), 0.0, refresh))
+    second = asyncio.ensure_future(store.fresh(("cpu", "gpu"), 0.0, refresh))
+    await asyncio.sleep(0)
+    first.cancel()
+    result = await second
+    ok = report("cancelled reader leaves the refresh running", first.cancelled() and result.version > stale.version
+                and len(refreshes) == 3) and ok
+
+    async def refresh_disk():
+        return {"disk": 1}
+
+    async def failing():
+        await asyncio.sleep(REFRESH_TIME)
+        raise OSError("sensor gone")
+
+    results = await asyncio.gather(*(store.fresh(("disk",), MAX_AGE, failing) for _ in range(5)), return_exceptions=True)
+    failed = all(isinstance(r, OSError) for r in results)
+    retried = await store.fresh(("disk",), MAX_AGE, refresh_disk)
+    ok = report("failed refresh reaches every waiter, then retried", failed and retried.get("disk") == 1) and ok
+
+    # publish() from a sensor thread wakes a coroutine waiting for the next version
+    version = store.latest().version
+    waiter = asyncio.ensure_future(store.wait(version, timeout=1.0))
+    await asyncio.sleep(0)
+    threading.Timer(0.02, store.publish, args=({"fps": 144},)).start()
+    snapshot = await waiter
+    ok = report("publish from a thread wakes wait()", snapshot.version == version + 1 and snapshot.get("fps") == 144) and ok
+    return ok
+
+
+def main():
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,43 @@
+"""
+Runs the check_*.py correctness checks, all of them or the ones named:
+
+    python checks.py
+    python checks.py scheduler snapshot_store
+
+Each check module has a main() that prints its results and returns True
+when everything matched; this exits non-zero when any of them did not.
+The bench_*.py scripts measure instead and are run on their own.
+"""
+
+import glob
+import importlib
+import os
+import sys
+
+LABEL_WIDTH = 50
+
+
+def report(label, ok, detail=""):
+    """One result line for a check; returns ok so results can be chained"""
+    print(f"{label:>{LABEL_WIDTH}}: {'ok' if ok else 'MISMATCH'} {detail}".rstrip())
+    return ok
+
+
+def check_names():
+    here = os.path.dirname(os.path.abspath(__file__))
+    return sorted(os.path.basename(path)[len("check_"):-len(".py")]
+                  for path in glob.glob(os.path.join(here, "check_*.py")))
+
+
+def main(names):
+    failed = []
+    for name in names or check_names():
+        print(f"== {name}")
+        if not importlib.import_module(f"check_{name}").main():
+            failed.append(name)
+    print("failed: " + ", ".join(failed) if failed else "all checks ok")
+    return not failed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(sys.argv[1:]) else 1)
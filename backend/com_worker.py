@@ -0,0 +1,182 @@
+import asyncio
+import concurrent.futures
+import queue
+import threading
+import time
+from collections import deque
+
+try:
+    import pythoncom
+except ImportError:
+    # Windows only; without it the worker just runs calls on its thread
+    pythoncom = None
+
+
+class COMWorker:
+    """
+    One long-lived thread that owns COM and every WMI connection.
+
+    COM objects belong to the apartment of the thread that created them, so
+    WMI calls from whichever executor thread happens to be free can end up
+    crossing apartments. Here all of them run on a single thread, initialized
+    once, with connections kept open between calls. Requests carry a
+    deadline: one that expires while queued is dropped without running.
+
+    A call still running past its deadline means a hung WMI call, which
+    would block every request queued behind it. The next submit() or
+    timeout then abandons that thread and starts a new one, with its own
+    CoInitialize and connections; the old thread exits once its call
+    returns, if it ever does.
+    """
+
+    def __init__(self, name="com-worker", latency_samples=256):
+        self.name = name
+        self.requests = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        # .connections: key -> COM object, per worker thread (its apartment)
+        self.local = threading.local()
+        # (thread, deadline) of the call being run
+        self.running = None
+
+        self.calls = 0
+        self.completed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.expired = 0
+        self.abandoned = 0
+        self.latencies = deque(maxlen=latency_samples)
+        self.busy_since = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.requests.put(None)
+
+    def _replace_stuck(self):
+        """Abandons the worker thread if its current call is past its deadline"""
+        with self.lock:
+            running = self.running
+            if running is None or running[0] is not self.thread or time.monotonic() <= running[1]:
+                return
+            self.abandoned += 1
+            self.running = None
+            self.busy_since = None
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        me = threading.current_thread()
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        self.local.connections = {}
+        try:
+            while True:
+                request = self.requests.get()
+                if request is None:
+                    break
+                func, args, future, deadline = request
+                if not future.set_running_or_notify_cancel():
+                    # Timed out and cancelled by the caller while queued
+                    self.expired += 1
+                    continue
+                start = time.monotonic()
+                if start > deadline:
+                    # The caller already gave up on this one
+                    self.expired += 1
+                    future.set_exception(TimeoutError())
+                    continue
+                with self.lock:
+                    self.running = (me, deadline)
+                    self.busy_since = start
+                try:
+                    result = func(*args)
+                except Exception as e:
+                    self.errors += 1
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+                finally:
+                    self.completed += 1
+                    self.latencies.append(time.monotonic() - start)
+                with self.lock:
+                    if self.thread is not me:
+                        # Replaced while stuck in that call
+                        break
+                    self.running = None
+                    self.busy_since = None
+        finally:
+            self.local.connections.clear()
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def submit(self, func, *args, timeout=2.0):
+        """Queues func(*args) for the worker thread, returns a concurrent Future"""
+        self.start()
+        self._replace_stuck()
+        self.calls += 1
+        future = concurrent.futures.Future()
+        self.requests.put((func, args, future, time.monotonic() + timeout))
+        return future
+
+    def call(self, func, *args, timeout=2.0):
+        """Runs func(*args) on the worker thread, raising TimeoutError after `timeout`"""
+        future = self.submit(func, *args, timeout=timeout)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self.timeouts += 1
+            self._replace_stuck()
+            raise TimeoutError(f"{self.name}: call did not finish in {timeout}s")
+
+    async def call_async(self, func, *args, timeout=2.0):
+        future = self.submit(func, *args, timeout=timeout)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            self.timeouts += 1
+            self._replace_stuck()
+            raise TimeoutError(f"{self.name}: call did not finish in {timeout}s")
+
+    def connection(self, key, factory):
+        """Cached COM object for `key`, created with factory(). Worker thread only."""
+        conn = self.local.connections.get(key)
+        if conn is None:
+            conn = factory()
+            self.local.connections[key] = conn
+        return conn
+
+    def drop(self, key):
+        """Forgets a connection after an error so the next call reconnects"""
+        self.local.connections.pop(key, None)
+
+    def metrics(self):
+        latencies = sorted(self.latencies)
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p / 100.0 * len(latencies)))] * 1000, 2)
+        busy_since = self.busy_since
+        return {
+            "queue_depth": self.requests.qsize(),
+            "calls": self.calls,
+            "completed": self.completed,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "expired": self.expired,
+            "abandoned_threads": self.abandoned,
+            "latency_ms_p50": percentile(50),
+            "latency_ms_p99": percentile(99),
+            "busy_for": round(time.monotonic() - busy_since, 2) if busy_since is not None else 0.0,
+        }
+
+
+# Shared by every WMI consumer
+com_worker = COMWorker()
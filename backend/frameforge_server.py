@@ -5,7 +5,6 @@ Sends hardware stats (FPS, CPU, GPU, RAM) to the FrameForge mobile app
 
 import asyncio
 import platform
-import subprocess
 import psutil
 import socketio
 import sys
@@ -14,6 +13,7 @@ import threading
 import webbrowser
 import logging
 import queue
+import time
 import io
 
 import locale
@@ -167,9 +167,24 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import uvicorn
 from rtss_reader import RTSSReader, save_custom_name
+from process_watcher import ProcessWatcher, RTSS_PROCESS, AFTERBURNER_PROCESS
+from game_names import name_resolver
+from shared_memory import connection_metrics
 from mahm_reader import MAHMReader
-from lhm_reader import LHMReader
-import pythoncom
+from lhm_http_reader import create_lhm_reader
+from com_worker import com_worker
+from nvidia_smi import NvidiaSmiStream
+from gpu_fusion import GPUFusion, DEFAULT_PRIORITY
+from provider_health import provider, providers_status
+from hedged_sampler import HedgedSampler
+from sensor_pool import sensor_pool
+from loop_monitor import LoopLagMonitor
+from process_tracker import ProcessTracker
+from rtss_poller import AdaptivePoller
+from snapshot_store import SnapshotStore
+from sensor_scheduler import SensorScheduler
+import hardware_payload
+from hardware_payload import fps_values, hardware_dynamic, hardware_static, mahm_cpu
 import win32com.client
 from zeroconf import ServiceInfo, Zeroconf
 import socket
@@ -224,7 +239,6 @@ APP_NAME = "FrameForge Server"
 APP_VERSION = "1.3"
 REGISTRY_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
 SERVER_URL = "https://github.com/frameforgeAPP/frameforge-server"
-CREATE_NO_WINDOW = 0x08000000
 
 # ==================== CONFIG MANAGEMENT ====================
 
@@ -290,24 +304,49 @@ socket_app = socketio.ASGIApp(sio, app)
 # Global state
 monitoring_active = False
 connected_clients = set()
+# sids that receive hardware_static plus the dynamic-only hardware_update
+static_clients = set()
+STATIC_ROOM = "hardware_static"
+LEGACY_ROOM = "hardware_full"
+last_hardware_static = None
 server_stats = {
     "clients": 0,
-    "fps": 0,
-    "cpu_temp": 0,
-    "gpu_temp": 0,
     "uptime": 0,
-    "status": "Starting...",
-    "game": ""
+    "status": "Starting..."
 }
+start_time = 0
 
 FPS_SMOOTHING = False
+STATS_MAX_AGE = load_config().get("stats_max_age", 2.0)
+# Looked up once; it does not change while the server runs
+SYSTEM_INFO = {"hostname": platform.node(), "os": f"{platform.system()} {platform.release()}"}
 
 # GUI window reference
 gui_window = None
 
 rtss_reader = RTSSReader()
 mahm_reader = MAHMReader()
-lhm_reader = LHMReader()
+# "lhm_backend": "wmi" | "http" | "auto" (WMI, else LHM's web server)
+lhm_reader = create_lhm_reader(load_config())
+# Long-lived nvidia-smi child, started on first use; stopped while its
+# breaker is open and restarted ahead of the probe
+nvidia_smi = NvidiaSmiStream(health=provider("nvidia_smi.gpu"))
+# "gpu_source_priority": which source wins a GPU field when several have it
+gpu_fusion = GPUFusion(load_config().get("gpu_source_priority", DEFAULT_PRIORITY))
+process_tracker = ProcessTracker()
+# sid -> {"pid": ...} or {"game_id": ...}
+process_subscriptions = {}
+rtss_poller = AdaptivePoller(rtss_reader)
+process_watcher = ProcessWatcher(is_connected=rtss_reader.is_connected, on_start=lambda name: on_watched_start(name))
+# Latest reading of every provider; broadcast, request_data, the API and the GUI read from here
+sensor_store = SnapshotStore()
+sensor_scheduler = SensorScheduler(sensor_store)
+# Blocking sensor calls run here, never on the event loop; LHM and ACPI use the COM worker
+sensor_pool.add("mahm", workers=1, max_pending=4)
+sensor_pool.add("gpu", workers=1)
+sensor_pool.add("system", workers=1)
+sensor_pool.add("process", workers=1)
+loop_monitor = LoopLagMonitor()
 zeroconf = None
 mdns_info = None
 
@@ -350,32 +389,16 @@ def disable_auto_start():
 
 # ==================== HARDWARE MONITORING ====================
 
+def on_watched_start(name):
+    # Don't wait out the reconnect backoff of a block whose owner just started
+    if name == RTSS_PROCESS:
+        rtss_reader.connection.reset()
+    elif name == AFTERBURNER_PROCESS:
+        mahm_reader.connection.reset()
+
 def get_afterburner_status():
-    rtss_running = False
-    afterburner_running = False
-    
-    for proc in psutil.process_iter(['name']):
-        try:
-            proc_name = proc.info['name']
-            if proc_name and proc_name.lower() == 'rtss.exe':
-                rtss_running = True
-            elif proc_name and proc_name.lower() == 'msiafterburner.exe':
-                afterburner_running = True
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
-    
-    if rtss_running:
-        try:
-            test_reader = RTSSReader()
-            if test_reader.connect():
-                return 'running'
-        except:
-            pass
-    
-    if rtss_running or afterburner_running:
-        return 'installed'
-    
-    return 'not-found'
+    """O(1): kept up to date by process_watcher.refresh()"""
+    return process_watcher.status()
 
 @app.get("/api/ip")
 async def get_local_ip():
@@ -392,6 +415,38 @@ async def get_local_ip():
 async def get_afterburner_status_endpoint():
     return {"status": get_afterburner_status()}
 
+@app.get("/api/sensors")
+async def get_sensors():
+    """Afterburner sensor catalog: names, units, limits, GPU index and role"""
+    return {"sensors": await sensor_pool.run("mahm", mahm_reader.read_catalog)}
+
+@app.get("/api/providers")
+async def get_providers():
+    """Circuit breaker state, success rate and latency of every sensor provider"""
+    return {"providers": providers_status()}
+
+@app.get("/api/stats")
+async def get_stats():
+    """Latest hardware data, the same payload as the hardware_update event"""
+    return hardware_data(await fresh_snapshot())
+
+@app.get("/api/metrics")
+async def get_metrics():
+    return {
+        "rtss_poller": rtss_poller.metrics(),
+        "scheduler": sensor_scheduler.metrics(),
+        "snapshot": sensor_store.metrics(),
+        "mahm": mahm_reader.metrics(),
+        "loop_lag": loop_monitor.metrics(),
+        "sensor_pool": sensor_pool.metrics(),
+        "com_worker": com_worker.metrics(),
+        "process_watcher": process_watcher.metrics(),
+        "nvidia_smi": nvidia_smi.metrics(),
+        "gpu_fusion": gpu_fusion.metrics(),
+        "cpu_temp": cpu_temp_sampler.status(),
+        "connections": connection_metrics(),
+    }
+
 @app.get("/api/server-info")
 async def get_server_info():
     return {
@@ -401,125 +456,53 @@ async def get_server_info():
         "auto_start": is_auto_start_enabled()
     }
 
-def get_gpu_stats_nvidia_smi():
-    try:
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        startupinfo.wShowWindow = subprocess.SW_HIDE
-        
-        # Added 'utilization.memory' and better error handling
-        # Added clocks.gr, power.draw, fan.speed
-        result = subprocess.run(
-            ['nvidia-smi', '--query-gpu=index,name,utilization.gpu,memory.used,memory.total,temperature.gpu,clocks.gr,power.draw,fan.speed', 
-             '--format=csv,noheader,nounits'],
-            capture_output=True, text=True, startupinfo=startupinfo, creationflags=CREATE_NO_WINDOW
-        )
-        
-        if result.returncode == 0 and result.stdout.strip():
-            gpus = []
-            for line in result.stdout.strip().split('\n'):
-                try:
-                    parts = [p.strip() for p in line.split(',')]
-                    if len(parts) >= 9:
-                        # Safe float conversion
-                        def safe_float(val):
-                            try:
-                                return float(val)
-                            except:
-                                return 0.0
-
-                        gpus.append({
-                            "id": parts[0], 
-                            "name": parts[1],
-                            "load": safe_float(parts[2]),
-                            "memory_used": safe_float(parts[3]),
-                            "memory_total": safe_float(parts[4]),
-                            "temperature": safe_float(parts[5]),
-                            "clock": safe_float(parts[6]),
-                            "power": safe_float(parts[7]),
-                            "fan_speed": safe_float(parts[8])
-                        })
-                except:
-                    continue
-            return gpus
-    except Exception:
-        pass
-    return []
-
-def prioritize_gpus(gpu_list):
-    if not gpu_list:
-        return []
-        
-    def is_dedicated(name):
-        n = name.lower()
-        return "nvidia" in n or "radeon" in n or "rtx" in n or "gtx" in n or "rx" in n or "arc" in n
-
-    # Sort by:
-    # 1. Dedicated (True > False)
-    # 2. Load (Higher > Lower)
-    # 3. Memory Used (Higher > Lower)
-    return sorted(gpu_list, key=lambda x: (
-        is_dedicated(x['name']),
-        x['load'],
-        x['memory_used']
-    ), reverse=True)
+def call_mahm(func, timeout=1.0):
+    """MAHMReader is not thread-safe: every read goes through the one "mahm" thread"""
+    return sensor_pool.submit("mahm", func).result(timeout)
+
+def read_mahm_gpus():
+    """GPU list and whether it covers the nvidia-smi fields, read together on the "mahm" thread"""
+    gpus = mahm_reader.read_gpu_stats()
+    return gpus, bool(gpus) and mahm_reader.covers()
 
 def get_gpu_stats():
-    all_gpus = []
-    
+    """One entry per GPU, each field from the best source that has it (see GPUFusion)"""
+    now = time.monotonic()
+    wanted = gpu_fusion.wanted(now)
+    readings = {}
+
     # 1. Try MSI Afterburner (Best for gaming)
-    try:
-        mahm_gpus = mahm_reader.read_gpu_stats()
-        if mahm_gpus:
-            all_gpus.extend(mahm_gpus)
-    except:
-        pass
+    # Each source goes through its circuit breaker once per tick; a skipped one is simply not read.
+    # A busy or failing Afterburner pool counts as "covers nothing", so the fallbacks still run
+    mahm_covers = False
+    if "mahm" in wanted:
+        mahm_gpus, mahm_covers = provider("mahm.gpu").call(call_mahm, read_mahm_gpus,
+                                                           valid=lambda result: result[0], default=(None, False))
+        if mahm_gpus is not None:
+            readings["mahm"] = mahm_gpus
 
     # 2. Try LibreHardwareMonitor (Good general coverage)
+    if "lhm" in wanted:
+        # WMI calls stay on the COM worker thread
+        lhm_gpus = provider("lhm.gpu").call(com_worker.call, lhm_reader.read_gpu_stats, timeout=1.0)
+        if lhm_gpus is not None:
+            readings["lhm"] = lhm_gpus
+
+    # 3. Try Nvidia SMI (Reliable for Nvidia), unless Afterburner already has every field it would give
+    if "nvidia_smi" in wanted and not mahm_covers:
+        nvidia_gpus = provider("nvidia_smi.gpu").call(nvidia_smi.gpus)
+        if nvidia_gpus is not None:
+            readings["nvidia_smi"] = nvidia_gpus
+    elif nvidia_smi.running:
+        # Not needed: don't keep the child process around
+        nvidia_smi.stop()
+
+    return gpu_fusion.update(readings, now)
+
+def read_acpi_temp():
+    """Runs on the COM worker, which keeps the root\\wmi connection open"""
     try:
-        lhm_gpus = lhm_reader.read_gpu_stats()
-        if lhm_gpus:
-            all_gpus.extend(lhm_gpus)
-    except:
-        pass
-    
-    # 3. Try Nvidia SMI (Reliable for Nvidia)
-    try:
-        nvidia_gpus = get_gpu_stats_nvidia_smi()
-        if nvidia_gpus:
-            all_gpus.extend(nvidia_gpus)
-    except:
-        pass
-
-    if not all_gpus:
-        return []
-
-    # Deduplicate based on name (simple fuzzy match) or just prioritize and return unique top
-    # Simple deduplication: If we have multiple entries for "NVIDIA GeForce RTX 3060", take the one with highest load
-    
-    unique_gpus = {}
-    for gpu in all_gpus:
-        name = gpu['name']
-        # Create a normalized key
-        key = name.lower().replace("nvidia", "").replace("amd", "").replace("radeon", "").replace("geforce", "").strip()
-        
-        if key not in unique_gpus:
-            unique_gpus[key] = gpu
-        else:
-            # If we already have this GPU, keep the one with higher load or temp
-            existing = unique_gpus[key]
-            if gpu['load'] > existing['load']:
-                unique_gpus[key] = gpu
-            elif gpu['load'] == existing['load'] and gpu['temperature'] > existing['temperature']:
-                unique_gpus[key] = gpu
-
-    final_list = list(unique_gpus.values())
-    return prioritize_gpus(final_list)
-
-def get_wmi_temp():
-    try:
-        pythoncom.CoInitialize()
-        wmi = win32com.client.GetObject("winmgmts:root\\wmi")
+        wmi = com_worker.connection("root\\wmi", lambda: win32com.client.GetObject("winmgmts:root\\wmi"))
         items = wmi.ExecQuery("SELECT CurrentTemperature FROM MSAcpi_ThermalZoneTemperature")
         if not items:
             return 0.0
@@ -527,233 +510,190 @@ def get_wmi_temp():
         temp_c = (temp_dk / 10) - 273.15
         return round(temp_c, 1)
     except:
+        com_worker.drop("root\\wmi")
         return 0.0
-    finally:
-        try:
-            pythoncom.CoUninitialize()
-        except:
-            pass
+
+async def read_mahm_cpu_temp():
+    return await sensor_pool.run("mahm", mahm_reader.read_cpu_temp, timeout=2.0)
+
+# Preference order; providers with an open breaker are skipped without a call.
+# "cpu_temp_budget": seconds a sample may take before the last good value is used,
+# "cpu_temp_hedge_delay": seconds before the next provider is tried alongside,
+# "cpu_temp_max_age": seconds after which the last good value is no longer shown.
+cpu_temp_sampler = HedgedSampler(
+    [
+        ("mahm", lambda: provider("mahm.cpu_temp").call_async(read_mahm_cpu_temp)),
+        ("lhm", lambda: provider("lhm.cpu_temp").call_async(com_worker.call_async, lhm_reader.read_cpu_temp, timeout=2.0)),
+        ("acpi", lambda: provider("acpi.cpu_temp").call_async(com_worker.call_async, read_acpi_temp, timeout=2.0)),
+    ],
+    budget=load_config().get("cpu_temp_budget", 0.25),
+    hedge_delay=load_config().get("cpu_temp_hedge_delay", 0.05),
+    max_age=load_config().get("cpu_temp_max_age", 10.0),
+)
 
 async def get_cpu_temp():
-    loop = asyncio.get_event_loop()
-    async def run_blocking(func):
-        return await loop.run_in_executor(None, func)
-    try:
-        temp = await asyncio.wait_for(run_blocking(mahm_reader.read_cpu_temp), timeout=2.0)
-        if temp is not None:
-            return temp
-    except:
-        pass
-    try:
-        temp = await asyncio.wait_for(run_blocking(lhm_reader.read_cpu_temp), timeout=2.0)
-        if temp is not None:
-            return temp
-    except:
-        pass
+    """(temperature or 0, age in seconds, source); age 0 for a reading taken just now"""
+    temp, age, source = await cpu_temp_sampler.sample()
+    if not temp:
+        return 0, None, None
+    return temp, round(age, 1), source
+
+async def poll_fps():
+    now = asyncio.get_event_loop().time()
+    # Only re-reads RTSS when the shared memory changed
+    processes = rtss_poller.poll(now)
+    # Every live process keeps its own FPS / frame-time state
+    selected_pid = process_tracker.update(processes, now, FPS_SMOOTHING)
+    process_watcher.set_game(selected_pid)
+
+    # Forward RTSS process appeared/disappeared events
+    for event in rtss_reader.poll_events():
+        print(f"RTSS: {event['type']} {event['name']} (pid {event['pid']})")
+        await sio.emit('process_event', event)
+
+    return {"fps": fps_values(process_tracker, selected_pid)}
+
+def read_system():
+    cpu_freq = psutil.cpu_freq()
+    ram = psutil.virtual_memory()
+    return {
+        "cpu_load": psutil.cpu_percent(interval=None),
+        "cpu_freq": round(cpu_freq.current, 0) if cpu_freq else 0,
+        "ram": {
+            "percent": ram.percent,
+            "used_gb": round(ram.used / (1024**3), 1),
+            "total_gb": round(ram.total / (1024**3), 1)
+        },
+    }
+
+async def poll_system():
+    return {"system": await sensor_pool.run("system", read_system)}
+
+def read_mahm():
+    # Stats plus every Afterburner sensor, one bulk read
+    return mahm_reader.read_all_stats(), mahm_reader.read_sensor_snapshot()
+
+async def poll_temps():
+    mahm_data = None
+    mahm_sensors = None
     try:
-        temp = await loop.run_in_executor(None, get_wmi_temp)
-        if temp > 0:
-            return temp
+        mahm_data, mahm_sensors = await sensor_pool.run("mahm", read_mahm)
     except:
         pass
-    return 0
+
+    cpu = mahm_cpu(mahm_data)
+
+    # Fallback for CPU Temp
+    if cpu["temp"] == 0:
+        # A stale fallback value carries its age, so clients can tell it from a live one
+        cpu["temp"], cpu["temp_age"], cpu["temp_source"] = await get_cpu_temp()
+    return {"cpu": cpu, "sensors": mahm_sensors}
+
+async def poll_gpus():
+    return {"gpus": await sensor_pool.run("gpu", get_gpu_stats, timeout=3.0)}
+
+async def poll_processes():
+    status = await sensor_pool.run("process", process_watcher.refresh, timeout=5.0)
+    for event in process_watcher.poll_events():
+        if event["type"] == "status":
+            print(f"Afterburner status: {event['previous']} -> {event['status']}")
+            await sio.emit('afterburner_status', event)
+        else:
+            print(f"Process {event['type']}: {event['name']} (pid {event['pid']})")
+    return {"afterburner_status": status}
+
+async def refresh_sensors():
+    """One read of every slow provider at once, for readers that found the store stale"""
+    values = {}
+    for result in await asyncio.gather(poll_system(), poll_temps(), poll_gpus(), return_exceptions=True):
+        if isinstance(result, dict):
+            values.update(result)
+    return values
+
+async def fresh_snapshot():
+    # "stats_max_age": seconds a snapshot may be old before on-demand readers refresh it;
+    # normally the scheduler keeps it younger than that and no sensor is touched
+    return await sensor_store.fresh(("system", "cpu", "gpus"), STATS_MAX_AGE, refresh_sensors)
+
+def hardware_data(snapshot):
+    """hardware_update payload from one store snapshot"""
+    return hardware_payload.hardware_data(snapshot, process_tracker, asyncio.get_event_loop().time(),
+                                          FPS_SMOOTHING, SYSTEM_INFO, len(connected_clients))
 
 async def broadcast_stats():
-    global monitoring_active, server_stats
+    server_stats["clients"] = len(connected_clients)
+    server_stats["uptime"] = int(asyncio.get_event_loop().time() - start_time)
+
+    snapshot = sensor_store.latest()
+    if snapshot.version == 0:
+        return
+    global last_hardware_static
+    data = hardware_data(snapshot)
+    static = hardware_static(data)
+    if static != last_hardware_static:
+        last_hardware_static = static
+        await sio.emit('hardware_static', static, room=STATIC_ROOM)
+    # Clients that take hardware_static get only the live values
+    if static_clients:
+        await sio.emit('hardware_update', hardware_dynamic(data), room=STATIC_ROOM)
+    if len(static_clients) < len(connected_clients):
+        await sio.emit('hardware_update', data, room=LEGACY_ROOM)
+
+    # Detailed stream for clients subscribed to one process
+    await emit_process_updates(asyncio.get_event_loop().time())
+
+def start_monitoring():
+    """Every provider polls at its own rate into sensor_store; broadcast reads the store"""
+    global monitoring_active, rtss_poller, start_time
     monitoring_active = True
+
+    # FPS poll rate while a game renders / when idle (Hz)
+    config = load_config()
+    rtss_poller = AdaptivePoller(
+        rtss_reader,
+        active_rate=config.get("fps_poll_rate", 20.0),
+        idle_rate=config.get("idle_poll_rate", 1.0),
+    )
     start_time = asyncio.get_event_loop().time()
     server_stats["status"] = "Running"
-    
-    last_broadcast_time = 0
-    last_rtss_time = 0
-    last_rtss_update_ts = 0
-    
-    # State for delta calculation
-    last_total_frames = 0
-    
-    # EMA smoothing for FPS
-    smoothed_fps = 0.0
-    
-    while monitoring_active:
-        try:
-            current_time = asyncio.get_event_loop().time()
-            
-            # 1. Diagnostic Mode: Read ALL processes
-            processes = rtss_reader.read_all_processes()
-            
-            # Print status every 1 second
-            if current_time - last_broadcast_time >= 1.0:
-                print("\n--- RTSS STATUS ---")
-                print(f"DEBUG: Count={len(processes)}")
-                try:
-                    print(f"DEBUG: Raw={processes}")
-                except:
-                    print("DEBUG: Could not print raw data")
-                    
-                if not processes:
-                    print("No active processes found.")
-                else:
-                    for p in processes:
-                        print(f"App: {p['name']} | FPS: {p['fps']} | Time: {p['time']}")
-            
-            # Selection Logic:
-            # 1. Sort by Time (descending) to prioritize the most recently updated process
-            processes.sort(key=lambda x: x['time'], reverse=True)
-            
-            selected_process = None
-            
-            # 2. Pick the first one that has FPS > 0
-            # Since we sorted by time, this will be the most recent active game
-            for p in processes:
-                if p['fps'] > 0:
-                    selected_process = p
-                    break
-            
-            if selected_process:
-                raw_fps = selected_process['fps']
-                current_rtss_time = selected_process['time']
-                
-                # Apply EMA smoothing if enabled
-                if FPS_SMOOTHING:
-                    # Alpha = 0.3 (70% previous value + 30% new value)
-                    # This creates moderate smoothing, similar to RivaTuner
-                    alpha = 0.3
-                    if smoothed_fps == 0:
-                        smoothed_fps = float(raw_fps)  # Initialize
-                    else:
-                        smoothed_fps = (alpha * raw_fps) + ((1 - alpha) * smoothed_fps)
-                        # Cap to prevent overshoot when FPS drops
-                        smoothed_fps = min(smoothed_fps, float(raw_fps))
-                    # Use floor (int) instead of round to never exceed raw FPS
-                    final_fps = int(smoothed_fps)
-                else:
-                    final_fps = raw_fps
-                    smoothed_fps = float(raw_fps)  # Keep synchronized
-                
-                # Construct fps_data for compatibility with later code
-                fps_data = {
-                    "game_name": selected_process['name'],
-                    "game_id": selected_process['name'].lower(), # Simple ID generation
-                    "fps": final_fps
-                }
-                
-                if current_time - last_broadcast_time >= 1.0:
-                    print(f"-> SELECTED: {selected_process['name']} ({final_fps} FPS)")
-            else:
-                final_fps = 0
-                smoothed_fps = 0.0  # Reset when no game active
-                current_rtss_time = 0
-                fps_data = {} # Empty dict
-                
-                if current_time - last_broadcast_time >= 1.0:
-                    print("-> SELECTED: None (0 FPS)")
 
-            # Staleness Check (Zeroing)
-            if current_rtss_time != last_rtss_time:
-                last_rtss_time = current_rtss_time
-                last_rtss_update_ts = current_time
-            
-            if current_time - last_rtss_update_ts > 2.0:
-                final_fps = 0
-                if current_time - last_broadcast_time >= 1.0:
-                    print("-> STATUS: Stale (No updates for > 2s)")
-
-            # 2. Broadcast every 0.5 second
-            if current_time - last_broadcast_time >= 0.5:
-                last_broadcast_time = current_time
-
-                try:
-                    # Re-enable sensors
-                    mahm_data = None
-                    try:
-                        mahm_data = mahm_reader.read_all_stats()
-                    except:
-                        pass
-
-                    cpu_percent = psutil.cpu_percent(interval=None)
-                    cpu_temp = 0
-                    cpu_clock = 0
-                    cpu_power = 0
-                    
-                    if mahm_data:
-                        if mahm_data.get("cpu_temp"): cpu_temp = mahm_data["cpu_temp"]
-                        if mahm_data.get("cpu_clock"): cpu_clock = mahm_data["cpu_clock"]
-                        if mahm_data.get("cpu_power"): cpu_power = mahm_data["cpu_power"]
-                    
-                    # Fallback for CPU Temp
-                    if cpu_temp == 0:
-                        cpu_temp = await get_cpu_temp()
-
-                    cpu_freq = psutil.cpu_freq()
-                    if cpu_clock == 0 and cpu_freq:
-                        cpu_clock = round(cpu_freq.current, 0)
-                        
-                    ram = psutil.virtual_memory()
-                    gpus = get_gpu_stats()
-                except Exception as e:
-                    print(f"DEBUG: Error reading sensors: {e}")
-                    # Fallback values to ensure loop continues
-                    cpu_percent = 0
-                    cpu_temp = 0
-                    cpu_clock = 0
-                    cpu_power = 0
-                    ram = type('obj', (object,), {'percent': 0, 'used': 0, 'total': 0})
-                    gpus = []
-                
-                # Calculate frame time from FPS (ms per frame)
-                frame_time = round(1000 / final_fps, 2) if final_fps > 0 else 0
-                
-                server_stats["fps"] = final_fps
-                server_stats["cpu_temp"] = cpu_temp
-                server_stats["gpu_temp"] = gpus[0]["temperature"] if gpus else 0
-                server_stats["clients"] = len(connected_clients)
-                server_stats["uptime"] = int(asyncio.get_event_loop().time() - start_time)
-                server_stats["game"] = fps_data.get("game_name", "") if fps_data else ""
-                
-                # Enhanced data with all sensors
-                data = {
-                    "cpu": {
-                        "load": cpu_percent, 
-                        "temp": cpu_temp, 
-                        "freq": cpu_clock,
-                        "power": cpu_power
-                    },
-                    "ram": {
-                        "percent": ram.percent, 
-                        "used_gb": round(ram.used / (1024**3), 1), 
-                        "total_gb": round(ram.total / (1024**3), 1)
-                    },
-                    "gpus": gpus, 
-                    "fps": final_fps,
-                    "frame_time": frame_time,
-                    "fps_smoothing": FPS_SMOOTHING,
-                    "rtss_connected": fps_data is not None,
-                    "game": fps_data.get("game_name", "") if fps_data else "",
-                    "game_id": fps_data.get("game_id", "") if fps_data else "",
-                    "afterburner_status": get_afterburner_status(),
-                    "system": {"hostname": platform.node(), "os": f"{platform.system()} {platform.release()}"},
-                    "client_count": len(connected_clients)
-                }
-                
-                # DEBUG: Confirm data transmission
-                print(f"DEBUG: Sending FPS={final_fps} to {len(connected_clients)} clients")
-                    
-                await sio.emit('hardware_update', data)
-            
-            # Sleep 100ms (10Hz sampling)
-            await asyncio.sleep(0.1)
-        except:
-            # Sleep for 100ms (High frequency polling)
-            await asyncio.sleep(0.1)
+    # Cadences in seconds
+    sensor_scheduler.add("fps", lambda: rtss_poller.interval, poll_fps)
+    sensor_scheduler.add("system", config.get("system_poll_interval", 0.5), poll_system)
+    sensor_scheduler.add("gpu", config.get("gpu_poll_interval", 0.5), poll_gpus)
+    sensor_scheduler.add("temps", config.get("temp_poll_interval", 1.0), poll_temps)
+    sensor_scheduler.add("processes", config.get("process_scan_interval", 1.0), poll_processes)
+    sensor_scheduler.add("broadcast", config.get("broadcast_interval", 0.5), broadcast_stats)
+    sensor_scheduler.start()
+    loop_monitor.start()
+
+async def emit_process_updates(now):
+    for sid, subscription in list(process_subscriptions.items()):
+        state = process_tracker.find(subscription.get("pid"), subscription.get("game_id"))
+        if state is None:
+            continue
+        update = process_tracker.entry(state)
+        update["frame_stats"] = process_tracker.frame_stats(update["pid"], now)
+        await sio.emit('process_update', update, to=sid)
 
 @sio.event
 async def connect(sid, environ, auth=None):
     connected_clients.add(sid)
+    # Clients connecting with auth {"hardware_static": true} merge hardware_static
+    # into hardware_update themselves; older apps keep getting the full payload
+    if isinstance(auth, dict) and auth.get("hardware_static"):
+        static_clients.add(sid)
+        await sio.enter_room(sid, STATIC_ROOM)
+        await sio.emit('hardware_static', hardware_static(hardware_data(sensor_store.latest())), to=sid)
+    else:
+        await sio.enter_room(sid, LEGACY_ROOM)
     return True
 
 @sio.event
 async def disconnect(sid):
     connected_clients.discard(sid)
+    static_clients.discard(sid)
+    process_subscriptions.pop(sid, None)
 
 @sio.event
 async def ping(sid):
@@ -764,44 +704,39 @@ async def ping(sid):
 async def request_data(sid):
     """Send immediate hardware data when client requests it"""
     try:
-        cpu_percent = psutil.cpu_percent(interval=None)
-        cpu_temp = 0
-        
-        try:
-            mahm_data = mahm_reader.read_all_stats()
-            if mahm_data and mahm_data.get("cpu_temp") is not None:
-                cpu_temp = mahm_data["cpu_temp"]
-        except:
-            pass
-        
-        if cpu_temp == 0:
-            cpu_temp = await get_cpu_temp()
-        
-        cpu_freq = psutil.cpu_freq()
-        ram = psutil.virtual_memory()
-        gpus = get_gpu_stats()
-        fps_data = rtss_reader.read_fps()
-        fps = fps_data.get("fps", 0) if fps_data else 0
-        
-        config = load_config()
-        data = {
-            "cpu": {"load": cpu_percent, "temp": cpu_temp, "freq": cpu_freq.current if cpu_freq else 0},
-            "ram": {"percent": ram.percent, "used_gb": round(ram.used / (1024**3), 1), "total_gb": round(ram.total / (1024**3), 1)},
-            "gpus": gpus, "fps": fps,
-            "fps_smoothing": FPS_SMOOTHING,
-            "rtss_connected": fps_data is not None,
-            "game": fps_data.get("game_name", "") if fps_data else "",
-            "game_id": fps_data.get("game_id", "") if fps_data else "",
-            "afterburner_status": get_afterburner_status(),
-            "system": {"hostname": platform.node(), "os": f"{platform.system()} {platform.release()}"},
-            "client_count": len(connected_clients)
-        }
+        data = hardware_data(await fresh_snapshot())
+        if sid in static_clients:
+            # Static again first, in case it changed since connect
+            await sio.emit('hardware_static', hardware_static(data), to=sid)
+            data = hardware_dynamic(data)
         await sio.emit('hardware_update', data, to=sid)
     except Exception as e:
         print(f"Error sending initial data: {e}")
 
 
 
+@sio.event
+async def subscribe_process(sid, data):
+    """Stream process_update for one process, by {"pid": ...} or {"game_id": ...}; no payload unsubscribes"""
+    if data and not isinstance(data, dict):
+        return {"success": False, "error": 'expected {"pid": ...} or {"game_id": ...}'}
+    if data and data.get("pid") is not None:
+        try:
+            pid = int(data["pid"])
+        except (TypeError, ValueError):
+            return {"success": False, "error": f"invalid pid: {data['pid']!r}"}
+        process_subscriptions[sid] = {"pid": pid}
+    elif data and data.get("game_id"):
+        process_subscriptions[sid] = {"game_id": str(data["game_id"]).lower()}
+    else:
+        process_subscriptions.pop(sid, None)
+    return True
+
+@sio.event
+async def unsubscribe_process(sid):
+    process_subscriptions.pop(sid, None)
+    return True
+
 @sio.event
 async def set_game_name(sid, data):
     """Update custom game name mapping"""
@@ -837,7 +772,12 @@ async def api_set_game_name(update: GameNameUpdate):
 @app.on_event("startup")
 async def startup_event():
     global zeroconf, mdns_info
-    asyncio.create_task(broadcast_stats())
+    # Optional shared custom names file, hot-reloaded when edited
+    custom_names_file = load_config().get("custom_names_file")
+    if custom_names_file:
+        name_resolver.use_file(custom_names_file)
+    name_resolver.start_watching()
+    start_monitoring()
     try:
         zeroconf = Zeroconf()
         local_ip = socket.gethostbyname(socket.gethostname())
@@ -857,6 +797,12 @@ async def startup_event():
 async def shutdown_event():
     global monitoring_active, zeroconf, mdns_info
     monitoring_active = False
+    sensor_scheduler.stop()
+    name_resolver.stop()
+    com_worker.stop()
+    nvidia_smi.stop()
+    loop_monitor.stop()
+    sensor_pool.shutdown()
     if zeroconf and mdns_info:
         try:
             zeroconf.unregister_service(mdns_info)
@@ -1437,16 +1383,20 @@ class ServerGUI:
             return
         
         try:
-            cpu = psutil.cpu_percent(interval=None)
-            ram = psutil.virtual_memory().percent
+            snapshot = sensor_store.latest()
+            system = snapshot.get("system") or {}
+            fps_data = snapshot.get("fps") or {}
+            cpu = system.get("cpu_load", 0)
+            ram = (system.get("ram") or {}).get("percent", 0)
             
             self.cpu_label.configure(text=f"{int(cpu)}%")
             self.ram_label.configure(text=f"{int(ram)}%")
             
-            gpu_temp = server_stats.get('gpu_temp', 0)
+            gpus = snapshot.get("gpus") or []
+            gpu_temp = gpus[0]["temperature"] if gpus else 0
             self.gpu_label.configure(text=f"{int(gpu_temp)}°C" if gpu_temp else "--")
             
-            fps = server_stats.get('fps', 0)
+            fps = fps_data.get("fps", 0)
             self.fps_label.configure(text=str(fps))
             
             # FPS color
@@ -1476,7 +1426,7 @@ class ServerGUI:
                                             text_color=self.colors['text_dim'])
             
             # Update Game Name
-            game_name = server_stats.get("game", "")
+            game_name = fps_data.get("game_name", "")
             if game_name:
                 self.game_card.pack(fill='x', pady=(0, 10), after=self.afterburner_card)
                 self.game_name_label.configure(text=game_name)
@@ -1484,7 +1434,7 @@ class ServerGUI:
                 self.game_card.pack_forget()
                 
             # Update Afterburner Warning
-            afterburner_status = get_afterburner_status()
+            afterburner_status = snapshot.get("afterburner_status")
             if afterburner_status == 'not-found':
                 self.afterburner_card.pack(fill='x', pady=(0, 10), after=self.main_frame.winfo_children()[2]) # After status card
             else:
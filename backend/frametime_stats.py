@@ -0,0 +1,192 @@
+import math
+import time
+
+# Frame times outside this range (ms) are clamped into the edge buckets
+MIN_FRAME_TIME_MS = 0.05
+MAX_FRAME_TIME_MS = 5000.0
+
+PERCENTILES = (50, 95, 99, 99.9)
+
+EMPTY_SUMMARY = {"p50": 0, "p95": 0, "p99": 0, "max": 0, "low_1": 0, "low_0_1": 0, "samples": 0}
+
+
+class FrameTimeHistogram:
+    """
+    Rolling, constant-memory frame-time distribution.
+
+    Frame times are counted in log-spaced buckets (HDR-style: every bucket is
+    `precision` wider than the previous one), so memory is bounded by the
+    bucket count no matter how many frames are added. The window is split into
+    time slices; when a slice ages out its counts are subtracted from the
+    running totals, so queries never re-scan old samples.
+    """
+
+    def __init__(self, window=30.0, slices=10, precision=0.02):
+        self.slice_length = window / slices
+        self.slice_count = slices
+        self.log_base = math.log1p(precision)
+
+        # Each slice: [start, {bucket: count}, max frame time, min frame time]
+        self.slices = []
+        self.totals = {}
+        self.samples = 0
+
+    def _bucket(self, frame_time_ms):
+        frame_time_ms = min(max(frame_time_ms, MIN_FRAME_TIME_MS), MAX_FRAME_TIME_MS)
+        return int(math.log(frame_time_ms / MIN_FRAME_TIME_MS) / self.log_base)
+
+    def _bucket_value(self, bucket):
+        # Geometric midpoint of the bucket bounds
+        return MIN_FRAME_TIME_MS * math.exp((bucket + 0.5) * self.log_base)
+
+    def _expire(self, now):
+        while self.slices and now - self.slices[0][0] >= self.slice_length * self.slice_count:
+            _, counts, _, _ = self.slices.pop(0)
+            for bucket, count in counts.items():
+                remaining = self.totals[bucket] - count
+                if remaining:
+                    self.totals[bucket] = remaining
+                else:
+                    del self.totals[bucket]
+                self.samples -= count
+
+    def add(self, frame_time_ms, count=1, now=None):
+        if count <= 0 or frame_time_ms <= 0:
+            return
+        if now is None:
+            now = time.monotonic()
+        self._expire(now)
+
+        if not self.slices or now - self.slices[-1][0] >= self.slice_length:
+            self.slices.append([now, {}, 0.0, frame_time_ms])
+        current = self.slices[-1]
+
+        bucket = self._bucket(frame_time_ms)
+        current[1][bucket] = current[1].get(bucket, 0) + count
+        current[2] = max(current[2], frame_time_ms)
+        current[3] = min(current[3], frame_time_ms)
+        self.totals[bucket] = self.totals.get(bucket, 0) + count
+        self.samples += count
+
+    def percentiles(self, ps=PERCENTILES, now=None):
+        """
+        Frame time (ms) at each percentile in `ps` (ascending), or None when
+        empty. Bucket midpoints are clamped to the exact min and max seen, so
+        constant 16.67 ms frames report 16.67, not the bucket's 16.72.
+        """
+        if now is None:
+            now = time.monotonic()
+        self._expire(now)
+        if not self.samples:
+            return [None] * len(ps)
+
+        # Walk the occupied buckets once, at most bucket_count entries
+        results = []
+        targets = [p / 100.0 * self.samples for p in ps]
+        seen = 0
+        target_index = 0
+        for bucket in sorted(self.totals):
+            seen += self.totals[bucket]
+            while target_index < len(targets) and seen >= targets[target_index]:
+                results.append(self._bucket_value(bucket))
+                target_index += 1
+            if target_index == len(targets):
+                break
+        while len(results) < len(ps):
+            results.append(self._bucket_value(max(self.totals)))
+        low = min(s[3] for s in self.slices)
+        high = max(s[2] for s in self.slices)
+        return [min(max(value, low), high) for value in results]
+
+    def max_frame_time(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        self._expire(now)
+        return max((s[2] for s in self.slices), default=0.0)
+
+    def summary(self, now=None):
+        """
+        Payload for hardware_update. Lows are the FPS equivalents of the
+        99th / 99.9th percentile frame time.
+        """
+        if now is None:
+            now = time.monotonic()
+        p50, p95, p99, p999 = self.percentiles(PERCENTILES, now)
+        if p50 is None:
+            return dict(EMPTY_SUMMARY)
+        return {
+            "p50": round(p50, 2),
+            "p95": round(p95, 2),
+            "p99": round(p99, 2),
+            "max": round(self.max_frame_time(now), 2),
+            "low_1": round(1000.0 / p99, 1),
+            "low_0_1": round(1000.0 / p999, 1),
+            "samples": self.samples,
+        }
+
+
+class FrameTimeTracker:
+    """
+    Feeds one FrameTimeHistogram per RTSS process from consecutive
+    read_all_processes() snapshots.
+
+    RTSS counts dwFrames over a sampling window starting at dwTime0 and
+    stamps the latest frame in dwTime1 (ms). Between two polls the new
+    frames and the elapsed time give the average frame time; dwFrameTime
+    (the last frame) is kept as its own sample so hitches are not averaged
+    away, with the rest of the elapsed time spread over the other frames.
+    """
+
+    def __init__(self, window=30.0, slices=10, precision=0.02):
+        self.window = window
+        self.slices = slices
+        self.precision = precision
+        # pid -> [histogram, time0, time1, frames]
+        self.processes = {}
+
+    def update(self, processes, now=None):
+        if now is None:
+            now = time.monotonic()
+
+        seen = set()
+        for p in processes:
+            pid = p['pid']
+            seen.add(pid)
+            state = self.processes.get(pid)
+            if state is None:
+                histogram = FrameTimeHistogram(self.window, self.slices, self.precision)
+                self.processes[pid] = [histogram, p['time0'], p['time1'], p['frames']]
+                continue
+
+            histogram, last_time0, last_time1, last_frames = state
+            if p['time0'] == last_time0:
+                new_frames = p['frames'] - last_frames
+                elapsed = (p['time1'] - last_time1) & 0xFFFFFFFF
+            else:
+                # RTSS started a new sampling window; count what it holds so far
+                new_frames = p['frames']
+                elapsed = (p['time1'] - p['time0']) & 0xFFFFFFFF
+            state[1] = p['time0']
+            state[2] = p['time1']
+            state[3] = p['frames']
+
+            if new_frames <= 0 or elapsed <= 0:
+                continue
+
+            average = elapsed / new_frames
+            last_frame = p['frame_time']
+            if new_frames > 1 and average < last_frame < elapsed:
+                histogram.add(last_frame, 1, now)
+                histogram.add((elapsed - last_frame) / (new_frames - 1), new_frames - 1, now)
+            else:
+                histogram.add(average, new_frames, now)
+
+        for pid in list(self.processes):
+            if pid not in seen:
+                del self.processes[pid]
+
+    def summary(self, pid, now=None):
+        state = self.processes.get(pid)
+        if state is None:
+            return dict(EMPTY_SUMMARY)
+        return state[0].summary(now)
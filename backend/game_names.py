@@ -0,0 +1,252 @@
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+
+CUSTOM_NAMES_FILE = "custom_game_names.json"
+
+# Game Name Mapping (Executable -> Readable Name)
+GAME_NAME_MAPPING = {
+    "shproo": "Silent Hill 2",
+    "cs2": "Counter-Strike 2",
+    "dota2": "Dota 2",
+    "gta5": "Grand Theft Auto V",
+    "rdr2": "Red Dead Redemption 2",
+    "cyberpunk2077": "Cyberpunk 2077",
+    "witcher3": "The Witcher 3",
+    "valorant": "Valorant",
+    "league of legends": "League of Legends",
+    "fortniteclient-win64-shipping": "Fortnite",
+    "minecraft": "Minecraft",
+    "robloxplayerbeta": "Roblox",
+    "eurotrucks2": "Euro Truck Simulator 2",
+    "pubg": "PUBG: Battlegrounds",
+    "apex": "Apex Legends",
+    "cod": "Call of Duty",
+    "modernwarfare": "Call of Duty: MW",
+    "blackops6": "Call of Duty: BO6",
+    "eldenring": "Elden Ring",
+    "godofwar": "God of War",
+    "spiderman": "Spider-Man",
+    "forza": "Forza Horizon",
+    "forzahorizon5": "Forza Horizon 5",
+    "rocketleague": "Rocket League",
+    "overwatch": "Overwatch 2",
+    "re4": "Resident Evil 4",
+    "re2": "Resident Evil 2",
+    "re3": "Resident Evil 3",
+    "re7": "Resident Evil 7",
+    "re8": "Resident Evil Village",
+    "stardew valley": "Stardew Valley",
+    "terraria": "Terraria",
+    "among us": "Among Us",
+    "palworld": "Palworld",
+    "baldur": "Baldur's Gate 3",
+    "bg3": "Baldur's Gate 3",
+    "bg3_dx11": "Baldur's Gate 3",
+    "starfield": "Starfield",
+    "hogwartslegacy": "Hogwarts Legacy",
+    "ffxv": "Final Fantasy XV",
+    "ff7remake": "Final Fantasy VII Remake",
+}
+
+# Build/launcher suffix tokens that never change which game it is
+IGNORED_TOKENS = {"win64", "win32", "x64", "x86", "shipping", "dx11", "dx12", "vulkan", "vk", "gl", "game", "client"}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+def normalize_name(name):
+    """Lowercase alphanumerics only: 'Witcher3_DX12' -> 'witcher3dx12'"""
+    return _NON_ALNUM.sub('', name.lower())
+
+def name_tokens(name):
+    return [t for t in _NON_ALNUM.split(name.lower()) if t]
+
+class GameNameResolver:
+    """
+    Maps executable ids (lowercase, no .exe) to readable game names.
+
+    Builtin names from GAME_NAME_MAPPING are merged with the custom names
+    JSON into a normalized index, so `witcher3_dx12` finds `witcher3`.
+    Lookups go through a small LRU cache; renames update memory right away
+    and are written to disk by a timer thread, coalesced and atomically.
+    The file is polled for outside edits and reloaded when it changes.
+    """
+
+    def __init__(self, path=CUSTOM_NAMES_FILE, builtin=GAME_NAME_MAPPING, cache_size=128, save_delay=1.0, watch_interval=2.0):
+        self.path = path
+        self.builtin = builtin
+        self.cache_size = cache_size
+        self.save_delay = save_delay
+        self.watch_interval = watch_interval
+
+        self.lock = threading.Lock()
+        # Held by flush() while it writes the file
+        self.write_lock = threading.Lock()
+        self.custom = {}
+        # Renames not yet written to disk (survive a reload of the file)
+        self.pending = {}
+        self.names = {}
+        self.index = {}
+        self.cache = OrderedDict()
+        # Bumped on every change so callers can drop their own caches
+        self.version = 0
+
+        self.file_mtime = None
+        self.save_timer = None
+        self.watch_stop = None
+        self.reload()
+
+    def _rebuild(self):
+        names = dict(self.builtin)
+        names.update(self.custom)
+        index = {}
+        for key, value in names.items():
+            index.setdefault(normalize_name(key), value)
+        # Custom names win over builtins that normalize to the same key
+        for key, value in self.custom.items():
+            index[normalize_name(key)] = value
+        self.names = names
+        self.index = index
+        self.cache.clear()
+        self.version += 1
+
+    def _read_file(self):
+        try:
+            self.file_mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {k.lower(): v for k, v in data.items()} if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            self.file_mtime = None
+            return {}
+        except Exception as e:
+            print(f"Error loading custom names: {e}")
+            return {}
+
+    def reload(self):
+        custom = self._read_file()
+        with self.lock:
+            custom.update(self.pending)
+            self.custom = custom
+            self._rebuild()
+
+    def use_file(self, path):
+        """Switches to another custom names file (e.g. a shared one) and loads it"""
+        self.flush()
+        self.path = path
+        self.reload()
+
+    def _match(self, game_id):
+        name = self.names.get(game_id)
+        if name is not None:
+            return name
+        name = self.index.get(normalize_name(game_id))
+        if name is not None:
+            return name
+
+        # Without the trailing build tokens, the whole rest must be a known
+        # game: a leading match alone would make cod_launcher Call of Duty
+        tokens = name_tokens(game_id)
+        while tokens and tokens[-1] in IGNORED_TOKENS:
+            tokens.pop()
+        return self.index.get(''.join(tokens))
+
+    def lookup(self, game_id):
+        """Readable name for `game_id`, or None when unknown"""
+        with self.lock:
+            if game_id in self.cache:
+                self.cache.move_to_end(game_id)
+                return self.cache[game_id]
+            name = self._match(game_id)
+            self.cache[game_id] = name
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return name
+
+    def set_name(self, executable, name):
+        with self.lock:
+            key = executable.lower()
+            self.custom[key] = name
+            self.pending[key] = name
+            self._rebuild()
+            self._arm_save()
+        return True
+
+    def _arm_save(self):
+        if self.save_timer is None:
+            self.save_timer = threading.Timer(self.save_delay, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self):
+        """
+        Writes pending renames now (atomic replace); called by the save timer.
+        The file is written outside `lock`, so lookups and renames never wait
+        on the disk; `write_lock` keeps two flushes from interleaving. On
+        error the renames stay pending and the timer is armed again.
+        """
+        with self.write_lock:
+            with self.lock:
+                if self.save_timer is not None:
+                    self.save_timer.cancel()
+                    self.save_timer = None
+                if not self.pending:
+                    return True
+                data = dict(self.custom)
+                saved = dict(self.pending)
+
+            tmp_path = None
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, suffix='.tmp', delete=False) as f:
+                    tmp_path = f.name
+                    json.dump(data, f, indent=4)
+                os.replace(tmp_path, self.path)
+                mtime = os.stat(self.path).st_mtime_ns
+            except Exception as e:
+                print(f"Error saving custom name: {e}")
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                with self.lock:
+                    self._arm_save()
+                return False
+
+            with self.lock:
+                self.file_mtime = mtime
+                # Renames made during the write stay pending for the next flush
+                for key, value in saved.items():
+                    if self.pending.get(key) == value:
+                        del self.pending[key]
+            return True
+
+    def _file_changed(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        return mtime != self.file_mtime
+
+    def _watch(self, stop):
+        while not stop.wait(self.watch_interval):
+            if self._file_changed():
+                self.reload()
+
+    def start_watching(self):
+        if self.watch_stop is None:
+            self.watch_stop = threading.Event()
+            threading.Thread(target=self._watch, args=(self.watch_stop,), daemon=True).start()
+
+    def stop(self):
+        if self.watch_stop is not None:
+            self.watch_stop.set()
+            self.watch_stop = None
+        self.flush()
+
+# Load custom names on startup
+name_resolver = GameNameResolver()
@@ -0,0 +1,204 @@
+import re
+import time
+
+# Earlier sources win a field when they have a fresh value for it
+DEFAULT_PRIORITY = ("mahm", "nvidia_smi", "lhm")
+
+FIELDS = ("load", "memory_used", "memory_total", "temperature", "clock", "memory_clock",
+          "power", "power_percent", "fan_speed", "fan_rpm")
+# Always present in the output, as the readers have always reported them
+BASE_FIELDS = ("load", "memory_used", "memory_total", "temperature")
+
+# LibreHardwareMonitor identifiers: "/gpu-nvidia/0", "/gpu-amd/1", ...
+LHM_GPU_ID = re.compile(r'^/gpu-[a-z]+/(\d+)$')
+
+
+def gpu_vendor(gpu):
+    vendor = gpu.get("vendor")
+    if vendor:
+        return vendor
+    text = f"{gpu.get('id', '')} {gpu.get('name', '')}".lower()
+    if "nvidia" in text or "geforce" in text or "rtx" in text or "gtx" in text or "quadro" in text:
+        return "nvidia"
+    if "amd" in text or "radeon" in text or "ati" in text:
+        return "amd"
+    if "intel" in text or "arc" in text:
+        return "intel"
+    return None
+
+
+def is_dedicated(name):
+    n = name.lower()
+    return "nvidia" in n or "radeon" in n or "rtx" in n or "gtx" in n or "rx" in n or "arc" in n
+
+
+def device_order(gpu):
+    """Sort key placing a source's GPUs in device order, or None when it gives no hint"""
+    if gpu.get("bus") is not None:
+        return gpu["bus"]
+    match = LHM_GPU_ID.match(str(gpu.get("id", "")))
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def generic_name(name):
+    # Readers fall back to "GPU 1" when they do not know the model
+    return not name or (name.startswith("GPU ") and name[4:].isdigit())
+
+
+class GPUFusion:
+    """
+    Merges the GPU lists of several sources into one entry per device.
+
+    Devices are keyed by vendor and position: the Nth GPU of a vendor in a
+    source (ordered by PCI bus when the source knows it, by the index in
+    LHM's "/gpu-nvidia/N" identifier otherwise) is the Nth device of
+    that vendor, so two identical cards stay two devices. Each field is taken
+    from the first source in `priority` with a fresh value; a reading of 0 is
+    a value (idle GPU, stopped fan), only None or an absent field is missing.
+
+    Sources that have not won a single field after `warmup` polls are
+    disabled (no longer polled) and probed again every `reprobe_interval`
+    seconds, or at once when a winning source stops providing a field.
+    """
+
+    def __init__(self, priority=DEFAULT_PRIORITY, max_age=3.0, warmup=10, reprobe_interval=60.0):
+        self.priority = tuple(priority)
+        self.max_age = max_age
+        self.warmup = warmup
+        self.reprobe_interval = reprobe_interval
+
+        # (vendor, n) -> {"id", "name", "bus", "seen", "values": {(source, field): (value, time)}}
+        self.devices = {}
+        # (device key, field) -> winning source
+        self.winners = {}
+        # source -> polls in the current window, and whether it won a field in it
+        self.polls = {}
+        self.won = {}
+        # source -> time it was disabled
+        self.disabled = {}
+
+    def wanted(self, now=None):
+        """Sources worth polling this tick"""
+        if now is None:
+            now = time.monotonic()
+        for source, since in list(self.disabled.items()):
+            if now - since >= self.reprobe_interval:
+                self._enable(source)
+        return [source for source in self.priority if source not in self.disabled]
+
+    def _enable(self, source):
+        self.disabled.pop(source, None)
+        self.polls[source] = 0
+        self.won[source] = False
+
+    def _assign(self, readings):
+        """(device key, source, gpu) for every GPU reported this tick"""
+        groups = {}
+        for source, gpus in readings.items():
+            for gpu in gpus or ():
+                groups.setdefault((source, gpu_vendor(gpu)), []).append(gpu)
+
+        # A source that cannot tell the vendor ("GPU 1") joins the only vendor seen
+        vendors = set(vendor for _, vendor in groups if vendor)
+        vendors.update(vendor for vendor, _ in self.devices)
+        fallback = vendors.pop() if len(vendors) == 1 else None
+
+        assigned = []
+        for (source, vendor), group in groups.items():
+            vendor = vendor or fallback
+            # WMI returns hardware in no particular order: never pair by list position alone
+            if all(device_order(gpu) is not None for gpu in group):
+                group = sorted(group, key=device_order)
+            for n, gpu in enumerate(group):
+                assigned.append(((vendor, n), source, gpu))
+        return assigned
+
+    def update(self, readings, now=None):
+        """
+        `readings` maps each polled source to its GPU list. Returns the fused
+        list: dedicated GPUs first, then in device order.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        for key, source, gpu in self._assign(readings):
+            device = self.devices.get(key)
+            if device is None:
+                device = {"id": f"{key[0] or 'gpu'}:{key[1]}", "name": "", "bus": None, "values": {}}
+                self.devices[key] = device
+            device["seen"] = now
+            name = gpu.get("name", "")
+            if generic_name(device["name"]) and not generic_name(name):
+                device["name"] = name
+            elif not device["name"]:
+                device["name"] = name
+            if gpu.get("bus") is not None:
+                device["bus"] = gpu["bus"]
+            for field in FIELDS:
+                value = gpu.get(field)
+                if value is not None:
+                    device["values"][(source, field)] = (value, now)
+
+        for source in readings:
+            self.polls[source] = self.polls.get(source, 0) + 1
+
+        # Drop devices no source has reported for a while
+        lost_winner = False
+        for key in [k for k, d in self.devices.items() if now - d["seen"] > self.max_age]:
+            del self.devices[key]
+            for winner_key in [w for w in self.winners if w[0] == key]:
+                del self.winners[winner_key]
+                lost_winner = True
+
+        fused = []
+        for key, device in self.devices.items():
+            gpu = {"id": device["id"], "name": device["name"] or f"GPU {key[1] + 1}"}
+            for field in BASE_FIELDS:
+                gpu[field] = 0
+            values = device["values"]
+            for field in FIELDS:
+                winner = None
+                for source in self.priority:
+                    entry = values.get((source, field))
+                    if entry is not None and now - entry[1] <= self.max_age:
+                        winner = source
+                        gpu[field] = entry[0]
+                        break
+                previous = self.winners.get((key, field))
+                if previous is not None and winner is None:
+                    lost_winner = True
+                if winner is None:
+                    self.winners.pop((key, field), None)
+                else:
+                    self.winners[(key, field)] = winner
+                    self.won[winner] = True
+            gpu["vendor"] = key[0]
+            gpu["bus"] = device["bus"]
+            fused.append(gpu)
+
+        if lost_winner:
+            # Whoever provided it is gone; give the disabled sources a chance
+            for source in list(self.disabled):
+                self._enable(source)
+        else:
+            # Judge each source over windows of `warmup` polls
+            for source in readings:
+                if self.polls[source] >= self.warmup:
+                    if not self.won.get(source):
+                        self.disabled[source] = now
+                    self.polls[source] = 0
+                    self.won[source] = False
+
+        # Stable: dedicated first, then vendor and position
+        fused.sort(key=lambda gpu: (not is_dedicated(gpu["name"]), gpu["vendor"] or "", gpu["id"]))
+        return fused
+
+    def metrics(self):
+        return {
+            "priority": list(self.priority),
+            "disabled": sorted(self.disabled),
+            "winners": {f"{self.devices[key]['id']}.{field}": source
+                        for (key, field), source in self.winners.items() if key in self.devices},
+        }
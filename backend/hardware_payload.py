@@ -0,0 +1,95 @@
+"""
+Builds the hardware_update / hardware_static payloads from the values the
+sensor jobs publish into the SnapshotStore. Shared by frameforge_server
+and bench_replay.py, which times the same code on recorded captures.
+"""
+
+# Per-GPU fields that go in hardware_static rather than every hardware_update
+GPU_STATIC_FIELDS = ("name", "vendor", "bus")
+
+
+def fps_values(tracker, selected_pid):
+    """Store value for the "fps" key, from the process ProcessTracker selected"""
+    selected = tracker.get(selected_pid)
+    if not selected:
+        return {"fps": 0, "game_name": "", "game_id": "", "primary_pid": selected_pid}
+    return {
+        "fps": selected['fps'],
+        "game_name": selected['process']['name'],
+        "game_id": selected['process']['game_id'],
+        "primary_pid": selected_pid,
+        "stale": selected['stale'],
+    }
+
+
+def mahm_cpu(mahm_data):
+    """Store value for the "cpu" key from an Afterburner read; temp stays 0 when it has none"""
+    cpu = {"temp": 0, "temp_age": None, "temp_source": None, "clock": 0, "power": 0}
+    if mahm_data:
+        if mahm_data.get("cpu_temp"):
+            cpu["temp"], cpu["temp_age"], cpu["temp_source"] = mahm_data["cpu_temp"], 0.0, "mahm"
+        if mahm_data.get("cpu_clock"): cpu["clock"] = mahm_data["cpu_clock"]
+        if mahm_data.get("cpu_power"): cpu["power"] = mahm_data["cpu_power"]
+    return cpu
+
+
+def hardware_data(snapshot, tracker, now, fps_smoothing=False, system_info=None, client_count=0):
+    """hardware_update payload from one store snapshot"""
+    fps = snapshot.get("fps")
+    system = snapshot.get("system") or {}
+    cpu = snapshot.get("cpu") or {}
+    final_fps = fps["fps"] if fps else 0
+    primary_pid = fps["primary_pid"] if fps else None
+    return {
+        "cpu": {
+            "load": system.get("cpu_load", 0),
+            "temp": cpu.get("temp", 0),
+            "temp_age": cpu.get("temp_age"),
+            "temp_source": cpu.get("temp_source"),
+            "freq": cpu.get("clock") or system.get("cpu_freq", 0),
+            "power": cpu.get("power", 0)
+        },
+        "ram": system.get("ram") or {"percent": 0, "used_gb": 0, "total_gb": 0},
+        "gpus": snapshot.get("gpus") or [],
+        "sensors": snapshot.get("sensors"),
+        "fps": final_fps,
+        # Calculate frame time from FPS (ms per frame)
+        "frame_time": round(1000 / final_fps, 2) if final_fps > 0 else 0,
+        "frame_stats": tracker.frame_stats(primary_pid, now),
+        "processes": tracker.entries(),
+        "primary_pid": primary_pid,
+        "fps_smoothing": fps_smoothing,
+        "rtss_connected": fps is not None,
+        "game": fps["game_name"] if fps else "",
+        "game_id": fps["game_id"] if fps else "",
+        "afterburner_status": snapshot.get("afterburner_status"),
+        "system": system_info,
+        "client_count": client_count
+    }
+
+
+def hardware_static(data):
+    """What hardly ever changes in a hardware_data() payload; sent as hardware_static"""
+    sensors = data["sensors"]
+    return {
+        "system": data["system"],
+        "gpus": [{field: gpu.get(field) for field in ("id",) + GPU_STATIC_FIELDS} for gpu in data["gpus"]],
+        "ram": {"total_gb": data["ram"].get("total_gb", 0)},
+        "fps_smoothing": data["fps_smoothing"],
+        "afterburner_status": data["afterburner_status"],
+        # Afterburner sensor names/units, fixed for one MAHM layout
+        "sensors": {key: sensors[key] for key in ("layout", "names", "units")} if sensors else None,
+    }
+
+
+def hardware_dynamic(data):
+    """hardware_data() without what hardware_static carries; GPUs keep their id to match"""
+    dynamic = dict(data)
+    for key in ("system", "fps_smoothing", "afterburner_status"):
+        del dynamic[key]
+    dynamic["ram"] = {key: value for key, value in data["ram"].items() if key != "total_gb"}
+    dynamic["gpus"] = [{key: value for key, value in gpu.items() if key not in GPU_STATIC_FIELDS}
+                       for gpu in data["gpus"]]
+    if data["sensors"]:
+        dynamic["sensors"] = {"layout": data["sensors"]["layout"], "values": data["sensors"]["values"]}
+    return dynamic
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+
+class HedgedSampler:
+    """
+    Reads one value from a preference-ordered list of providers within a
+    single deadline budget.
+
+    The first provider starts at once; the next one is started when the
+    previous has not answered within `hedge_delay` or answered without a
+    value, and so on. The first valid value wins. When the budget runs out
+    the last known good value is returned together with its age, as long as
+    it is not older than `max_age` (then nothing is returned).
+
+    Each provider has at most one call in flight: a provider whose previous
+    call is still running (hung) is skipped rather than queued again, so
+    slow calls cannot pile up. Late answers are not awaited but still
+    refresh the last known good value.
+    """
+
+    def __init__(self, providers, budget=0.25, hedge_delay=0.05, valid=bool, max_age=None):
+        # [(name, coroutine function)] in preference order
+        self.providers = list(providers)
+        self.budget = budget
+        self.hedge_delay = hedge_delay
+        self.valid = valid
+        self.max_age = max_age
+
+        self.inflight = {}
+        self.last_value = None
+        self.last_source = None
+        self.last_time = None
+
+        self.samples = 0
+        self.fallbacks = 0
+        self.expired = 0
+        self.skipped_inflight = 0
+        self.wins = {}
+
+    def _record(self, name, task):
+        if task.cancelled() or task.exception() is not None:
+            return False
+        value = task.result()
+        if not self.valid(value):
+            return False
+        self.last_value = value
+        self.last_source = name
+        self.last_time = time.monotonic()
+        return True
+
+    def _late(self, name):
+        def done(task):
+            # A straggler that still found a value keeps the fallback fresh
+            if self.inflight.get(name) is task:
+                del self.inflight[name]
+            if not task.cancelled() and task.exception() is None and self.valid(task.result()):
+                if self.last_time is None or time.monotonic() - self.last_time > self.budget:
+                    self._record(name, task)
+        return done
+
+    async def sample(self):
+        """(value, age in seconds, source); value is None when nothing was ever read"""
+        self.samples += 1
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + self.budget
+        running = {}
+        queue = list(self.providers)
+
+        while True:
+            # Start the next provider that is not still busy with an earlier call
+            while queue:
+                name, func = queue.pop(0)
+                if name in self.inflight:
+                    self.skipped_inflight += 1
+                    continue
+                task = asyncio.ensure_future(func())
+                self.inflight[name] = task
+                task.add_done_callback(self._late(name))
+                running[task] = name
+                break
+
+            remaining = deadline - loop.time()
+            if not running or remaining <= 0:
+                break
+            # Wait for an answer, or hedge with the next provider after hedge_delay
+            wait = min(remaining, self.hedge_delay) if queue else remaining
+            done, _ = await asyncio.wait(list(running), timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                if self._record(name, task):
+                    self.wins[name] = self.wins.get(name, 0) + 1
+                    return self.last_value, 0.0, name
+
+        # Budget spent or every provider came back empty
+        self.fallbacks += 1
+        if self.last_time is None:
+            return None, None, None
+        age = time.monotonic() - self.last_time
+        if self.max_age is not None and age > self.max_age:
+            # Too old to pass off as the current reading
+            self.expired += 1
+            return None, age, self.last_source
+        return self.last_value, age, self.last_source
+
+    def status(self):
+        return {
+            "value": self.last_value,
+            "source": self.last_source,
+            "age": round(time.monotonic() - self.last_time, 1) if self.last_time is not None else None,
+            "samples": self.samples,
+            "fallbacks": self.fallbacks,
+            "expired": self.expired,
+            "skipped_inflight": self.skipped_inflight,
+            "in_flight": sorted(self.inflight),
+            "wins": dict(self.wins),
+        }
@@ -0,0 +1,203 @@
+import http.client
+import json
+import re
+
+from lhm_reader import LHMReader, classify_sensor, is_gpu_hardware
+from shared_memory import connection_manager
+
+LHM_HTTP_PORT = 8085
+LHM_DATA_PATH = "/data.json"
+
+# "45.3 °C", "87,5 %", "4096 MB" -> leading number
+VALUE_PATTERN = re.compile(r'-?\d+(?:[.,]\d+)?')
+
+
+def parse_value(text):
+    if isinstance(text, (int, float)):
+        return float(text)
+    match = VALUE_PATTERN.search(text or "")
+    if not match:
+        return None
+    return float(match.group(0).replace(',', '.'))
+
+
+class LHMHttpReader(LHMReader):
+    """
+    Reads LibreHardwareMonitor's built-in web server instead of WMI.
+
+    /data.json is a tree (computer -> hardware -> sensor groups -> sensors);
+    only sensor nodes carry a SensorId like "/gpu-nvidia/0/load/0", whose
+    prefix is the hardware identifier. Each SensorId is classified once
+    (the role map shared with LHMReader), later polls only walk the tree and
+    parse the values of known sensors. One keep-alive connection is reused
+    for every request.
+    """
+
+    def __init__(self, host="127.0.0.1", port=LHM_HTTP_PORT, timeout=1.0, max_age=0.25):
+        super().__init__(max_age=max_age)
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.http = None
+
+    def connect(self):
+        try:
+            self._fetch()
+            self.connected = True
+            return True
+        except Exception:
+            self._close_http()
+            self.connected = False
+            return False
+
+    def _close_http(self):
+        if self.http is not None:
+            try:
+                self.http.close()
+            except Exception:
+                pass
+        self.http = None
+
+    def _fetch(self):
+        # Retry once on a fresh connection: the server may have closed an idle one
+        for attempt in (0, 1):
+            if self.http is None:
+                self.http = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.http.request("GET", LHM_DATA_PATH, headers={"Connection": "keep-alive"})
+                response = self.http.getresponse()
+                body = response.read()
+                if response.status != 200:
+                    raise ConnectionError(f"LHM HTTP status {response.status}")
+                if response.will_close:
+                    self._close_http()
+                return json.loads(body)
+            except (http.client.HTTPException, ConnectionError, OSError):
+                self._close_http()
+                if attempt:
+                    raise
+
+    def _load_hardware(self):
+        # Hardware is discovered while walking the tree
+        pass
+
+    def _drop(self):
+        self._close_http()
+
+    def _role(self, sensor_id, sensor_type, name, hardware_name):
+        if sensor_id in self.roles:
+            return self.roles[sensor_id]
+        parent = sensor_id.rsplit('/', 2)[0]
+        if not sensor_type:
+            # Older LHM builds omit "Type"; it is also the identifier's group
+            sensor_type = sensor_id.rsplit('/', 2)[-2]
+        if parent not in self.hardware:
+            self.hardware[parent] = (hardware_name, is_gpu_hardware("gpu" if "gpu" in parent else "", hardware_name))
+        role = classify_sensor(name, sensor_type, self.hardware[parent][1])
+        if role is not None:
+            role = (role[0], parent, role[1])
+        self.roles[sensor_id] = role
+        return role
+
+    def _collect(self):
+        self.queries += 1
+        tree = self._fetch()
+
+        cpu_temp = None
+        gpus = {}
+        # (node, name of the hardware it belongs to)
+        stack = [(tree, "")]
+        while stack:
+            node, hardware_name = stack.pop()
+            sensor_id = node.get("SensorId")
+            if not sensor_id:
+                children = node.get("Children") or ()
+                # Hardware nodes hold groups ("Temperatures", "Load", ...) which hold sensors
+                if children and any(grandchild.get("SensorId") for child in children for grandchild in child.get("Children") or ()):
+                    hardware_name = node.get("Text", hardware_name)
+                # Reversed so sensors are visited in document order, like the WMI query
+                stack.extend((child, hardware_name) for child in reversed(children))
+                continue
+
+            role = self._role(sensor_id, node.get("Type"), node.get("Text", ""), hardware_name)
+            if role is None:
+                continue
+            val = parse_value(node.get("Value"))
+            if val is None:
+                continue
+            kind, parent, field = role
+            if kind == 'cpu_temp':
+                if cpu_temp is None and val > 0:
+                    cpu_temp = round(val, 1)
+                continue
+            gpu_data = gpus.get(parent)
+            if gpu_data is None:
+                # Fields without a sensor stay absent rather than 0
+                gpu_data = {"id": parent, "name": self.hardware[parent][0]}
+                gpus[parent] = gpu_data
+            gpu_data[field] = val
+
+        for identifier, (name, is_gpu) in self.hardware.items():
+            if is_gpu and identifier not in gpus:
+                gpus[identifier] = {"id": identifier, "name": name}
+
+        return {"cpu_temp": cpu_temp, "gpus": list(gpus.values())}
+
+
+class AutoLHMReader:
+    """
+    Uses the WMI reader while LibreHardwareMonitor publishes its namespace
+    and falls back to the HTTP server when it does not (WMI provider
+    disabled or missing).
+    """
+
+    def __init__(self, wmi_reader, http_reader):
+        self.readers = (wmi_reader, http_reader)
+        self.active = None
+        self.connection = connection_manager("LibreHardwareMonitor")
+
+    @property
+    def backend(self):
+        if self.active is None:
+            return None
+        return "http" if isinstance(self.active, LHMHttpReader) else "wmi"
+
+    def _select(self):
+        if self.active is not None and self.active.connected:
+            return self.active
+        if not self.connection.ready():
+            return None
+        for reader in self.readers:
+            if reader.connect():
+                self.active = reader
+                self.connection.succeeded()
+                return reader
+        self.active = None
+        self.connection.failed()
+        return None
+
+    def read_sensors(self):
+        reader = self._select()
+        return reader.read_sensors() if reader else None
+
+    def read_cpu_temp(self):
+        reader = self._select()
+        return reader.read_cpu_temp() if reader else None
+
+    def read_gpu_stats(self):
+        reader = self._select()
+        return reader.read_gpu_stats() if reader else []
+
+
+def create_lhm_reader(config):
+    """
+    LHM reader for the "lhm_backend" config key: "wmi", "http" or "auto"
+    (default). "lhm_http_port" sets the web server port.
+    """
+    backend = config.get("lhm_backend", "auto")
+    port = config.get("lhm_http_port", LHM_HTTP_PORT)
+    if backend == "wmi":
+        return LHMReader()
+    if backend == "http":
+        return LHMHttpReader(port=port)
+    return AutoLHMReader(LHMReader(), LHMHttpReader(port=port))
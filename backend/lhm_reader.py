@@ -1,16 +1,82 @@
-import wmi
-import pythoncom
+import time
+
+from com_worker import com_worker
+
+try:
+    import wmi
+except ImportError:
+    # Windows only; the reader stays disconnected elsewhere
+    wmi = None
+
+LHM_NAMESPACE = "root/LibreHardwareMonitor"
+
+# One projected query per tick instead of Hardware() + Sensor(...) per GPU
+SENSOR_QUERY = "SELECT Identifier, Name, SensorType, Value, Parent FROM Sensor"
+
+
+def is_gpu_hardware(hardware_type, name):
+    name = name.lower()
+    return hardware_type.lower() == "gpu" or "gpu" in name or "nvidia" in name or "radeon" in name
+
+
+def classify_sensor(name, sensor_type, gpu_parent):
+    """
+    Role of an LHM sensor as (role, field): ('cpu_temp', None) or
+    ('gpu', field). Returns None for sensors the reader does not use.
+    """
+    stype = sensor_type.lower()
+    sname = name.lower()
+    if gpu_parent:
+        if stype == "load" and "core" in sname:
+            return ('gpu', "load")
+        if stype == "temperature" and "core" in sname:
+            return ('gpu', "temperature")
+        # Memory in MB (SmallData) only: "Data" sensors are GB (D3D memory and
+        # the like) and would overwrite the MB value depending on query order
+        if stype == "smalldata" and "memory" in sname:
+            if "used" in sname:
+                return ('gpu', "memory_used")
+            if "total" in sname:
+                return ('gpu', "memory_total")
+        return None
+    if stype == "temperature" and ("CPU" in name or "Core" in name or "Package" in name) and "GPU" not in name:
+        return ('cpu_temp', None)
+    return None
+
 
 class LHMReader:
-    def __init__(self):
-        self.wmi_client = None
-        self.connected = False
+    """
+    LibreHardwareMonitor sensors over WMI. Must be called on the COM worker
+    (com_worker.call): the connection is kept per worker thread through
+    com_worker.connection(), so a replaced worker reconnects in its own
+    apartment instead of reusing the old thread's COM object.
+    """
+
+    def __init__(self, wmi_client=None, max_age=0.25, unknown_retry=30.0):
+        # A client can be passed in (already connected, or a stand-in for testing)
+        self.wmi_client = wmi_client
+        self.connected = wmi_client is not None
+        # Consumers asking within max_age seconds share one query
+        self.max_age = max_age
+
+        # hardware identifier -> (name, is gpu), refreshed when an unknown parent shows up
+        self.hardware = {}
+        # sensor identifier -> (role, parent, field) or None, classified once
+        self.roles = {}
+        # parent identifier -> when Hardware() last did not list it; retried
+        # after unknown_retry seconds or when the sensor layout changes
+        self.unknown = {}
+        self.unknown_retry = unknown_retry
+        self.sensor_count = None
+        self.snapshot = None
+        self.snapshot_time = 0.0
+        self.queries = 0
 
     def connect(self):
+        if wmi is None:
+            return False
         try:
-            # Initialize COM for the current thread (needed for WMI in threads/async)
-            pythoncom.CoInitialize()
-            self.wmi_client = wmi.WMI(namespace="root/LibreHardwareMonitor")
+            self._client()
             self.connected = True
             return True
         except Exception as e:
@@ -18,6 +84,16 @@ class LHMReader:
             self.connected = False
             return False
 
+    def _client(self):
+        if self.wmi_client is not None:
+            return self.wmi_client
+        return com_worker.connection(LHM_NAMESPACE, lambda: wmi.WMI(namespace=LHM_NAMESPACE))
+
+    def _drop(self):
+        """Forgets the connection after an error so the next read reconnects"""
+        if self.wmi_client is None:
+            com_worker.drop(LHM_NAMESPACE)
+
     def _parse_value(self, value):
         try:
             if isinstance(value, (int, float)):
@@ -29,75 +105,119 @@ class LHMReader:
         except Exception:
             return None
 
+    def _load_hardware(self):
+        self.queries += 1
+        hardware = {}
+        for hw in self._client().Hardware():
+            hardware[hw.Identifier] = (hw.Name, is_gpu_hardware(hw.HardwareType, hw.Name))
+        # Roles depend on the parent's type: only forget those of hardware
+        # that went away or changed, sensor identifiers start with the parent's
+        changed = set(parent for parent, info in self.hardware.items() if hardware.get(parent) != info)
+        if changed:
+            self.roles = {
+                identifier: role for identifier, role in self.roles.items()
+                if identifier.rsplit('/', 2)[0] not in changed
+            }
+        self.hardware = hardware
+        now = time.monotonic()
+        for parent in list(self.unknown):
+            if parent in hardware:
+                del self.unknown[parent]
+            else:
+                self.unknown[parent] = now
 
+    def _role(self, sensor):
+        identifier = sensor.Identifier
+        if identifier in self.roles:
+            return self.roles[identifier]
+        parent = sensor.Parent
+        if parent not in self.hardware:
+            last = self.unknown.get(parent)
+            if last is None or time.monotonic() - last >= self.unknown_retry:
+                self.unknown[parent] = 0.0
+                self._load_hardware()
+        known = parent in self.hardware
+        _, is_gpu = self.hardware.get(parent, ("", False))
+        role = classify_sensor(sensor.Name, sensor.SensorType, is_gpu)
+        if role is not None:
+            role = (role[0], parent, role[1])
+        # A sensor of an unknown parent is classified again once Hardware() lists it
+        if known:
+            self.roles[identifier] = role
+        return role
+
+    def _collect(self):
+        """Runs the sensor query and groups the values by hardware"""
+        self.queries += 1
+        sensors = self._client().query(SENSOR_QUERY)
+        if len(sensors) != self.sensor_count:
+            # Hardware added or removed: unknown parents may be listed now
+            self.sensor_count = len(sensors)
+            self.unknown = {}
+
+        cpu_temp = None
+        gpus = {}
+        for sensor in sensors:
+            role = self._role(sensor)
+            if role is None:
+                continue
+            val = self._parse_value(sensor.Value)
+            if val is None:
+                continue
+            kind, parent, field = role
+            if kind == 'cpu_temp':
+                if cpu_temp is None and val > 0:
+                    cpu_temp = round(val, 1)
+                continue
+            gpu_data = gpus.get(parent)
+            if gpu_data is None:
+                # Fields without a sensor stay absent rather than 0
+                gpu_data = {"id": parent, "name": self.hardware[parent][0]}
+                gpus[parent] = gpu_data
+            gpu_data[field] = val
+
+        # GPUs without any mapped sensor are still reported, as before
+        for identifier, (name, is_gpu) in self.hardware.items():
+            if is_gpu and identifier not in gpus:
+                gpus[identifier] = {"id": identifier, "name": name}
+
+        return {"cpu_temp": cpu_temp, "gpus": list(gpus.values())}
+
+    def read_sensors(self):
+        """
+        {"cpu_temp": ..., "gpus": [...]} from one WMI query, shared by
+        read_cpu_temp() and read_gpu_stats() for max_age seconds.
+        """
+        now = time.monotonic()
+        if self.snapshot is not None and now - self.snapshot_time < self.max_age:
+            return self.snapshot
 
-    def read_cpu_temp(self):
-        # Method 1: Try WMI via python-wmi
         if not self.connected:
             if not self.connect():
                 return None
 
         try:
-            # Query for Temperature sensors containing "CPU", "Core", or "Package"
-            sensors = self.wmi_client.Sensor(SensorType="Temperature")
-            for sensor in sensors:
-                if ("CPU" in sensor.Name or "Core" in sensor.Name or "Package" in sensor.Name) and "GPU" not in sensor.Name:
-                    val = self._parse_value(sensor.Value)
-                    if val is not None and val > 0:
-                        return round(val, 1)
-            
-            return None
-            
+            if not self.hardware:
+                self._load_hardware()
+            self.snapshot = self._collect()
+            self.snapshot_time = now
+            return self.snapshot
+
         except Exception:
             # Re-connect on error
+            self._drop()
             self.connected = False
+            self.snapshot = None
             return None
 
-    def read_gpu_stats(self):
-        if not self.connected:
-            if not self.connect():
-                return []
-
-        gpus = []
-        try:
-            # We need to find the GPU hardware first to get its ID/Name
-            hardware_list = self.wmi_client.Hardware()
-            
-            for hw in hardware_list:
-                if hw.HardwareType.lower() == "gpu" or "gpu" in hw.Name.lower() or "nvidia" in hw.Name.lower() or "radeon" in hw.Name.lower():
-                    gpu_data = {
-                        "id": hw.Identifier,
-                        "name": hw.Name,
-                        "load": 0,
-                        "memory_used": 0,
-                        "memory_total": 0, # LHM might not provide total easily via WMI without more complex queries
-                        "temperature": 0
-                    }
-                    
-                    # Now find sensors for this hardware
-                    sensors = self.wmi_client.Sensor(Parent=hw.Identifier)
-                    for sensor in sensors:
-                        val = self._parse_value(sensor.Value)
-                        if val is None: continue
-                        
-                        stype = sensor.SensorType.lower()
-                        sname = sensor.Name.lower()
-                        
-                        if stype == "load" and "core" in sname:
-                            gpu_data["load"] = val
-                        elif stype == "temperature" and "core" in sname:
-                            gpu_data["temperature"] = val
-                        elif stype == "smalldata" and "memory" in sname and "used" in sname:
-                             # LHM often reports memory used in MB
-                             gpu_data["memory_used"] = val
-                        elif stype == "data" and "memory" in sname and "used" in sname:
-                             gpu_data["memory_used"] = val
-
-                    # If we found at least some data, add it
-                    gpus.append(gpu_data)
-                    
-            return gpus
+    def read_cpu_temp(self):
+        snapshot = self.read_sensors()
+        if snapshot is None:
+            return None
+        return snapshot["cpu_temp"]
 
-        except Exception:
-            self.connected = False
+    def read_gpu_stats(self):
+        snapshot = self.read_sensors()
+        if snapshot is None:
             return []
+        return [dict(gpu) for gpu in snapshot["gpus"]]
@@ -0,0 +1,54 @@
+import asyncio
+from collections import deque
+
+from sensor_pool import percentile
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the asyncio loop runs a callback it scheduled itself.
+
+    Every `interval` seconds a task asks to be woken `interval` later and
+    records how far past that it actually ran. While something blocks the
+    loop (a sensor read, a subprocess) the delay shows up here, and so does
+    the delay every Socket.IO ping and HTTP request waiting behind it.
+    """
+
+    def __init__(self, interval=0.05, samples=1200, stall_after=0.1):
+        self.interval = interval
+        self.stall_after = stall_after
+        self.lags = deque(maxlen=samples)
+        self.task = None
+
+        self.stalls = 0
+        self.max_lag = 0.0
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.stall_after:
+                self.stalls += 1
+
+    def metrics(self):
+        lags = list(self.lags)
+        return {
+            "lag_ms_p50": percentile(lags, 50),
+            "lag_ms_p99": percentile(lags, 99),
+            "lag_ms_max": round(self.max_lag * 1000, 2),
+            "stalls": self.stalls,
+            "samples": len(lags),
+        }
@@ -1,270 +1,630 @@
-import mmap
+import re
 import struct
 import ctypes
+import time
+from array import array
+
+from shared_memory import connection_manager, open_mapping
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: bulk sensor reads fall back to struct per entry
+    np = None
 
 # MSI Afterburner Shared Memory Name
 MAHM_SHARED_MEMORY_NAME = "MAHMSharedMemory"
 
+# Header: signature, version, header size, entry count, entry size
+MAHM_HEADER = struct.Struct('<4sIIII')
+# v2 header continues with time, GPU entry count, GPU entry size
+MAHM_TIME = struct.Struct('<i')
+MAHM_TIME_OFFSET = 20
+MAHM_GPU_HEADER = struct.Struct('<II')
+MAHM_GPU_HEADER_OFFSET = 24
+# Entry: Name(260) + Units(260) + LocName(260) + LocUnits(260) + Format(260) = 1300
+MAHM_NAME_SIZE = 260
+MAHM_DATA_OFFSET = 1300
+MAHM_VALUE = struct.Struct('<f')
+# data, minLimit, maxLimit, dwFlags
+MAHM_ENTRY_DATA = struct.Struct('<fffI')
+# data, minLimit, maxLimit, dwFlags, dwGpu, dwSrcId
+MAHM_ENTRY_INFO = struct.Struct('<fffIII')
+# GPU entry: GpuId(260) + Family(260) + Device(260) + Driver(260) + BIOS(260), then dwMemAmount (KB)
+MAHM_GPU_DEVICE_OFFSET = 520
+MAHM_GPU_MEMORY_OFFSET = 1300
+MAHM_NO_GPU = 0xFFFFFFFF
+
+# szGpuId looks like "VEN_10DE&DEV_2484&SUBSYS_...&BUS_1&DEV_0&FN_0"
+GPU_ID_PATTERN = re.compile(r'VEN_([0-9A-Fa-f]{4}).*?BUS_(\d+)')
+PCI_VENDORS = {"10DE": "nvidia", "1002": "amd", "8086": "intel"}
+
+# Sources Afterburner names without a GPU prefix on single-GPU setups
+UNPREFIXED_GPU_SOURCES = ("GPU temperature", "GPU usage", "Memory usage", "Core clock",
+                          "Memory clock", "Power", "Fan speed", "Fan tachometer")
+
+# Fields nvidia-smi is queried for; when Afterburner has all of them it is skipped
+NVIDIA_SMI_FIELDS = ("load", "memory_used", "memory_total", "temperature", "clock", "power", "fan_speed")
+
+_entry_dtypes = {}
+
+def entry_data_dtype(entry_size):
+    """NumPy dtype over data/min/max/flags of one entry, strided by the entry size"""
+    dtype = _entry_dtypes.get(entry_size)
+    if dtype is None:
+        dtype = np.dtype({
+            'names': ['data', 'min', 'max', 'flags'],
+            'formats': ['<f4', '<f4', '<f4', '<u4'],
+            'offsets': [MAHM_DATA_OFFSET, MAHM_DATA_OFFSET + 4, MAHM_DATA_OFFSET + 8, MAHM_DATA_OFFSET + 12],
+            'itemsize': entry_size,
+        })
+        _entry_dtypes[entry_size] = dtype
+    return dtype
+
+def _cstring(buf, offset, size=MAHM_NAME_SIZE):
+    end = buf.find(b'\x00', offset, offset + size)
+    if end == -1:
+        end = offset + size
+    return buf[offset:end].decode('latin-1', errors='ignore')
+
+def gpu_field(metric, units=""):
+    """GPU dict key for a metric name such as "usage" or "core clock" """
+    if "temperature" in metric:
+        return "temperature"
+    if "usage" in metric and "memory" not in metric and "bus" not in metric and "fb" not in metric and "vid" not in metric:
+        return "load"
+    if "memory usage" in metric:
+        return "memory_used"
+    if "memory clock" in metric:
+        return "memory_clock"
+    if "clock" in metric:
+        return "clock"
+    if metric == "power":
+        # Afterburner reports power either in watts or as % of the power limit
+        return "power_percent" if units == "%" else "power"
+    if "fan speed" in metric:
+        return "fan_speed"
+    if "fan tachometer" in metric:
+        return "fan_rpm"
+    return None
+
+def classify_sensor(name, units="", gpu_index=MAHM_NO_GPU):
+    """
+    Role of a MAHM source name as (role, gpu_id, field):
+    'cpu_temp' (field True for the package sensor), 'cpu_usage', 'cpu_clock',
+    'cpu_power', 'framerate', 'frametime' or 'gpu'.
+    Returns None for sensors the reader does not use.
+    """
+    if "CPU" in name and "temperature" in name.lower() and "GPU" not in name:
+        return ('cpu_temp', None, name == "CPU temperature")
+    if name == "CPU usage":
+        return ('cpu_usage', None, None)
+    if name == "CPU clock":
+        return ('cpu_clock', None, None)
+    if name == "CPU power":
+        return ('cpu_power', None, None)
+    if name == "Framerate":
+        return ('framerate', None, None)
+    if name == "Frametime":
+        return ('frametime', None, None)
+    if name.startswith("GPU"):
+        # Examples: "GPU1 temperature", "GPU2 usage", "GPU1 memory usage"
+        parts = name.split(' ')
+        if len(parts) >= 2:
+            gpu_id_str = parts[0].replace("GPU", "")
+            if gpu_id_str.isdigit():
+                metric = " ".join(parts[1:]).lower()
+                return ('gpu', int(gpu_id_str), gpu_field(metric, units))
+    if name in UNPREFIXED_GPU_SOURCES and gpu_index != MAHM_NO_GPU:
+        # Single-GPU naming: the index only lives in dwGpu (0-based)
+        metric = name.lower()
+        if metric.startswith("gpu "):
+            metric = metric[4:]
+        return ('gpu', gpu_index + 1, gpu_field(metric, units))
+    return None
+
+
+class MAHMSensor:
+    """One catalog entry, decoded once per layout"""
+
+    def __init__(self, index, offset, name, units, local_name, local_units,
+                 min_limit, max_limit, gpu, src_id, role):
+        self.index = index
+        self.offset = offset
+        self.name = name
+        self.units = units
+        self.local_name = local_name
+        self.local_units = local_units
+        self.min = min_limit
+        self.max = max_limit
+        self.gpu = None if gpu == MAHM_NO_GPU else gpu
+        self.src_id = src_id
+        # (role, gpu_id, field) from classify_sensor(), or None
+        self.role = role
+
+    def as_dict(self):
+        return {
+            "index": self.index,
+            "name": self.name,
+            "units": self.units,
+            "local_name": self.local_name,
+            "local_units": self.local_units,
+            "min": self.min,
+            "max": self.max,
+            "gpu": self.gpu,
+            "src_id": self.src_id,
+            "role": self.role[0] if self.role else None,
+            "field": self.role[2] if self.role and self.role[0] == 'gpu' else None,
+        }
+
 class MAHMReader:
-    def __init__(self):
+    def __init__(self, path=None, use_numpy=None, cache=True, max_cache_age=1.0):
+        # Optional file path serving the shared memory (synthetic/recorded snapshots)
+        self.path = path
         self.map_file = None
+        # Backoff/absence state shared with every other reader of this block
+        self.connection = connection_manager(path or MAHM_SHARED_MEMORY_NAME)
         self.header_size = 0
         self.entry_count = 0
         self.entry_size = 0
-        
+        self.gpu_entry_count = 0
+        self.gpu_entry_size = 0
+
+        # Sensor catalog and offsets, rebuilt only when the layout above changes
+        self.index_layout = None
+        self.catalog = []
+        self.cpu_temp_package = None
+        self.cpu_temp_offsets = []
+        # role -> offset for single-valued sources (cpu_usage, framerate, ...)
+        self.scalar_offsets = {}
+        self.gpu_ids = []
+        self.gpu_fields = []
+        # gpu_id -> dict of static fields (name, memory_total) every read starts from
+        self.gpu_static = {}
+
+        # Every entry's name and its values, refreshed by read_sensor_values()
+        if use_numpy is None:
+            use_numpy = np is not None
+        self.use_numpy = use_numpy and np is not None
+        self.sensor_names = []
+        self.sensor_units = []
+        # Bumped whenever the index is rebuilt, so clients can cache names/units per layout
+        self.layout_version = 0
+        self.values = []
+        self.limits_min = []
+        self.limits_max = []
+        self.flags = []
+
+        # Snapshots are reused until Afterburner stamps a new header time.
+        # time_t only has one-second resolution, so faster polling periods
+        # are still picked up after max_cache_age.
+        self.cache = cache
+        self.max_cache_age = max_cache_age
+        self.stats_cache = None     # (header time, read at, stats)
+        self.sensors_cache = None   # (header time, read at, sensors)
+        self.last_time = None
+        self.last_change = None
+        # Estimated Afterburner polling period (s), None until two updates were seen
+        self.refresh_period = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def connect(self):
+        # Skip the attempt entirely while Afterburner is known to be absent
+        if not self.connection.ready():
+            return False
         try:
             # Step 1: Open with small size to read header
-            temp_map = mmap.mmap(-1, 1024, MAHM_SHARED_MEMORY_NAME, access=mmap.ACCESS_READ)
-            
-            temp_map.seek(0)
-            signature = temp_map.read(4)
-            
+            temp_map = open_mapping(MAHM_SHARED_MEMORY_NAME, 1024, self.path)
+
+            layout = self._read_layout(temp_map)
+            temp_map.close()
+
             # Accept both MAHM and MHAM signatures
-            if signature != b'MAHM' and signature != b'MHAM':
-                temp_map.close()
+            if layout is None:
+                self.connection.failed()
                 return False
 
-            temp_map.seek(8)
-            self.header_size = struct.unpack('I', temp_map.read(4))[0]
-            self.entry_count = struct.unpack('I', temp_map.read(4))[0]
-            self.entry_size = struct.unpack('I', temp_map.read(4))[0]
-            
-            total_size = self.header_size + (self.entry_count * self.entry_size)
-            temp_map.close()
-            
+            self.header_size, self.entry_count, self.entry_size, self.gpu_entry_count, self.gpu_entry_size = layout
+            total_size = self._layout_size(layout)
+
             # Step 2: Reopen with exact size
-            self.map_file = mmap.mmap(-1, total_size, MAHM_SHARED_MEMORY_NAME, access=mmap.ACCESS_READ)
+            self.map_file = open_mapping(MAHM_SHARED_MEMORY_NAME, total_size, self.path)
+            self.connection.succeeded()
             return True
-            
+
         except FileNotFoundError:
+            self.connection.failed()
             return False
         except Exception as e:
             print(f"Error connecting to MAHM: {e}")
+            self.connection.failed()
             return False
 
-    def read_cpu_temp(self):
+    def close(self):
+        self.stats_cache = None
+        self.sensors_cache = None
+        if self.map_file:
+            try:
+                self.map_file.close()
+            except BufferError:
+                # A view is still exported; the mapping is released once it is collected
+                pass
+        self.map_file = None
+
+    @staticmethod
+    def _read_layout(buf):
+        """(header size, entry count, entry size, GPU entry count, GPU entry size), None on a bad signature"""
+        signature, _, header_size, entry_count, entry_size = MAHM_HEADER.unpack_from(buf, 0)
+        if signature != b'MAHM' and signature != b'MHAM':
+            return None
+        gpu_entry_count = gpu_entry_size = 0
+        if header_size >= MAHM_GPU_HEADER_OFFSET + MAHM_GPU_HEADER.size:
+            gpu_entry_count, gpu_entry_size = MAHM_GPU_HEADER.unpack_from(buf, MAHM_GPU_HEADER_OFFSET)
+        return (header_size, entry_count, entry_size, gpu_entry_count, gpu_entry_size)
+
+    @staticmethod
+    def _layout_size(layout):
+        header_size, entry_count, entry_size, gpu_entry_count, gpu_entry_size = layout
+        return header_size + (entry_count * entry_size) + (gpu_entry_count * gpu_entry_size)
+
+    def _read_gpu_entries(self):
+        """gpu_id -> (device name, memory MB, vendor, PCI bus) from the v2 GPU entry array"""
+        devices = {}
+        if self.gpu_entry_size < MAHM_GPU_MEMORY_OFFSET + 4:
+            return devices
+        base = self.header_size + (self.entry_count * self.entry_size)
+        for i in range(self.gpu_entry_count):
+            offset = base + (i * self.gpu_entry_size)
+            device = _cstring(self.map_file, offset + MAHM_GPU_DEVICE_OFFSET)
+            memory_kb = struct.unpack_from('<I', self.map_file, offset + MAHM_GPU_MEMORY_OFFSET)[0]
+            match = GPU_ID_PATTERN.search(_cstring(self.map_file, offset))
+            vendor = PCI_VENDORS.get(match.group(1).upper()) if match else None
+            bus = int(match.group(2)) if match else None
+            devices[i + 1] = (device, round(memory_kb / 1024.0, 1), vendor, bus)
+        return devices
+
+    def _build_index(self):
+        """Decodes the sensor catalog once and records where the wanted values live"""
+        self.catalog = []
+        self.cpu_temp_package = None
+        self.cpu_temp_offsets = []
+        self.scalar_offsets = {}
+        self.gpu_fields = []
+        # gpu_id -> max limit of its memory usage graph, used when no GPU entry gives the size
+        memory_limits = {}
+        names = []
+
+        for i in range(self.entry_count):
+            entry_offset = self.header_size + (i * self.entry_size)
+            name = _cstring(self.map_file, entry_offset)
+            units = _cstring(self.map_file, entry_offset + MAHM_NAME_SIZE)
+            local_name = _cstring(self.map_file, entry_offset + 2 * MAHM_NAME_SIZE)
+            local_units = _cstring(self.map_file, entry_offset + 3 * MAHM_NAME_SIZE)
+            _, min_limit, max_limit, _, gpu, src_id = MAHM_ENTRY_INFO.unpack_from(self.map_file, entry_offset + MAHM_DATA_OFFSET)
+            names.append(name)
+
+            role = classify_sensor(name, units, gpu)
+            value_offset = entry_offset + MAHM_DATA_OFFSET
+            self.catalog.append(MAHMSensor(i, value_offset, name, units, local_name, local_units,
+                                           min_limit, max_limit, gpu, src_id, role))
+            if role is None:
+                continue
+            kind, gpu_id, field = role
+            if kind == 'cpu_temp':
+                if field:
+                    self.cpu_temp_package = value_offset
+                self.cpu_temp_offsets.append(value_offset)
+            elif kind == 'gpu':
+                if field:
+                    self.gpu_fields.append((value_offset, gpu_id, field))
+                if field == "memory_used":
+                    memory_limits[gpu_id] = max_limit
+            elif kind not in self.scalar_offsets:
+                self.scalar_offsets[kind] = value_offset
+
+        devices = self._read_gpu_entries()
+        gpu_ids = set(sensor.role[1] for sensor in self.catalog if sensor.role and sensor.role[0] == 'gpu')
+        self.gpu_ids = sorted(gpu_ids)
+        self.gpu_static = {}
+        for gpu_id in self.gpu_ids:
+            device, memory_total, vendor, bus = devices.get(gpu_id, ("", 0, None, None))
+            self.gpu_static[gpu_id] = {
+                "id": str(gpu_id),
+                "name": device or f"GPU {gpu_id}",
+                # Dynamic fields are only present when Afterburner has a sensor for them
+                "memory_total": memory_total or memory_limits.get(gpu_id) or None,
+                "vendor": vendor,
+                "bus": bus
+            }
+        self.sensor_names = names
+        self.sensor_units = [sensor.units for sensor in self.catalog]
+        self.layout_version += 1
+
+        # Preallocated once per layout, filled in place every tick
+        count = self.entry_count
+        if self.use_numpy:
+            self.values = np.zeros(count, dtype=np.float32)
+            self.limits_min = np.zeros(count, dtype=np.float32)
+            self.limits_max = np.zeros(count, dtype=np.float32)
+            self.flags = np.zeros(count, dtype=np.uint32)
+        else:
+            self.values = array('f', bytes(4 * count))
+            self.limits_min = array('f', bytes(4 * count))
+            self.limits_max = array('f', bytes(4 * count))
+            self.flags = array('I', bytes(4 * count))
+        self.index_layout = (self.header_size, self.entry_count, self.entry_size,
+                             self.gpu_entry_count, self.gpu_entry_size)
+
+    def _ensure_index(self):
+        """
+        Connects if needed and checks the header; the index is rebuilt only
+        when Afterburner changed its layout (sensors added/removed).
+        """
         if not self.map_file:
             if not self.connect():
-                return None
+                return False
+
+        layout = self._read_layout(self.map_file)
+        if layout is None:
+            self.close()
+            self.connection.failed()
+            return False
+
+        if layout != self.index_layout:
+            if self._layout_size(layout) > len(self.map_file):
+                # Grew past our view: remap with the new size
+                self.close()
+                if not self.connect():
+                    return False
+            else:
+                self.header_size, self.entry_count, self.entry_size, self.gpu_entry_count, self.gpu_entry_size = layout
+            self._build_index()
+        return True
+
+    def _header_time(self, now):
+        """
+        Afterburner's last update time, or None when the header has no time
+        field. Tracks when it changes to estimate the refresh period.
+        """
+        if self.header_size < MAHM_TIME_OFFSET + MAHM_TIME.size:
+            return None
+        stamp = MAHM_TIME.unpack_from(self.map_file, MAHM_TIME_OFFSET)[0]
+        if stamp != self.last_time:
+            # The first stamp seen is not a change we watched happen
+            if self.last_change is not None:
+                interval = now - self.last_change
+                if self.refresh_period is None:
+                    self.refresh_period = interval
+                else:
+                    self.refresh_period += 0.2 * (interval - self.refresh_period)
+            if self.last_time is not None:
+                self.last_change = now
+            self.last_time = stamp
+        return stamp
+
+    def _cached(self, entry, now):
+        """The cached value when Afterburner has not written since it was read"""
+        if not self.cache or entry is None or not self.map_file:
+            return None
+        stamp, read_at, value = entry
+        if now - read_at >= self.max_cache_age:
+            return None
+        if stamp is None or self._header_time(now) != stamp:
+            return None
+        self.cache_hits += 1
+        return value
+
+    def next_refresh(self):
+        """Monotonic time Afterburner is expected to write next, or None"""
+        if self.refresh_period is None or self.last_change is None:
+            return None
+        return self.last_change + self.refresh_period
+
+    def metrics(self):
+        return {
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "refresh_period": round(self.refresh_period, 3) if self.refresh_period is not None else None,
+        }
+
+    def _value(self, offset):
+        return MAHM_VALUE.unpack_from(self.map_file, offset)[0]
+
+    def _read_gpus(self):
+        gpus = {}
+        for gpu_id in self.gpu_ids:
+            gpus[gpu_id] = dict(self.gpu_static[gpu_id])
+        for offset, gpu_id, field in self.gpu_fields:
+            gpus[gpu_id][field] = self._value(offset)
+        # Convert dict to list (gpu_ids is sorted)
+        return list(gpus.values())
 
+    def read_catalog(self):
+        """Every Afterburner source with units, limits, GPU index and role"""
+        try:
+            if not self._ensure_index():
+                return []
+            return [sensor.as_dict() for sensor in self.catalog]
+        except Exception:
+            self.close()
+            return []
+
+    def covers(self, fields=NVIDIA_SMI_FIELDS):
+        """
+        True when Afterburner provides every field in `fields` for each of
+        its GPUs, so slower GPU sources can be skipped. Uses the current index.
+        """
+        if not self.map_file or not self.gpu_ids:
+            return False
+        provided = {gpu_id: set() for gpu_id in self.gpu_ids}
+        for _, gpu_id, field in self.gpu_fields:
+            provided[gpu_id].add(field)
+        for gpu_id in self.gpu_ids:
+            if self.gpu_static[gpu_id]["memory_total"]:
+                provided[gpu_id].add("memory_total")
+        return all(provided[gpu_id].issuperset(fields) for gpu_id in self.gpu_ids)
+
+    def read_sensor_values(self):
+        """
+        Current value, min/max limit and flags of every entry, in
+        sensor_names order. With NumPy this is one strided read of the whole
+        entry array. Returns the (reused) values array, or None.
+        """
         try:
-            current_offset = self.header_size
-            
-            for i in range(self.entry_count):
-                try:
-                    self.map_file.seek(current_offset)
-                    
-                    # Read Name (260 bytes)
-                    name_bytes = self.map_file.read(260)
-                    name = name_bytes.decode('latin-1', errors='ignore').strip('\x00')
-                    
-                    # Optimization: Check name before reading everything else
-                    # We are looking for "CPU temperature" specifically
-                    if "CPU" in name and "temperature" in name.lower():
-                        # Read Data
-                        # Offset calculation: Name(260) + Units(260) + LocName(260) + LocUnits(260) + Format(260) = 1300
-                        # Found via debug: Value is at 1300 exactly.
-                        data_offset = current_offset + 1300
-                        self.map_file.seek(data_offset)
-                        value = struct.unpack('f', self.map_file.read(4))[0]
-                        
-                        # Filter out 0.0 or invalid values if possible, but 0.0 might be valid if idle? 
-                        # Usually CPU temp is > 20.
-                        if value > 0:
-                            return round(value, 1)
-
-                    current_offset += self.entry_size
-                except ValueError:
-                    # Seek error
-                    break
-                    
+            if not self._ensure_index():
+                return None
+
+            if self.use_numpy:
+                entries = np.frombuffer(self.map_file, dtype=entry_data_dtype(self.entry_size),
+                                        count=self.entry_count, offset=self.header_size)
+                np.copyto(self.values, entries['data'])
+                np.copyto(self.limits_min, entries['min'])
+                np.copyto(self.limits_max, entries['max'])
+                np.copyto(self.flags, entries['flags'])
+                # Drop the view so the mapping can still be closed
+                del entries
+            else:
+                offset = self.header_size + MAHM_DATA_OFFSET
+                for i in range(self.entry_count):
+                    self.values[i], self.limits_min[i], self.limits_max[i], self.flags[i] = MAHM_ENTRY_DATA.unpack_from(self.map_file, offset)
+                    offset += self.entry_size
+            return self.values
+
+        except Exception:
+            self.close()
             return None
 
+    def read_sensor_snapshot(self):
+        """
+        All Afterburner sensors as {"layout": n, "names": [...], "units": [...],
+        "values": [...]}, or None. Names and units only change with `layout`.
+        Shared between callers until Afterburner updates; do not modify.
+        """
+        now = time.monotonic()
+        try:
+            cached = self._cached(self.sensors_cache, now)
         except Exception:
+            self.close()
             return None
+        if cached is not None:
+            return cached
 
-    def read_gpu_stats(self):
+        values = self.read_sensor_values()
+        if values is None:
+            return None
+        self.cache_misses += 1
+        if self.use_numpy:
+            rounded = np.round(values, 2).tolist()
+        else:
+            rounded = [round(v, 2) for v in values]
+        sensors = {"layout": self.layout_version, "names": self.sensor_names,
+                   "units": self.sensor_units, "values": rounded}
+        self.sensors_cache = (self._header_time(now), now, sensors)
+        return sensors
+
+    def raw_bytes(self):
+        """Copy of the whole shared memory block, for snapshot recording"""
         if not self.map_file:
             if not self.connect():
-                return []
+                return None
+        try:
+            return self.map_file[:self._layout_size((self.header_size, self.entry_count, self.entry_size,
+                                                     self.gpu_entry_count, self.gpu_entry_size))]
+        except Exception:
+            self.close()
+            return None
 
-        gpus = {}
-        
+    def read_cpu_temp(self):
         try:
-            current_offset = self.header_size
-            
-            for i in range(self.entry_count):
-                try:
-                    self.map_file.seek(current_offset)
-                    
-                    # Read Name (260 bytes)
-                    name_bytes = self.map_file.read(260)
-                    name = name_bytes.decode('latin-1', errors='ignore').strip('\x00')
-                    
-                    # Optimization: Check if it starts with GPU
-                    if name.startswith("GPU"):
-                        # Parse GPU index and type
-                        # Examples: "GPU1 temperature", "GPU2 usage", "GPU1 memory usage"
-                        parts = name.split(' ')
-                        if len(parts) >= 2:
-                            gpu_id_str = parts[0].replace("GPU", "")
-                            if gpu_id_str.isdigit():
-                                gpu_id = int(gpu_id_str)
-                                
-                                if gpu_id not in gpus:
-                                    gpus[gpu_id] = {
-                                        "id": str(gpu_id),
-                                        "name": f"GPU {gpu_id}",
-                                        "load": 0,
-                                        "memory_used": 0,
-                                        "memory_total": 0, 
-                                        "temperature": 0
-                                    }
-                                
-                                # Read Value
-                                data_offset = current_offset + 1300
-                                self.map_file.seek(data_offset)
-                                value = struct.unpack('f', self.map_file.read(4))[0]
-                                
-                                metric = " ".join(parts[1:]).lower()
-                                
-                                if "temperature" in metric:
-                                    gpus[gpu_id]["temperature"] = value
-                                elif "usage" in metric and "memory" not in metric and "bus" not in metric and "fb" not in metric and "vid" not in metric:
-                                    gpus[gpu_id]["load"] = value
-                                elif "memory usage" in metric:
-                                    gpus[gpu_id]["memory_used"] = value
-
-                    current_offset += self.entry_size
-                except ValueError:
-                    break
-            
-            # Convert dict to list and sort by ID
-            return sorted(gpus.values(), key=lambda x: int(x["id"]))
+            if not self._ensure_index():
+                return None
 
-        except Exception as e:
-            # print(f"Error reading MAHM GPU stats: {e}")
-            if self.map_file:
-                self.map_file.close()
-            self.map_file = None
+            # We are looking for "CPU temperature" specifically, else the first core
+            for offset in self.cpu_temp_offsets:
+                value = self._value(offset)
+                # Usually CPU temp is > 20, 0.0 means no reading
+                if value > 0:
+                    return round(value, 1)
+            return None
+
+        except Exception:
+            self.close()
+            return None
+
+    def read_gpu_stats(self):
+        # Served from the read_all_stats() snapshot, so a broadcast tick reads MAHM once
+        stats = self.read_all_stats()
+        if not stats:
             return []
+        return list(stats["gpus"])
 
     def read_cpu_usage(self):
-        if not self.map_file:
-            if not self.connect():
+        try:
+            if not self._ensure_index():
                 return None
 
-        try:
-            current_offset = self.header_size
-            
-            for i in range(self.entry_count):
-                try:
-                    self.map_file.seek(current_offset)
-                    
-                    # Read Name (260 bytes)
-                    name_bytes = self.map_file.read(260)
-                    name = name_bytes.decode('latin-1', errors='ignore').strip('\x00')
-                    
-                    # Look for "CPU usage" (Total)
-                    # Note: There are also "CPU1 usage", "CPU2 usage" etc. We want the total one.
-                    if name == "CPU usage":
-                        data_offset = current_offset + 1300
-                        self.map_file.seek(data_offset)
-                        value = struct.unpack('f', self.map_file.read(4))[0]
-                        return round(value, 1)
-
-                    current_offset += self.entry_size
-                except ValueError:
-                    break
-            
-            return None
+            # "CPU usage" is the total; "CPU1 usage", "CPU2 usage" etc. are cores
+            offset = self.scalar_offsets.get('cpu_usage')
+            if offset is None:
+                return None
+            return round(self._value(offset), 1)
 
         except Exception:
+            self.close()
             return None
 
     def read_all_stats(self):
         """
-        Reads all relevant stats (CPU Temp, CPU Usage, GPU Stats) in one pass
-        to avoid multiple open/close operations and race conditions.
+        Reads all relevant stats (CPU temp/usage/clock/power, framerate,
+        frametime, GPU stats) in one pass to avoid multiple open/close
+        operations and race conditions.
+        Only the indexed sensors are read, no names are decoded. While the
+        header time is unchanged this is a 4-byte check returning the previous
+        result, which is shared between callers and must not be modified.
         """
-        if not self.map_file:
-            if not self.connect():
-                return None
+        now = time.monotonic()
+        try:
+            cached = self._cached(self.stats_cache, now)
+        except Exception:
+            self.close()
+            return None
+        if cached is not None:
+            return cached
 
         result = {
             "cpu_temp": None,
             "cpu_usage": None,
+            "cpu_clock": None,
+            "cpu_power": None,
+            "framerate": None,
+            "frametime": None,
             "gpus": {}
         }
 
         try:
-            current_offset = self.header_size
-            
-            for i in range(self.entry_count):
-                try:
-                    self.map_file.seek(current_offset)
-                    
-                    # Read Name (260 bytes)
-                    name_bytes = self.map_file.read(260)
-                    name = name_bytes.decode('latin-1', errors='ignore').strip('\x00')
-                    
-                    # Read Value (Skip Units, LocName, LocUnits, Format)
-                    # Data is at offset + 1300
-                    data_offset = current_offset + 1300
-                    self.map_file.seek(data_offset)
-                    value = struct.unpack('f', self.map_file.read(4))[0]
-                    
-                    # 1. CPU Temperature
-                    if "CPU" in name and "temperature" in name.lower() and "GPU" not in name:
-                         # Prefer "CPU temperature" (Package) but take any core if package not found yet
-                         if name == "CPU temperature":
-                             result["cpu_temp"] = round(value, 1)
-                         elif result["cpu_temp"] is None and value > 0:
-                             result["cpu_temp"] = round(value, 1)
-
-                    # 2. CPU Usage
-                    elif name == "CPU usage":
-                        result["cpu_usage"] = round(value, 1)
-
-                    # 3. GPU Stats
-                    elif name.startswith("GPU"):
-                        parts = name.split(' ')
-                        if len(parts) >= 2:
-                            gpu_id_str = parts[0].replace("GPU", "")
-                            if gpu_id_str.isdigit():
-                                gpu_id = int(gpu_id_str)
-                                
-                                if gpu_id not in result["gpus"]:
-                                    result["gpus"][gpu_id] = {
-                                        "id": str(gpu_id),
-                                        "name": f"GPU {gpu_id}",
-                                        "load": 0,
-                                        "memory_used": 0,
-                                        "memory_total": 0, 
-                                        "temperature": 0
-                                    }
-                                
-                                metric = " ".join(parts[1:]).lower()
-                                
-                                if "temperature" in metric:
-                                    result["gpus"][gpu_id]["temperature"] = value
-                                elif "usage" in metric and "memory" not in metric and "bus" not in metric and "fb" not in metric and "vid" not in metric:
-                                    result["gpus"][gpu_id]["load"] = value
-                                elif "memory usage" in metric:
-                                    result["gpus"][gpu_id]["memory_used"] = value
-
-                    current_offset += self.entry_size
-                except ValueError:
-                    break
-            
-            # Convert GPU dict to list
-            result["gpus"] = sorted(result["gpus"].values(), key=lambda x: int(x["id"]))
+            if not self._ensure_index():
+                return None
+
+            # Prefer "CPU temperature" (Package) but take any core if package not found
+            if self.cpu_temp_package is not None:
+                result["cpu_temp"] = round(self._value(self.cpu_temp_package), 1)
+            else:
+                for offset in self.cpu_temp_offsets:
+                    value = self._value(offset)
+                    if value > 0:
+                        result["cpu_temp"] = round(value, 1)
+                        break
+
+            for role, offset in self.scalar_offsets.items():
+                result[role] = round(self._value(offset), 1)
+
+            result["gpus"] = tuple(self._read_gpus())
+            self.cache_misses += 1
+            self.stats_cache = (self._header_time(now), now, result)
             return result
 
         except Exception:
             # If error, close and return None to force reconnect next time
-            if self.map_file:
-                self.map_file.close()
-            self.map_file = None
+            self.close()
             return None
@@ -11,6 +11,7 @@ import uvicorn
 from rtss_reader import RTSSReader
 from mahm_reader import MAHMReader
 from lhm_reader import LHMReader
+from com_worker import com_worker
 import hashlib
 import pythoncom
 import win32com.client
@@ -135,7 +136,8 @@ def get_gpu_stats():
 
     # Priority 2: LibreHardwareMonitor (LHM)
     try:
-        gpus = lhm_reader.read_gpu_stats()
+        # WMI calls run on the COM worker thread
+        gpus = com_worker.call(lhm_reader.read_gpu_stats, timeout=1.0)
         if gpus:
             return gpus
     except Exception:
@@ -208,10 +210,10 @@ async def get_cpu_temp():
 
     try:
         # Try LibreHardwareMonitor (with timeout)
-        temp = await asyncio.wait_for(run_blocking(lhm_reader.read_cpu_temp), timeout=2.0)
+        temp = await com_worker.call_async(lhm_reader.read_cpu_temp, timeout=2.0)
         if temp is not None:
             return temp
-    except asyncio.TimeoutError:
+    except (asyncio.TimeoutError, TimeoutError):
         print("LHM read timed out")
     except Exception as e:
         print(f"LHM read error: {e}")
@@ -0,0 +1,219 @@
+import subprocess
+import sys
+import threading
+import time
+
+from provider_health import OPEN
+
+# Static per-GPU fields, queried once
+STATIC_FIELDS = "index,pci.bus_id,name,memory.total"
+# Streamed every interval
+DYNAMIC_FIELDS = "index,utilization.gpu,memory.used,temperature.gpu,clocks.gr,power.draw,fan.speed"
+
+CREATE_NO_WINDOW = 0x08000000
+
+
+def safe_float(val):
+    """None for "[N/A]" / "[Not Supported]", so a missing field is not mistaken for 0"""
+    try:
+        return float(val)
+    except:
+        return None
+
+
+def pci_bus(bus_id):
+    """"00000000:01:00.0" -> 1"""
+    try:
+        return int(bus_id.split(':')[-2], 16)
+    except (ValueError, IndexError):
+        return None
+
+
+def _popen_options():
+    if sys.platform != 'win32':
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return {"startupinfo": startupinfo, "creationflags": CREATE_NO_WINDOW}
+
+
+class NvidiaSmiStream:
+    """
+    One long-lived `nvidia-smi --query-gpu=... -lms N` child instead of a
+    process per tick.
+
+    A supervisor thread starts it, reads its CSV output line by line into
+    the latest row per GPU, and restarts it (with backoff) when it exits.
+    If no line arrives for `stall_after` seconds the child is killed and
+    restarted. Name, PCI bus id and memory total are queried once.
+
+    With a `health` breaker (the ProviderHealth its readings go through),
+    the child is stopped while the breaker is open and started again
+    `resume_before` seconds before the half-open probe is due.
+    """
+
+    def __init__(self, command=("nvidia-smi",), interval_ms=500, stall_after=5.0,
+                 max_age=3.0, min_restart_delay=1.0, max_restart_delay=60.0,
+                 health=None, resume_before=2.0):
+        self.command = list(command)
+        self.interval_ms = interval_ms
+        self.stall_after = stall_after
+        self.max_age = max_age
+        self.min_restart_delay = min_restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.health = health
+        self.resume_before = resume_before
+
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+        self.process = None
+        # index -> {"bus", "name", "memory_total"}
+        self.static = {}
+        # index -> (monotonic time, dynamic fields)
+        self.rows = {}
+        self.unknown = set()
+        self.last_line = 0.0
+
+        self.starts = 0
+        self.lines = 0
+        self.stalls = 0
+        self.suspensions = 0
+        self.suspended = False
+        self.last_error = None
+
+    def start(self):
+        with self.lock:
+            # A supervisor still winding down after stop() just carries on
+            self.running = True
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._supervise, name="nvidia-smi", daemon=True)
+                self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self._kill()
+
+    def _kill(self):
+        process = self.process
+        if process is not None and process.poll() is None:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+    def _query_static(self):
+        result = subprocess.run(
+            self.command + [f'--query-gpu={STATIC_FIELDS}', '--format=csv,noheader,nounits'],
+            capture_output=True, text=True, timeout=10, **_popen_options()
+        )
+        static = {}
+        for line in result.stdout.strip().splitlines():
+            parts = [p.strip() for p in line.split(',')]
+            if len(parts) >= 4:
+                static[parts[0]] = {"bus": pci_bus(parts[1]), "name": parts[2], "memory_total": safe_float(parts[3])}
+        return static
+
+    def _breaker_open(self):
+        health = self.health
+        return (health is not None and health.state == OPEN
+                and time.monotonic() < health.open_until - self.resume_before)
+
+    def _parse(self, line):
+        """Stores one CSV row; False when the line is not one"""
+        parts = [p.strip() for p in line.split(',')]
+        if len(parts) < 7:
+            return False
+        self.rows[parts[0]] = (time.monotonic(), {
+            "load": safe_float(parts[1]),
+            "memory_used": safe_float(parts[2]),
+            "temperature": safe_float(parts[3]),
+            "clock": safe_float(parts[4]),
+            "power": safe_float(parts[5]),
+            "fan_speed": safe_float(parts[6]),
+        })
+        return True
+
+    def _supervise(self):
+        delay = self.min_restart_delay
+        while self.running:
+            if self._breaker_open():
+                # Nobody reads the rows while the breaker is open
+                self.suspended = True
+                self.suspensions += 1
+                while self.running and self._breaker_open():
+                    time.sleep(0.25)
+                self.suspended = False
+                continue
+            try:
+                if not self.static:
+                    self.static = self._query_static()
+                self.process = subprocess.Popen(
+                    self.command + [f'--query-gpu={DYNAMIC_FIELDS}', '--format=csv,noheader,nounits',
+                                    '-lms', str(self.interval_ms)],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1,
+                    **_popen_options()
+                )
+                self.starts += 1
+                self.last_line = time.monotonic()
+                for line in self.process.stdout:
+                    self.last_line = time.monotonic()
+                    self.lines += 1
+                    if self._parse(line):
+                        # Producing samples: the next failure starts the backoff over
+                        delay = self.min_restart_delay
+                    if self._breaker_open():
+                        self._kill()
+                    index = line.split(',', 1)[0].strip()
+                    if index not in self.static and index not in self.unknown:
+                        # A GPU we have no static fields for (hot-plug, driver reset)
+                        self.unknown.add(index)
+                        self.static = self._query_static()
+                self.process.wait()
+            except Exception as e:
+                # Not installed (FileNotFoundError) or failed to start
+                self.last_error = str(e)
+            finally:
+                self.process = None
+
+            if not self.running:
+                break
+            if self._breaker_open():
+                continue
+            # Back off while it keeps dying without a sample
+            time.sleep(delay)
+            delay = min(self.max_restart_delay, delay * 2)
+
+    def gpus(self):
+        """Latest stats per GPU in get_gpu_stats() shape; starts the stream on first use"""
+        self.start()
+        now = time.monotonic()
+        if self.process is not None and now - self.last_line > self.stall_after:
+            # Alive but silent: the supervisor restarts it once it exits
+            self.stalls += 1
+            self.last_line = now
+            self._kill()
+
+        gpus = []
+        for index, (read_at, fields) in sorted(self.rows.items()):
+            if now - read_at > self.max_age:
+                continue
+            static = self.static.get(index, {})
+            gpu = {"id": index, "name": static.get("name", f"GPU {index}"),
+                   "memory_total": static.get("memory_total"),
+                   "vendor": "nvidia", "bus": static.get("bus")}
+            gpu.update(fields)
+            gpus.append(gpu)
+        return gpus
+
+    def metrics(self):
+        return {
+            "running": self.process is not None,
+            "starts": self.starts,
+            "lines": self.lines,
+            "stalls": self.stalls,
+            "suspended": self.suspended,
+            "suspensions": self.suspensions,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,95 @@
+from frametime_stats import FrameTimeTracker
+
+# Zero a process' FPS when RTSS has not updated its slot for this long (s)
+STALE_AFTER = 2.0
+# EMA weight of the newest sample when FPS smoothing is on
+SMOOTHING_ALPHA = 0.3
+
+
+class ProcessTracker:
+    """
+    FPS state for every live RTSS slot at once: smoothing, staleness and
+    frame-time percentiles per pid, fed from read_all_processes() records.
+    """
+
+    def __init__(self, stale_after=STALE_AFTER, alpha=SMOOTHING_ALPHA):
+        self.stale_after = stale_after
+        self.alpha = alpha
+        self.frametimes = FrameTimeTracker()
+        # pid -> state dict
+        self.states = {}
+        self.primary_pid = None
+
+    def update(self, processes, now, smoothing=False):
+        self.frametimes.update(processes, now)
+
+        states = {}
+        for p in processes:
+            state = self.states.get(p['pid'])
+            if state is None:
+                state = {'smoothed': 0.0, 'last_time': None, 'last_change': now}
+            if p['time'] != state['last_time']:
+                state['last_time'] = p['time']
+                state['last_change'] = now
+
+            raw_fps = p['fps']
+            stale = now - state['last_change'] > self.stale_after
+            if stale or raw_fps <= 0:
+                state['smoothed'] = 0.0
+                fps = 0
+            elif smoothing:
+                if state['smoothed'] == 0:
+                    state['smoothed'] = float(raw_fps)
+                else:
+                    state['smoothed'] = (self.alpha * raw_fps) + ((1 - self.alpha) * state['smoothed'])
+                    # Cap to prevent overshoot when FPS drops
+                    state['smoothed'] = min(state['smoothed'], float(raw_fps))
+                # Use floor (int) instead of round to never exceed raw FPS
+                fps = int(state['smoothed'])
+            else:
+                state['smoothed'] = float(raw_fps)
+                fps = raw_fps
+
+            state['process'] = p
+            state['fps'] = fps
+            state['stale'] = stale
+            states[p['pid']] = state
+        self.states = states
+
+        # Primary: the most recently updated process that is rendering
+        primary = None
+        for state in self.states.values():
+            if state['process']['fps'] > 0 and (primary is None or state['process']['time'] > primary['process']['time']):
+                primary = state
+        self.primary_pid = primary['process']['pid'] if primary else None
+        return self.primary_pid
+
+    def get(self, pid):
+        return self.states.get(pid)
+
+    def find(self, pid=None, game_id=None):
+        """State of the process matching pid or game_id, or None"""
+        if pid is not None:
+            return self.states.get(pid)
+        for state in self.states.values():
+            if state['process']['game_id'] == game_id:
+                return state
+        return None
+
+    def entry(self, state):
+        p = state['process']
+        return {
+            "pid": p['pid'],
+            "name": p['name'],
+            "game_id": p['game_id'],
+            "fps": state['fps'],
+            "frame_time": round(p['frame_time'], 2),
+            "primary": p['pid'] == self.primary_pid,
+        }
+
+    def entries(self):
+        """Compact per-process list for hardware_update, primary first"""
+        return sorted((self.entry(s) for s in self.states.values()), key=lambda e: (not e['primary'], -e['fps']))
+
+    def frame_stats(self, pid, now):
+        return self.frametimes.summary(pid, now)
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import deque
+
+import psutil
+
+RTSS_PROCESS = "rtss.exe"
+AFTERBURNER_PROCESS = "msiafterburner.exe"
+
+
+class ProcessWatcher:
+    """
+    Tracks RTSS, MSI Afterburner and the active game without walking every
+    process on each check.
+
+    refresh() diffs psutil.pids() against the previous set and only looks
+    up the name of PIDs that are new. The psutil handles of the interesting
+    processes are kept, so noticing their exit needs no scan either.
+    status() is a plain attribute read. Starts, exits and status changes
+    are queued as events, drained by poll_events().
+    """
+
+    def __init__(self, names=(RTSS_PROCESS, AFTERBURNER_PROCESS), is_connected=None, on_start=None):
+        self.names = tuple(name.lower() for name in names)
+        # () -> True when the RTSS shared memory is live
+        self.is_connected = is_connected
+        # (name) -> None, called from refresh() when a watched process starts
+        self.on_start = on_start
+
+        self.lock = threading.Lock()
+        self.pids = set()
+        # pid -> (name, psutil.Process) of watched processes
+        self.handles = {}
+        self.game_pid = None
+        # (pid, name, psutil.Process) of the active game
+        self.game = None
+        self.current = "not-found"
+        self.events = deque(maxlen=256)
+
+        self.refreshes = 0
+        self.lookups = 0
+        self.last_ms = None
+
+    def set_game(self, pid):
+        """Watch `pid` as the active game; its handle is taken on the next refresh()"""
+        self.game_pid = pid
+
+    def _emit(self, event_type, name, pid):
+        self.events.append({"type": event_type, "name": name, "pid": pid})
+
+    def _exited(self, pid, proc):
+        try:
+            return not proc.is_running()
+        except psutil.Error:
+            return True
+
+    def refresh(self):
+        """Applies process starts and exits since the last call; returns status()"""
+        with self.lock:
+            start = time.perf_counter()
+            pids = set(psutil.pids())
+            new = pids - self.pids
+            self.pids = pids
+
+            # A handle whose pid vanished or was reused has exited
+            for pid, (name, proc) in list(self.handles.items()):
+                if pid not in pids or self._exited(pid, proc):
+                    del self.handles[pid]
+                    self._emit("exited", name, pid)
+
+            for pid in new:
+                self.lookups += 1
+                try:
+                    proc = psutil.Process(pid)
+                    name = proc.name().lower()
+                except psutil.Error:
+                    continue
+                if name in self.names:
+                    self.handles[pid] = (name, proc)
+                    self._emit("started", name, pid)
+                    if self.on_start is not None:
+                        self.on_start(name)
+
+            self._refresh_game(pids)
+            self._update_status()
+            self.refreshes += 1
+            self.last_ms = (time.perf_counter() - start) * 1000
+            return self.current
+
+    def _refresh_game(self, pids):
+        game_pid = self.game_pid
+        if self.game is not None:
+            pid, name, proc = self.game
+            if pid not in pids or self._exited(pid, proc):
+                self.game = None
+                self._emit("exited", name, pid)
+            elif pid != game_pid:
+                self.game = None
+        if self.game is None and game_pid:
+            try:
+                proc = psutil.Process(game_pid)
+                self.game = (game_pid, proc.name(), proc)
+            except psutil.Error:
+                pass
+
+    def _update_status(self):
+        running = set(name for name, _ in self.handles.values())
+        if RTSS_PROCESS in running and (self.is_connected is None or self.is_connected()):
+            status = "running"
+        elif running:
+            status = "installed"
+        else:
+            status = "not-found"
+        if status != self.current:
+            self.events.append({"type": "status", "status": status, "previous": self.current})
+            self.current = status
+
+    def status(self):
+        """'running' (RTSS up with shared memory), 'installed' (RTSS or Afterburner up) or 'not-found'"""
+        return self.current
+
+    def is_running(self, name):
+        return any(watched == name for watched, _ in list(self.handles.values()))
+
+    def poll_events(self):
+        """Returns and clears the events seen since the last call"""
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events
+
+    def metrics(self):
+        return {
+            "status": self.current,
+            "watched": sorted(f"{name}:{pid}" for pid, (name, _) in list(self.handles.items())),
+            "game_pid": self.game[0] if self.game else None,
+            "known_pids": len(self.pids),
+            "refreshes": self.refreshes,
+            "name_lookups": self.lookups,
+            "last_ms": round(self.last_ms, 2) if self.last_ms is not None else None,
+        }
@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderHealth:
+    """
+    Circuit breaker plus success-rate / latency score for one sensor provider.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    calls are skipped (allow() is a clock comparison) for `open_for`
+    seconds. Then one probe call is let through (half-open): success closes
+    the breaker, failure opens it again for twice as long, up to
+    `max_open_for`. A result that `valid` rejects (no data) counts as a
+    failure, like an exception.
+    """
+
+    def __init__(self, name, failure_threshold=3, open_for=5.0, max_open_for=120.0, window=50):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_open_for = open_for
+        self.max_open_for = max_open_for
+        self.lock = threading.Lock()
+
+        self.state = CLOSED
+        self.failures = 0
+        self.open_for = open_for
+        self.open_until = 0.0
+        self.probing = False
+
+        # (ok, latency) of the last `window` calls
+        self.outcomes = deque(maxlen=window)
+        self.calls = 0
+        self.skipped = 0
+        self.last_error = None
+        self.last_success = None
+
+    def allow(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and now >= self.open_until:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            self.skipped += 1
+            return False
+
+    def success(self, latency):
+        with self.lock:
+            self.calls += 1
+            self.outcomes.append((True, latency))
+            self.last_success = time.monotonic()
+            self.failures = 0
+            self.state = CLOSED
+            self.open_for = self.base_open_for
+            self.probing = False
+
+    def failure(self, latency, error=None, now=None):
+        if now is None:
+            now = time.monotonic()
+        with self.lock:
+            self.calls += 1
+            self.outcomes.append((False, latency))
+            if error is not None:
+                self.last_error = error
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                # The probe failed: stay away longer
+                self.open_for = min(self.max_open_for, self.open_for * 2)
+                self._open(now)
+            elif self.failures >= self.failure_threshold:
+                self._open(now)
+            self.probing = False
+
+    def _open(self, now):
+        self.state = OPEN
+        self.open_until = now + self.open_for
+
+    def call(self, func, *args, valid=bool, default=None, **kwargs):
+        """func(*args, **kwargs) through the breaker; `default` when skipped or failed"""
+        if not self.allow():
+            return default
+        start = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.failure(time.monotonic() - start, f"{type(e).__name__}: {e}")
+            return default
+        latency = time.monotonic() - start
+        if valid is not None and not valid(result):
+            self.failure(latency, "no data")
+            return default
+        self.success(latency)
+        return result
+
+    async def call_async(self, func, *args, valid=bool, default=None, **kwargs):
+        """Same as call() for a coroutine function"""
+        if not self.allow():
+            return default
+        start = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            self.failure(time.monotonic() - start, f"{type(e).__name__}: {e}")
+            return default
+        latency = time.monotonic() - start
+        if valid is not None and not valid(result):
+            self.failure(latency, "no data")
+            return default
+        self.success(latency)
+        return result
+
+    def score(self):
+        """Success rate over the window, discounted by average latency (1.0 = healthy and fast)"""
+        if not self.outcomes:
+            return None
+        ok = sum(1 for success, _ in self.outcomes if success)
+        latency = sum(latency for _, latency in self.outcomes) / len(self.outcomes)
+        return round(ok / len(self.outcomes) / (1 + latency / 0.1), 3)
+
+    def status(self):
+        outcomes = list(self.outcomes)
+        latencies = sorted(latency for _, latency in outcomes)
+        now = time.monotonic()
+        return {
+            "state": self.state,
+            "score": self.score(),
+            "success_rate": round(sum(1 for ok, _ in outcomes if ok) / len(outcomes), 3) if outcomes else None,
+            "latency_ms_p50": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+            "latency_ms_max": round(latencies[-1] * 1000, 2) if latencies else None,
+            "calls": self.calls,
+            "skipped": self.skipped,
+            "consecutive_failures": self.failures,
+            "retry_in": round(max(0.0, self.open_until - now), 1) if self.state == OPEN else 0.0,
+            "last_error": self.last_error,
+            "last_success_age": round(now - self.last_success, 1) if self.last_success is not None else None,
+        }
+
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+def provider(name):
+    """The ProviderHealth shared by every caller of `name`"""
+    with _providers_lock:
+        health = _providers.get(name)
+        if health is None:
+            health = ProviderHealth(name)
+            _providers[name] = health
+        return health
+
+def providers_status():
+    return {name: health.status() for name, health in sorted(_providers.items())}
@@ -0,0 +1,62 @@
+import time
+
+
+class AdaptivePoller:
+    """
+    Decides how often RTSS is read.
+
+    Every wake-up only probes the header's dwOSDFrame and the dwTime1 of the
+    known slots. A full read_all_processes() happens when that fingerprint
+    changes, or at least once per idle interval so new apps are noticed.
+    While a game is presenting frames the poller runs at the active rate;
+    otherwise the interval backs off towards the idle rate.
+    """
+
+    def __init__(self, reader, active_rate=20.0, idle_rate=1.0, backoff=1.5):
+        self.reader = reader
+        self.active_interval = 1.0 / active_rate
+        self.idle_interval = 1.0 / idle_rate
+        self.backoff = backoff
+
+        self.interval = self.idle_interval
+        self.fingerprint = None
+        self.processes = []
+        self.last_full_read = None
+
+        self.wakeups = 0
+        self.full_reads = 0
+        self.started = time.monotonic()
+
+    def poll(self, now=None):
+        """Returns the latest process list, re-reading RTSS only when something changed"""
+        if now is None:
+            now = time.monotonic()
+        self.wakeups += 1
+
+        fingerprint = self.reader.probe()
+        changed = fingerprint != self.fingerprint
+        self.fingerprint = fingerprint
+
+        if changed or self.last_full_read is None or now - self.last_full_read >= self.idle_interval:
+            self.processes = self.reader.read_all_processes()
+            self.last_full_read = now
+            self.full_reads += 1
+            # Slots may have changed, so re-take the fingerprint over them
+            self.fingerprint = self.reader.probe()
+
+        rendering = changed and any(p['fps'] > 0 for p in self.processes)
+        if rendering:
+            self.interval = self.active_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.idle_interval)
+        return self.processes
+
+    def metrics(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "mode": "active" if self.interval <= self.active_interval else "idle",
+            "poll_rate": round(1.0 / self.interval, 2),
+            "wakeups": self.wakeups,
+            "full_reads": self.full_reads,
+            "avg_wakeup_rate": round(self.wakeups / elapsed, 2),
+        }
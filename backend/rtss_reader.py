@@ -1,86 +1,25 @@
 import ctypes
-import mmap
 import struct
-import json
-import os
+from collections import deque
 
-CUSTOM_NAMES_FILE = "custom_game_names.json"
+from game_names import name_resolver
+from shared_memory import connection_manager, open_mapping
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: the vectorized slot decoder is skipped without NumPy
+    np = None
 
 # RTSS Shared Memory Name
 RTSS_SHARED_MEMORY_NAME = "RTSSSharedMemoryV2"
 
 # Constants
 RTSS_MAX_OSD_SLOTS = 8
-
-# Game Name Mapping (Executable -> Readable Name)
-GAME_NAME_MAPPING = {
-    "shproo": "Silent Hill 2",
-    "cs2": "Counter-Strike 2",
-    "dota2": "Dota 2",
-    "gta5": "Grand Theft Auto V",
-    "rdr2": "Red Dead Redemption 2",
-    "cyberpunk2077": "Cyberpunk 2077",
-    "witcher3": "The Witcher 3",
-    "valorant": "Valorant",
-    "league of legends": "League of Legends",
-    "fortniteclient-win64-shipping": "Fortnite",
-    "minecraft": "Minecraft",
-    "robloxplayerbeta": "Roblox",
-    "eurotrucks2": "Euro Truck Simulator 2",
-    "pubg": "PUBG: Battlegrounds",
-    "apex": "Apex Legends",
-    "cod": "Call of Duty",
-    "modernwarfare": "Call of Duty: MW",
-    "blackops6": "Call of Duty: BO6",
-    "eldenring": "Elden Ring",
-    "godofwar": "God of War",
-    "spiderman": "Spider-Man",
-    "forza": "Forza Horizon",
-    "forzahorizon5": "Forza Horizon 5",
-    "rocketleague": "Rocket League",
-    "overwatch": "Overwatch 2",
-    "re4": "Resident Evil 4",
-    "re2": "Resident Evil 2",
-    "re3": "Resident Evil 3",
-    "re7": "Resident Evil 7",
-    "re8": "Resident Evil Village",
-    "stardew valley": "Stardew Valley",
-    "terraria": "Terraria",
-    "among us": "Among Us",
-    "palworld": "Palworld",
-    "baldur": "Baldur's Gate 3",
-    "bg3": "Baldur's Gate 3",
-    "bg3_dx11": "Baldur's Gate 3",
-    "starfield": "Starfield",
-    "hogwartslegacy": "Hogwarts Legacy",
-    "ffxv": "Final Fantasy XV",
-    "ff7remake": "Final Fantasy VII Remake",
-}
-
-def load_custom_names():
-    if os.path.exists(CUSTOM_NAMES_FILE):
-        try:
-            with open(CUSTOM_NAMES_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+RTSS_SIGNATURE = 0x52545353  # 'RTSS'
 
 def save_custom_name(executable, name):
-    custom_names = load_custom_names()
-    custom_names[executable.lower()] = name
-    try:
-        with open(CUSTOM_NAMES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(custom_names, f, indent=4)
-        # Update global mapping
-        GAME_NAME_MAPPING.update(custom_names)
-        return True
-    except Exception as e:
-        print(f"Error saving custom name: {e}")
-        return False
-
-# Load custom names on startup
-GAME_NAME_MAPPING.update(load_custom_names())
+    return name_resolver.set_name(executable, name)
 
 class RTSS_SHARED_MEMORY_OSD_ENTRY(ctypes.Structure):
     _fields_ = [
@@ -128,93 +67,338 @@ class RTSS_SHARED_MEMORY(ctypes.Structure):
         ("dwOSDFrame", ctypes.c_uint32),
     ]
 
+# Precompiled views used by the snapshot reader. Values are unpacked straight
+# out of the mapping, so a tick costs no per-slot buffer copies.
+RTSS_HEADER = struct.Struct('<9I')
+APP_ENTRY_PID = struct.Struct('<I')
+# dwFlags, dwTime0, dwTime1, dwFrames, dwFrameTime
+APP_ENTRY_STATS = struct.Struct('<5I')
+APP_ENTRY_NAME_OFFSET = RTSS_SHARED_MEMORY_APP_ENTRY.szName.offset
+APP_ENTRY_NAME_SIZE = RTSS_SHARED_MEMORY_APP_ENTRY.szName.size
+APP_ENTRY_STATS_OFFSET = RTSS_SHARED_MEMORY_APP_ENTRY.dwFlags.offset
+# Leading szName bytes compared on every poll: catch a name RTSS fills in
+# after the pid, without decoding or searching the whole field
+NAME_FINGERPRINT_SIZE = 16
+
+def resolve_game_name(name_bytes):
+    """Turns a raw szName into (display name, game id)"""
+    name = name_bytes.decode('utf-8', errors='ignore').strip()
+    # szName is always a Windows path
+    name = name.replace('/', '\\').rsplit('\\', 1)[-1]
+    # Remove .exe extension if present
+    if name.lower().endswith('.exe'):
+        name = name[:-4]
+    # The full name first: mapping keys like fortniteclient-win64-shipping keep the suffix
+    mapped = name_resolver.lookup(name.lower())
+    # Clean up common suffixes
+    name = name.replace("-Win64-Shipping", "").replace("-Shipping", "")
+
+    # Check mapping (case-insensitive, normalized)
+    lower_name = name.lower()
+    if not mapped:
+        mapped = name_resolver.lookup(lower_name)
+    if mapped:
+        name = mapped
+    return name, lower_name
+
+_app_entry_dtypes = {}
+
+def app_entry_dtype(entry_size):
+    """
+    NumPy structured dtype over the slot fields the reader needs.
+    itemsize is the entry size reported by the header, so frombuffer()
+    strides over the app array exactly like dwAppEntrySize does.
+    """
+    dtype = _app_entry_dtypes.get(entry_size)
+    if dtype is None:
+        names = ['dwProcessID', 'dwTime0', 'dwTime1', 'dwFrames', 'dwFrameTime']
+        dtype = np.dtype({
+            'names': names,
+            'formats': ['<u4'] * len(names),
+            'offsets': [getattr(RTSS_SHARED_MEMORY_APP_ENTRY, n).offset for n in names],
+            'itemsize': entry_size,
+        })
+        _app_entry_dtypes[entry_size] = dtype
+    return dtype
+
+def scan_slots_python(view, arr_offset, arr_size, entry_size):
+    """
+    Decodes every live slot (dwProcessID != 0).
+    Returns a list of (slot, pid, fps, frame_time_us, frames, time0, time1).
+    """
+    slots = []
+    for i in range(arr_size):
+        offset = arr_offset + (i * entry_size)
+        pid = APP_ENTRY_PID.unpack_from(view, offset)[0]
+        if pid == 0:
+            continue
+
+        flags, time0, time1, frames, frame_time_us = APP_ENTRY_STATS.unpack_from(view, offset + APP_ENTRY_STATS_OFFSET)
+
+        # Same formula as the RTSS OSD: frames counted over the last
+        # sampling window, with the instant frame time as fallback
+        if time1 > time0 and frames > 0:
+            fps = int(1000.0 * frames / (time1 - time0))
+        elif frame_time_us > 0:
+            fps = int(1000000.0 / frame_time_us)
+        else:
+            fps = 0
+        slots.append((i, pid, fps, frame_time_us, frames, time0, time1))
+    return slots
+
+def scan_slots_numpy(view, arr_offset, arr_size, entry_size):
+    """Vectorized scan_slots_python(): one strided pass over the whole app array"""
+    entries = np.frombuffer(view, dtype=app_entry_dtype(entry_size), count=arr_size, offset=arr_offset)
+    live = np.flatnonzero(entries['dwProcessID'])
+    # Fancy indexing copies the few live rows, so no view into the mapping
+    # outlives this call (an exported buffer would block mmap.close())
+    entries = entries[live]
+    if not live.size:
+        return []
+
+    time0 = entries['dwTime0'].astype(np.int64)
+    time1 = entries['dwTime1'].astype(np.int64)
+    frames = entries['dwFrames'].astype(np.int64)
+    frame_time_us = entries['dwFrameTime'].astype(np.int64)
+
+    window = time1 - time0
+    has_window = (window > 0) & (frames > 0)
+    has_frame_time = ~has_window & (frame_time_us > 0)
+
+    fps = np.zeros(live.size, dtype=np.float64)
+    np.divide(1000.0 * frames, window, out=fps, where=has_window)
+    np.divide(1000000.0, frame_time_us, out=fps, where=has_frame_time)
+
+    return list(zip(
+        live.tolist(),
+        entries['dwProcessID'].tolist(),
+        fps.astype(np.int64).tolist(),
+        frame_time_us.tolist(),
+        frames.tolist(),
+        time0.tolist(),
+        time1.tolist(),
+    ))
+
 class RTSSReader:
-    def __init__(self):
+    def __init__(self, path=None, use_numpy=None):
+        # Optional file path serving the shared memory (synthetic/recorded snapshots)
+        self.path = path
         self.map_file = None
         self.shared_memory = None
+        # Backoff/absence state shared with every other reader of this block
+        self.connection = connection_manager(path or RTSS_SHARED_MEMORY_NAME)
+        if use_numpy is None:
+            use_numpy = np is not None
+        self.scan_slots = scan_slots_numpy if use_numpy and np is not None else scan_slots_python
+
+        # slot -> [pid, name bytes, name, game_id, name fingerprint]; names are
+        # only decoded when the pid or the fingerprint of a slot changes
+        self.slots = {}
+        self.name_cache = {}
+        self.names_version = name_resolver.version
+        # Pending "appeared" / "disappeared" events, drained by poll_events()
+        self.events = deque(maxlen=256)
 
     def connect(self):
+        # Skip the attempt entirely while RTSS is known to be absent
+        if not self.connection.ready():
+            return False
         try:
             # Open named shared memory
-            self.map_file = mmap.mmap(-1, ctypes.sizeof(RTSS_SHARED_MEMORY), RTSS_SHARED_MEMORY_NAME, access=mmap.ACCESS_READ)
-            return True
+            self.map_file = open_mapping(RTSS_SHARED_MEMORY_NAME, ctypes.sizeof(RTSS_SHARED_MEMORY), self.path)
         except FileNotFoundError:
             # RTSS is not running
+            self.connection.failed()
             return False
         except Exception as e:
             print(f"Error connecting to RTSS: {e}")
+            self.connection.failed()
+            return False
+
+        # Windows hands out an empty block when nobody published the mapping
+        if RTSS_HEADER.unpack_from(self.map_file, 0)[0] != RTSS_SIGNATURE:
+            self.close()
+            self.connection.failed()
             return False
+        self.connection.succeeded()
+        return True
 
     def is_connected(self):
         return self.map_file is not None
 
-    def read_fps(self):
+    def close(self):
+        if self.map_file:
+            try:
+                self.map_file.close()
+            except BufferError:
+                # A view is still exported; the mapping is released once it is collected
+                pass
+        self.map_file = None
+
+    def _map_app_array(self):
+        """
+        Validates the header and makes sure the mapping covers the whole app array.
+        Returns (arr_offset, arr_size, entry_size) or None.
+        """
         if not self.map_file:
             if not self.connect():
-                return {'fps': 0, 'game_name': ""}
+                return None
+
+        header = RTSS_HEADER.unpack_from(self.map_file, 0)
+        if header[0] != RTSS_SIGNATURE:
+            # RTSS went away; reconnect through the backoff gate
+            self.close()
+            self.connection.failed()
+            return None
+
+        entry_size = header[2]
+        arr_offset = header[3]
+        arr_size = header[4]
+
+        # Check if we need to remap to access the app array
+        required_size = arr_offset + (arr_size * entry_size)
+        if len(self.map_file) < required_size:
+            self.close()
+            self.map_file = open_mapping(RTSS_SHARED_MEMORY_NAME, required_size, self.path)
+        return arr_offset, arr_size, entry_size
+
+    def _resolve_cached(self, name_bytes):
+        resolved = self.name_cache.get(name_bytes)
+        if resolved is None:
+            if len(self.name_cache) >= 256:
+                self.name_cache.clear()
+            resolved = resolve_game_name(name_bytes)
+            self.name_cache[name_bytes] = resolved
+        return resolved
+
+    def _emit(self, event_type, slot, entry):
+        self.events.append({'type': event_type, 'slot': slot, 'pid': entry[0], 'name': entry[2], 'game_id': entry[3]})
 
+    def _track_slots(self, live):
+        """Replaces the slot table with `live`, emitting disappeared events for dropped owners"""
+        for slot, entry in self.slots.items():
+            current = live.get(slot)
+            if current is None or current[0] != entry[0]:
+                self._emit('disappeared', slot, entry)
+        self.slots = live
+
+    def raw_bytes(self):
+        """Copy of the header and app array, for snapshot recording"""
         try:
-            self.map_file.seek(0)
-            # Read header
-            header_data = self.map_file.read(ctypes.sizeof(RTSS_SHARED_MEMORY))
-            header = RTSS_SHARED_MEMORY.from_buffer_copy(header_data)
+            layout = self._map_app_array()
+            if layout is None:
+                return None
+            arr_offset, arr_size, entry_size = layout
+            return self.map_file[:arr_offset + (arr_size * entry_size)]
+        except Exception:
+            self.close()
+            return None
 
-            # Verify signature ('RTSS')
-            if header.dwSignature != 0x52545353: 
-                return {'fps': 0, 'game_name': ""}
+    def probe(self):
+        """
+        Cheap change detector for the adaptive poller: the header's
+        dwOSDFrame plus dwTime1 of every slot seen live on the last read.
+        Returns a comparable tuple, or None when RTSS is not available.
+        """
+        if not self.map_file:
+            if not self.connect():
+                return None
+        try:
+            header = RTSS_HEADER.unpack_from(self.map_file, 0)
+            if header[0] != RTSS_SIGNATURE:
+                self.close()
+                self.connection.failed()
+                return None
+            arr_offset = header[3]
+            entry_size = header[2]
+            times = tuple(
+                APP_ENTRY_STATS.unpack_from(self.map_file, arr_offset + (slot * entry_size) + APP_ENTRY_STATS_OFFSET)[2]
+                for slot in self.slots
+            )
+            return header[8], times
+        except Exception:
+            self.close()
+            return None
 
-            # Check if we need to remap to access the app array
-            required_size = header.dwAppArrOffset + (header.dwAppArrSize * header.dwAppEntrySize)
-            if self.map_file.size() < required_size:
-                 self.map_file.close()
-                 self.map_file = mmap.mmap(-1, required_size, RTSS_SHARED_MEMORY_NAME, access=mmap.ACCESS_READ)
-
-            max_fps = 0
-            active_game = ""
-            active_id = ""
-            
-            for i in range(header.dwAppArrSize):
-                offset = header.dwAppArrOffset + (i * header.dwAppEntrySize)
-                self.map_file.seek(offset)
-                entry_data = self.map_file.read(ctypes.sizeof(RTSS_SHARED_MEMORY_APP_ENTRY))
-                entry = RTSS_SHARED_MEMORY_APP_ENTRY.from_buffer_copy(entry_data)
-                
-                # Check if entry is active (Process ID != 0)
-                if entry.dwProcessID != 0:
-                    if entry.dwFrameTime > 0:
-                        fps = 1000000.0 / entry.dwFrameTime
-                        if fps > max_fps:
-                            max_fps = int(fps)
-                            # Extract game name
-                            try:
-                                import os
-                                name = entry.szName.decode('utf-8', errors='ignore').strip()
-                                name = os.path.basename(name)
-                                # Remove .exe extension if present
-                                if name.lower().endswith('.exe'):
-                                    name = name[:-4]
-                                # Clean up common suffixes
-                                name = name.replace("-Win64-Shipping", "").replace("-Shipping", "")
-                                
-                                # Check mapping (case-insensitive)
-                                lower_name = name.lower()
-                                if lower_name in GAME_NAME_MAPPING:
-                                    name = GAME_NAME_MAPPING[lower_name]
-                                    
-                                active_game = name
-                                active_id = lower_name
-                            except:
-                                pass
-                            
-                            
-            return {'fps': max_fps, 'game_name': active_game, 'game_id': active_id, 'total_frames': entry.dwFrames}
+    def poll_events(self):
+        """Returns and clears the process appeared/disappeared events seen since the last call"""
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events
 
-        except Exception as e:
-            # print(f"Error reading RTSS: {e}")
+    def read_all_processes(self):
+        """
+        Snapshot of every active slot in the RTSS app array.
+        Returns a list of dicts: pid, name, game_id, fps, frame_time (ms),
+        frames, time0, time1 and time (last update, same as time1).
+        """
+        try:
+            layout = self._map_app_array()
+            if layout is None:
+                self._track_slots({})
+                return []
+            arr_offset, arr_size, entry_size = layout
+
+            if self.names_version != name_resolver.version:
+                # Custom names changed: re-resolve owners without new events
+                self.names_version = name_resolver.version
+                self.name_cache.clear()
+                for entry in self.slots.values():
+                    entry[2], entry[3] = self._resolve_cached(entry[1])
+
+            view = self.map_file
+            processes = []
+            live = {}
+            for slot, pid, fps, frame_time_us, frames, time0, time1 in self.scan_slots(view, arr_offset, arr_size, entry_size):
+                entry = self.slots.get(slot)
+                name_start = arr_offset + (slot * entry_size) + APP_ENTRY_NAME_OFFSET
+                fingerprint = view[name_start:name_start + NAME_FINGERPRINT_SIZE]
+                if entry is None or entry[0] != pid or entry[4] != fingerprint:
+                    name_end = view.find(b'\x00', name_start, name_start + APP_ENTRY_NAME_SIZE)
+                    if name_end == -1:
+                        name_end = name_start + APP_ENTRY_NAME_SIZE
+                    name_bytes = view[name_start:name_end]
+                    if entry is not None and entry[0] == pid:
+                        # Same process, name filled in or changed: replace its events
+                        self._emit('disappeared', slot, entry)
+                    name, game_id = self._resolve_cached(name_bytes)
+                    entry = [pid, name_bytes, name, game_id, fingerprint]
+                    self._emit('appeared', slot, entry)
+                live[slot] = entry
+
+                processes.append({
+                    'pid': pid,
+                    'name': entry[2],
+                    'game_id': entry[3],
+                    'fps': fps,
+                    'frame_time': frame_time_us / 1000.0,
+                    'frames': frames,
+                    'time0': time0,
+                    'time1': time1,
+                    'time': time1,
+                })
+            self._track_slots(live)
+            return processes
+
+        except Exception:
             # If reading fails, try to reconnect next time
-            self.map_file.close()
-            self.map_file = None
-            return {'fps': 0, 'game_name': "", 'game_id': ""}
+            self.close()
+            self._track_slots({})
+            return []
+
+    def read_fps(self):
+        if not self.map_file:
+            if not self.connect():
+                return {'fps': 0, 'game_name': ""}
+
+        processes = self.read_all_processes()
+        active = [p for p in processes if p['fps'] > 0]
+        if not active:
+            return {'fps': 0, 'game_name': "", 'game_id': "", 'total_frames': 0}
+
+        best = max(active, key=lambda p: p['fps'])
+        return {'fps': best['fps'], 'game_name': best['name'], 'game_id': best['game_id'], 'total_frames': best['frames']}
 
 if __name__ == "__main__":
     reader = RTSSReader()
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolBusy(Exception):
+    """The pool already has its maximum of calls running or queued"""
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(p / 100.0 * len(values)))] * 1000, 2)
+
+
+class _Pool:
+    def __init__(self, name, workers, max_pending, latency_samples):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self.lock = threading.Lock()
+        self.pending = 0
+
+        self.calls = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=latency_samples)
+
+    def done(self, future, start):
+        with self.lock:
+            self.pending -= 1
+        self.latencies.append(time.monotonic() - start)
+
+
+class SensorPool:
+    """
+    Named, bounded thread pools for blocking sensor calls (shared memory,
+    psutil, subprocess, WMI wrappers), so they never run on the asyncio
+    loop that also serves Socket.IO and FastAPI.
+
+    Each pool has `workers` threads and accepts at most `max_pending` calls,
+    running or queued. A call that times out keeps counting until its
+    thread actually returns, so a hung provider fills its own pool and then
+    fails fast with PoolBusy instead of piling up threads or delaying the
+    other pools.
+    """
+
+    def __init__(self, latency_samples=256):
+        self.latency_samples = latency_samples
+        self.pools = {}
+
+    def add(self, name, workers=1, max_pending=None):
+        if max_pending is None:
+            max_pending = workers * 2
+        self.pools[name] = _Pool(name, workers, max_pending, self.latency_samples)
+
+    def submit(self, name, func, *args):
+        """func(*args) on pool `name`, as a concurrent Future"""
+        pool = self.pools[name]
+        with pool.lock:
+            if pool.pending >= pool.max_pending:
+                pool.rejected += 1
+                raise PoolBusy(f"{name}: {pool.pending} calls still pending")
+            pool.pending += 1
+            pool.calls += 1
+        start = time.monotonic()
+        try:
+            future = pool.executor.submit(func, *args)
+        except Exception:
+            with pool.lock:
+                pool.pending -= 1
+            raise
+        future.add_done_callback(lambda f: pool.done(f, start))
+        return future
+
+    async def run(self, name, func, *args, timeout=2.0):
+        """Awaits func(*args) on pool `name`; TimeoutError after `timeout` seconds"""
+        pool = self.pools[name]
+        future = self.submit(name, func, *args)
+        try:
+            # Shielded: a queued call stays queued and counted rather than vanishing
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            pool.timeouts += 1
+            raise TimeoutError(f"{name}: call did not finish in {timeout}s")
+        except Exception:
+            pool.errors += 1
+            raise
+
+    def shutdown(self):
+        for pool in self.pools.values():
+            pool.executor.shutdown(wait=False)
+
+    def metrics(self):
+        return {
+            name: {
+                "workers": pool.workers,
+                "pending": pool.pending,
+                "calls": pool.calls,
+                "rejected": pool.rejected,
+                "timeouts": pool.timeouts,
+                "errors": pool.errors,
+                "latency_ms_p50": percentile(pool.latencies, 50),
+                "latency_ms_p99": percentile(pool.latencies, 99),
+            }
+            for name, pool in self.pools.items()
+        }
+
+
+# Shared by every sensor provider
+sensor_pool = SensorPool()
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+
+class SensorScheduler:
+    """
+    Runs every sensor provider as its own task at its own cadence and
+    publishes what it returns into a SnapshotStore.
+
+    Ticks follow monotonic deadlines (start + n * interval) rather than
+    sleeping a fixed time after each run, so a cadence does not drift by the
+    time the provider takes. A run that overruns its deadline skips the
+    missed ticks instead of running back to back to catch up.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.jobs = {}
+        self.tasks = []
+
+    def add(self, name, interval, func):
+        """
+        `func` is a coroutine function returning {key: value} to publish (or
+        None). `interval` is in seconds, or a callable returning it for
+        providers that adapt their own rate.
+        """
+        self.jobs[name] = {
+            "interval": interval, "func": func,
+            "runs": 0, "skipped": 0, "errors": 0,
+            "last_ms": None, "max_ms": 0.0, "last_error": None,
+        }
+
+    def start(self):
+        if not self.tasks:
+            self.tasks = [asyncio.ensure_future(self._run(name, job)) for name, job in self.jobs.items()]
+
+    def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+    def _interval(self, job):
+        interval = job["interval"]
+        return interval() if callable(interval) else interval
+
+    async def _run(self, name, job):
+        loop = asyncio.get_event_loop()
+        deadline = loop.time()
+        while True:
+            start = time.perf_counter()
+            try:
+                values = await job["func"]()
+                if values:
+                    self.store.publish(values)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                if error != job["last_error"]:
+                    print(f"Scheduler: {name} failed: {error}")
+                job["errors"] += 1
+                job["last_error"] = error
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            job["runs"] += 1
+            job["last_ms"] = elapsed_ms
+            job["max_ms"] = max(job["max_ms"], elapsed_ms)
+
+            interval = max(0.001, self._interval(job))
+            deadline += interval
+            now = loop.time()
+            if deadline <= now:
+                # Overran: drop the ticks we missed and keep the grid
+                missed = int((now - deadline) // interval) + 1
+                job["skipped"] += missed
+                deadline += missed * interval
+            await asyncio.sleep(deadline - now)
+
+    def metrics(self):
+        return {
+            name: {
+                "interval": round(self._interval(job), 3),
+                "runs": job["runs"],
+                "skipped": job["skipped"],
+                "errors": job["errors"],
+                "last_ms": round(job["last_ms"], 2) if job["last_ms"] is not None else None,
+                "max_ms": round(job["max_ms"], 2),
+                "last_error": job["last_error"],
+            }
+            for name, job in self.jobs.items()
+        }
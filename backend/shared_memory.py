@@ -0,0 +1,107 @@
+import mmap
+import os
+import random
+import sys
+import threading
+import time
+
+
+def open_mapping(name, size, path=None):
+    """
+    Opens a read-only view of a named shared memory block.
+
+    On Windows `name` is the tagname published by RTSS / Afterburner.
+    When `path` is given the block is read from a regular file instead,
+    which is how synthetic or recorded snapshots are served on Linux.
+    File-backed views always cover the whole file so they never need a remap.
+    """
+    if path is None:
+        if sys.platform != 'win32':
+            # Named mappings only exist on Windows
+            raise FileNotFoundError(name)
+        return mmap.mmap(-1, size, name, access=mmap.ACCESS_READ)
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < size:
+            raise FileNotFoundError(path)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class ConnectionManager:
+    """
+    Reconnect gate shared by every reader of one shared memory block.
+
+    After a failed connect the block is considered absent until a backoff
+    deadline (exponential with jitter), so callers polling many times per
+    second only pay for ready(), a clock comparison.
+    """
+
+    def __init__(self, name, base_delay=0.5, max_delay=30.0, jitter=0.2):
+        self.name = name
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.lock = threading.Lock()
+
+        self.failures = 0
+        self.absent_until = 0.0
+        self.attempts = 0
+        self.successes = 0
+        self.skipped = 0
+
+    def ready(self, now=None):
+        """True when a connect attempt is allowed right now"""
+        if now is None:
+            now = time.monotonic()
+        if now >= self.absent_until:
+            return True
+        self.skipped += 1
+        return False
+
+    def succeeded(self):
+        with self.lock:
+            self.attempts += 1
+            self.successes += 1
+            self.failures = 0
+            self.absent_until = 0.0
+
+    def failed(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        with self.lock:
+            self.attempts += 1
+            self.failures += 1
+            delay = min(self.max_delay, self.base_delay * (2 ** (self.failures - 1)))
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+            self.absent_until = now + delay
+
+    def reset(self):
+        """Allows an immediate retry, e.g. when the owning process was seen starting"""
+        with self.lock:
+            self.failures = 0
+            self.absent_until = 0.0
+
+    def metrics(self):
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "skipped": self.skipped,
+            "consecutive_failures": self.failures,
+            "absent_for": round(max(0.0, self.absent_until - time.monotonic()), 2),
+        }
+
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+def connection_manager(name):
+    """The ConnectionManager shared by all readers of `name`"""
+    with _connections_lock:
+        manager = _connections.get(name)
+        if manager is None:
+            manager = ConnectionManager(name)
+            _connections[name] = manager
+        return manager
+
+def connection_metrics():
+    return {name: manager.metrics() for name, manager in _connections.items()}
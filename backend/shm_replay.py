@@ -0,0 +1,215 @@
+"""
+Record and replay raw RTSS / MSI Afterburner shared memory.
+
+A capture is an append-only file: an 8-byte magic followed by records of
+(timestamp, source, zlib length) + the zlib-compressed block. Most of a block
+is zero padding, so captures stay small.
+
+    python shm_replay.py record capture.ffshm --seconds 60 --rate 10   (Windows)
+    python shm_replay.py info capture.ffshm
+
+Replay writes each block in place into one file per source, which the
+readers map with RTSSReader(path=...) / MAHMReader(path=...), on any OS.
+"""
+
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
+CAPTURE_MAGIC = b'FFSHM\x00\x01\x00'
+# timestamp (s since capture start), source id, compressed length
+RECORD = struct.Struct('<dBI')
+
+SOURCES = {'rtss': 0, 'mahm': 1}
+SOURCE_NAMES = {v: k for k, v in SOURCES.items()}
+
+
+class SnapshotRecorder:
+    """
+    Appends to `path`. A session added to an existing capture starts its
+    timestamps just past the last recorded one, so replay keeps the two
+    sessions in order instead of interleaving them.
+    """
+
+    def __init__(self, path):
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.offset = 0.0
+        if not new_file:
+            last = max((timestamp for timestamp, _, _ in read_capture(path)), default=None)
+            if last is not None:
+                self.offset = last + 1.0
+        self.file = open(path, 'ab')
+        if new_file:
+            self.file.write(CAPTURE_MAGIC)
+        self.started = time.monotonic()
+
+    def write(self, source, data, timestamp=None):
+        """`timestamp`: seconds since this session started (default: now)"""
+        if timestamp is None:
+            timestamp = time.monotonic() - self.started
+        timestamp += self.offset
+        payload = zlib.compress(data, 1)
+        self.file.write(RECORD.pack(timestamp, SOURCES[source], len(payload)))
+        self.file.write(payload)
+
+    def close(self):
+        self.file.close()
+
+
+def read_capture(path):
+    """Yields (timestamp, source, raw bytes) for every record in a capture"""
+    with open(path, 'rb') as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a shared memory capture")
+        while True:
+            head = f.read(RECORD.size)
+            if len(head) < RECORD.size:
+                return
+            timestamp, source, length = RECORD.unpack(head)
+            payload = f.read(length)
+            if len(payload) < length:
+                # Truncated tail (recorder was killed mid-write)
+                return
+            yield timestamp, SOURCE_NAMES[source], zlib.decompress(payload)
+
+
+class SnapshotReplay:
+    """
+    Serves a capture as files the readers can map.
+
+    seek(t) writes the latest block of every source at or before t, which
+    gives deterministic stepping for benchmarks; start() plays the capture
+    on a background thread at `speed` x real time.
+    """
+
+    def __init__(self, capture_path, directory=None, speed=1.0, loop=False):
+        self.frames = sorted(read_capture(capture_path), key=lambda f: f[0])
+        self.speed = speed
+        self.loop = loop
+        self.owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="ffshm_")
+        self.paths = {}
+        self.position = -1
+        self.thread = None
+        self.stop_event = threading.Event()
+
+        sizes = {}
+        for _, source, data in self.frames:
+            sizes[source] = max(sizes.get(source, 0), len(data))
+        self.files = {}
+        for source, size in sizes.items():
+            path = os.path.join(self.directory, f"{source}.bin")
+            with open(path, 'wb') as f:
+                # Full size up front so a mapping never sees the file shrink
+                f.truncate(size)
+            self.paths[source] = path
+            self.files[source] = open(path, 'r+b', buffering=0)
+        self.seek(0.0)
+
+    @property
+    def duration(self):
+        return self.frames[-1][0] if self.frames else 0.0
+
+    def _write(self, source, data):
+        f = self.files[source]
+        f.seek(0)
+        f.write(data)
+
+    def seek(self, timestamp):
+        """Applies every block up to `timestamp`; returns True while frames remain"""
+        if timestamp < (self.frames[self.position][0] if self.position >= 0 else 0.0):
+            self.position = -1
+        latest = {}
+        while self.position + 1 < len(self.frames) and self.frames[self.position + 1][0] <= timestamp:
+            self.position += 1
+            _, source, data = self.frames[self.position]
+            latest[source] = data
+        for source, data in latest.items():
+            self._write(source, data)
+        return self.position + 1 < len(self.frames)
+
+    def _play(self):
+        while not self.stop_event.is_set():
+            start = time.monotonic()
+            self.position = -1
+            while not self.stop_event.is_set():
+                elapsed = (time.monotonic() - start) * self.speed
+                if not self.seek(elapsed):
+                    break
+                next_at = self.frames[self.position + 1][0]
+                self.stop_event.wait(max(0.0, (next_at - elapsed) / self.speed))
+            if not self.loop:
+                return
+
+    def start(self):
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._play, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def close(self):
+        self.stop()
+        for f in self.files.values():
+            f.close()
+        if self.owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def record(path, seconds, rate):
+    from rtss_reader import RTSSReader
+    from mahm_reader import MAHMReader
+
+    readers = {'rtss': RTSSReader(), 'mahm': MAHMReader()}
+    recorder = SnapshotRecorder(path)
+    interval = 1.0 / rate
+    deadline = time.monotonic() + seconds
+    count = 0
+    try:
+        next_tick = time.monotonic()
+        while time.monotonic() < deadline:
+            for source, reader in readers.items():
+                data = reader.raw_bytes()
+                if data:
+                    recorder.write(source, data)
+                    count += 1
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.close()
+    print(f"Recorded {count} blocks to {path}")
+
+
+def info(path):
+    counts = {}
+    last = 0.0
+    for timestamp, source, data in read_capture(path):
+        counts[source] = counts.get(source, 0) + 1
+        last = timestamp
+    print(f"{path}: {os.path.getsize(path)} bytes, {last:.1f}s")
+    for source, count in counts.items():
+        print(f"  {source}: {count} blocks")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == "record":
+        seconds = float(args[args.index("--seconds") + 1]) if "--seconds" in args else 60.0
+        rate = float(args[args.index("--rate") + 1]) if "--rate" in args else 10.0
+        record(args[1], seconds, rate)
+    elif len(args) >= 2 and args[0] == "info":
+        info(args[1])
+    else:
+        print(__doc__)
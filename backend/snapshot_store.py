@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+from types import MappingProxyType
+
+
+class Snapshot:
+    """
+    One version of the store. `data` is read-only; the values in it are
+    never mutated after they are published, so a snapshot can be read from
+    any thread without copying.
+    """
+
+    __slots__ = ("version", "time", "data", "stamps")
+
+    def __init__(self, version, time, data, stamps):
+        self.version = version
+        self.time = time
+        self.data = data
+        # key -> monotonic time it was last published
+        self.stamps = stamps
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def age(self, key, now=None):
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            return None
+        if now is None:
+            now = time.monotonic()
+        return now - stamp
+
+
+class SnapshotStore:
+    """
+    Latest value of every sensor provider, as a versioned immutable Snapshot.
+
+    Providers publish({key: value}); each publish makes a new Snapshot with
+    the version bumped, so readers simply take latest() and never see a
+    half-written update. Coroutines can `await wait(version)` for the next
+    snapshot. publish() may be called from any thread.
+
+    fresh() serves on-demand readers: the latest snapshot while it is young
+    enough, otherwise one refresh shared by every caller that arrives while
+    it runs (single-flight), so a burst of requests costs one sensor read.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = Snapshot(0, time.monotonic(), MappingProxyType({}), MappingProxyType({}))
+        # (loop, future) of coroutines waiting for the next version
+        self.waiters = set()
+        # The refresh in flight, awaited by every fresh() caller
+        self.refreshing = None
+
+        self.hits = 0
+        self.refreshes = 0
+        self.coalesced = 0
+
+    def latest(self):
+        return self.current
+
+    def publish(self, values):
+        """New snapshot with `values` merged in; the values must not be mutated afterwards"""
+        now = time.monotonic()
+        with self.lock:
+            previous = self.current
+            data = dict(previous.data)
+            data.update(values)
+            stamps = dict(previous.stamps)
+            for key in values:
+                stamps[key] = now
+            snapshot = Snapshot(previous.version + 1, now, MappingProxyType(data), MappingProxyType(stamps))
+            self.current = snapshot
+            waiters, self.waiters = self.waiters, set()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, snapshot)
+        return snapshot
+
+    async def wait(self, version=None, timeout=None):
+        """The first snapshot newer than `version` (default: the current one); latest() on timeout"""
+        loop = asyncio.get_event_loop()
+        with self.lock:
+            if version is None:
+                version = self.current.version
+            if self.current.version > version:
+                return self.current
+            waiter = (loop, loop.create_future())
+            self.waiters.add(waiter)
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter[1]), timeout)
+        except asyncio.TimeoutError:
+            return self.current
+        finally:
+            with self.lock:
+                self.waiters.discard(waiter)
+
+    async def fresh(self, keys, max_age, refresh):
+        """
+        Latest snapshot if every key in `keys` was published within
+        `max_age` seconds; otherwise publishes `await refresh()` (a coroutine
+        function returning {key: value}) once for all concurrent callers.
+        """
+        snapshot = self.current
+        now = time.monotonic()
+        ages = [snapshot.age(key, now) for key in keys]
+        if all(age is not None and age <= max_age for age in ages):
+            self.hits += 1
+            return snapshot
+        if self.refreshing is None:
+            self.refreshes += 1
+            self.refreshing = asyncio.ensure_future(self._refresh(refresh))
+        else:
+            self.coalesced += 1
+        # Shielded: one caller going away must not cancel the others' refresh
+        return await asyncio.shield(self.refreshing)
+
+    async def _refresh(self, refresh):
+        try:
+            values = await refresh()
+            return self.publish(values) if values else self.current
+        finally:
+            self.refreshing = None
+
+    def metrics(self):
+        return {
+            "version": self.current.version,
+            "fresh_hits": self.hits,
+            "refreshes": self.refreshes,
+            "coalesced": self.coalesced,
+        }
+
+
+def _resolve(future, snapshot):
+    if not future.done():
+        future.set_result(snapshot)
@@ -17,6 +17,27 @@ import { onAuthStateChanged } from "firebase/auth";
 // Simple Error Boundary Component
 // ErrorBoundary moved to components/ErrorBoundary.jsx
 
+// hardware_update only carries live values; names, totals and settings arrive in hardware_static
+const mergeStatic = (staticData, update) => {
+  if (!staticData || !update) return update;
+  const gpuInfo = {};
+  (staticData.gpus || []).forEach((gpu) => {
+    gpuInfo[gpu.id] = gpu;
+  });
+  return {
+    ...update,
+    system: staticData.system,
+    fps_smoothing: staticData.fps_smoothing,
+    afterburner_status: staticData.afterburner_status,
+    ram: { ...update.ram, total_gb: staticData.ram?.total_gb },
+    gpus: (update.gpus || []).map((gpu) => ({ ...gpuInfo[gpu.id], ...gpu })),
+    // Names/units only apply to the values of the same Afterburner layout
+    sensors: update.sensors && staticData.sensors?.layout === update.sensors.layout
+      ? { ...staticData.sensors, ...update.sensors }
+      : update.sensors,
+  };
+};
+
 function App() {
   const [data, setData] = useState(null);
   const [connected, setConnected] = useState(false);
@@ -54,6 +75,8 @@ function App() {
 
   // Socket Ref to handle disconnects manually
   const socketRef = useRef(null);
+  // Latest hardware_static from the server
+  const staticRef = useRef(null);
 
   // Demo Mode Loop
   useEffect(() => {
@@ -111,6 +134,8 @@ function App() {
         // Ping settings
         pingTimeout: 30000,
         pingInterval: 10000,
+        // We merge hardware_static ourselves, so the server can send only live values
+        auth: { hardware_static: true },
       });
 
       socketRef.current = socket;
@@ -155,8 +180,13 @@ function App() {
         console.log('Reconnection attempt', attemptNumber);
       });
 
+      socket.on('hardware_static', (staticData) => {
+        staticRef.current = staticData;
+        setData((prev) => mergeStatic(staticData, prev));
+      });
+
       socket.on('hardware_update', (newData) => {
-        setData(newData);
+        setData(mergeStatic(staticRef.current, newData));
       });
 
       return socket;